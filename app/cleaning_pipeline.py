@@ -0,0 +1,222 @@
+import numpy as np
+
+
+class _Block:
+    """
+    The state the steps of one pipeline run share: the touched numeric columns as
+    a single float64 array (extracted once), the row mask and the dropped columns.
+    Steps only update this block; the frame is assembled once at the end.
+    """
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.columns = list(columns)
+        self.position = {c: j for j, c in enumerate(self.columns)}
+        self.values = df[self.columns].to_numpy(dtype="float64", copy=True)
+        self.keep = np.ones(len(df), dtype=bool)
+        self.dirty = set()
+        self.dropped = []
+        self.added = {}
+
+    def column(self, name):
+        return self.values[:, self.position[name]]
+
+    def is_null(self, name):
+        if name in self.position:
+            return np.isnan(self.column(name))
+        return self.df[name].isna().to_numpy()
+
+    def numeric_columns(self, columns):
+        """
+        The requested columns (default: every numeric one) that are still in the frame.
+        """
+        if columns is None:
+            columns = self.columns
+        return [c for c in columns if c in self.position and c not in self.dropped]
+
+
+class DropEmptyColumns:
+    """
+    Drops the columns that are entirely null (like 'Comments').
+    """
+
+    def columns(self, df):
+        return []
+
+    def apply(self, block):
+        for name in block.df.columns:
+            if name not in block.dropped and not (~block.is_null(name) & block.keep).any():
+                block.dropped.append(name)
+
+
+class ReplaceInfinite:
+    """
+    Treats +/-inf (and the given sentinel values, e.g. -9999) as missing.
+    """
+
+    def __init__(self, columns=None, sentinels=()):
+        self.target = columns
+        self.sentinels = list(sentinels)
+
+    def columns(self, df):
+        return self.target
+
+    def apply(self, block):
+        for name in block.numeric_columns(self.target):
+            values = block.column(name)
+            invalid = ~np.isfinite(values) & ~np.isnan(values)
+            if self.sentinels:
+                invalid |= np.isin(values, self.sentinels)
+            if invalid.any():
+                values[invalid] = np.nan
+                block.dirty.add(name)
+
+
+class FillMean:
+    """
+    Fills the missing values of the columns (default: every numeric one) with the column mean.
+    """
+
+    def __init__(self, columns=None):
+        self.target = columns
+
+    def columns(self, df):
+        return self.target
+
+    def apply(self, block):
+        for name in block.numeric_columns(self.target):
+            values = block.column(name)
+            missing = np.isnan(values)
+            if not missing.any():
+                continue
+            kept = values[block.keep & ~missing]
+            values[missing] = kept.sum() / len(kept) if len(kept) else np.nan
+            block.dirty.add(name)
+
+
+class DropMissing:
+    """
+    Drops the rows where any of the subset columns is missing.
+    """
+
+    def __init__(self, subset):
+        self.subset = list(subset)
+
+    def columns(self, df):
+        return []
+
+    def apply(self, block):
+        for name in self.subset:
+            block.keep &= ~block.is_null(name)
+
+
+class Outliers:
+    """
+    Z-score outlier handling over the rows still kept: "flag" adds a boolean
+    'outlier' column (|z| > z_threshold in any column), "drop" keeps only the rows
+    with |z| < z_threshold in every column and "clip" clips the values to
+    mean +/- z_threshold * std.
+    nan_policy "omit" ignores missing values (they are never outliers); "propagate"
+    behaves like scipy's zscore, where a column with a missing value gets no z-scores.
+    """
+
+    def __init__(self, columns, z_threshold=3, action="flag", nan_policy="omit"):
+        if action not in ("flag", "drop", "clip"):
+            raise ValueError(f"Unknown outlier action: {action}")
+        self.target = list(columns)
+        self.z_threshold = z_threshold
+        self.action = action
+        self.nan_policy = nan_policy
+
+    def columns(self, df):
+        return self.target
+
+    def apply(self, block):
+        positions = [block.position[c] for c in self.target]
+        kept = block.values[block.keep][:, positions]
+        valid = ~np.isnan(kept)
+        count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(valid, kept, 0).sum(axis=0) / count
+            std = np.sqrt(np.where(valid, (kept - mean) ** 2, 0).sum(axis=0) / count)
+            if self.nan_policy == "propagate":
+                std[~valid.all(axis=0)] = np.nan
+
+            if self.action == "clip":
+                low, high = mean - self.z_threshold * std, mean + self.z_threshold * std
+                for j, name in enumerate(self.target):
+                    if np.isfinite(std[j]):
+                        np.clip(block.column(name), low[j], high[j], out=block.column(name))
+                        block.dirty.add(name)
+                return
+
+            z_scores = np.abs((block.values[:, positions] - mean) / std)
+        if self.action == "flag":
+            outlier = (z_scores > self.z_threshold).any(axis=1)
+            block.added["outlier"] = outlier
+        else:
+            inlier = z_scores < self.z_threshold
+            if self.nan_policy == "omit":
+                inlier |= np.isnan(block.values[:, positions])
+            block.keep &= inlier.all(axis=1)
+
+
+class CleaningPipeline:
+    """
+    A declarative sequence of cleaning steps fused into one pass over a numeric block:
+    the touched numeric columns are extracted into a single float64 array once,
+    every step works on that array and a row mask, and the frame is rebuilt once.
+    With inplace=False the input frame is left untouched (only the columns that
+    changed get new arrays); with inplace=True it is updated and returned.
+    """
+
+    def __init__(self, steps):
+        self.steps = list(steps)
+
+    def run(self, df, inplace=False):
+        numeric = df.select_dtypes(include="number").columns
+        columns = []
+        for step in self.steps:
+            target = step.columns(df)
+            columns.extend(numeric if target is None else target)
+        block = _Block(df, dict.fromkeys(columns))
+        for step in self.steps:
+            step.apply(block)
+        return self._assemble(block, inplace)
+
+    def _assemble(self, block, inplace):
+        df = block.df
+        kept_columns = [c for c in df.columns if c not in block.dropped]
+        dirty = [c for c in kept_columns if c in block.dirty]
+        all_rows = block.keep.all()
+
+        if inplace:
+            for name in dirty:
+                df[name] = self._restore_dtype(block.column(name), df[name])
+            for name, values in block.added.items():
+                df[name] = values
+            if block.dropped:
+                df.drop(columns=block.dropped, inplace=True)
+            if not all_rows:
+                # Rows are dropped by position, since index labels may repeat
+                labels = df.index
+                df.index = np.arange(len(df))
+                df.drop(index=np.flatnonzero(~block.keep), inplace=True)
+                df.index = labels[np.flatnonzero(block.keep)]
+            return df
+
+        # Copy-on-write: selecting the columns doesn't copy them
+        out = df[kept_columns]
+        for name in dirty:
+            out[name] = self._restore_dtype(block.column(name), df[name])
+        for name, values in block.added.items():
+            out[name] = values
+        if not all_rows:
+            out = out[block.keep]
+        return out
+
+    @staticmethod
+    def _restore_dtype(values, original):
+        if original.dtype.kind == "f":
+            return values.astype(original.dtype, copy=False)
+        return values
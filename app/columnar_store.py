@@ -0,0 +1,92 @@
+import os
+import hashlib
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .schema import read_station_csv
+from .instrumentation import instrument
+
+# Parquet copies of the processed CSVs live here
+CACHE_DIR = "data/cache"
+
+FINGERPRINT_KEY = b"source_fingerprint"
+
+# Bumped whenever the column dtypes of the cache change, so older caches are rebuilt
+SCHEMA_KEY = b"schema_version"
+SCHEMA_VERSION = b"2"
+
+
+def source_fingerprint(csv_path, use_hash=False):
+    """
+    Returns a fingerprint of the source CSV (size + mtime, or a content hash).
+    """
+    if use_hash:
+        digest = hashlib.sha1()
+        with open(csv_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    stat = os.stat(csv_path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def parquet_path(csv_path, cache_dir=CACHE_DIR):
+    """
+    Returns the Parquet cache path for a CSV file.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir, f"{name}.parquet")
+
+
+def cached_fingerprint(path):
+    """
+    Returns the source fingerprint stored in a Parquet file, or None.
+    """
+    if not os.path.exists(path):
+        return None
+    metadata = pq.read_schema(path).metadata or {}
+    value = metadata.get(FINGERPRINT_KEY)
+    return value.decode() if value is not None else None
+
+
+def cached_schema_version(path):
+    return (pq.read_schema(path).metadata or {}).get(SCHEMA_KEY)
+
+
+@instrument
+def build_parquet_cache(csv_path, cache_dir=CACHE_DIR, use_hash=False):
+    """
+    Converts a CSV into a time-sorted Parquet file, unless an up-to-date copy exists.
+    Returns the Parquet path.
+    """
+    target = parquet_path(csv_path, cache_dir)
+    fingerprint = source_fingerprint(csv_path, use_hash=use_hash)
+    if cached_fingerprint(target) == fingerprint and cached_schema_version(target) == SCHEMA_VERSION:
+        return target
+
+    df = read_station_csv(csv_path)
+    df = df.sort_values("Timestamp", kind="stable").reset_index(drop=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[FINGERPRINT_KEY] = fingerprint.encode()
+    metadata[SCHEMA_KEY] = SCHEMA_VERSION
+    table = table.replace_schema_metadata(metadata)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temporary file first so readers never see a half-written cache
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, target)
+    return target
+
+
+@instrument
+def load_dataset(csv_path, columns=None, cache_dir=CACHE_DIR):
+    """
+    Loads a dataset through the Parquet cache. columns restricts which columns are
+    read ('Timestamp' is always included). Time ranges are sliced from the
+    memoized full frame (see data_pipeline), so nothing is filtered at read time.
+    """
+    path = build_parquet_cache(csv_path, cache_dir)
+    if columns is not None and "Timestamp" not in columns:
+        columns = ["Timestamp", *columns]
+    return pq.read_table(path, columns=columns).to_pandas()
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+from .time_index import has_time_index, time_buckets, time_range_positions
+
+BUCKET = pd.Timedelta(days=1)
+
+
+class CorrelationIndex:
+    """
+    Pairwise-complete correlations for any subset of a fixed column set and any
+    time range, from per-bucket cross-product partial sums.
+    For every bucket it keeps, per column pair (i, j) over rows where both are valid:
+    the row count, sum of x_i, sum of x_i^2 and sum of x_i * x_j. Prefix sums over
+    buckets make a range query cost O(k^2) plus a scan of the two partial edge buckets.
+    """
+
+    def __init__(self, df, columns, bucket=BUCKET):
+        if not has_time_index(df):
+            raise ValueError("CorrelationIndex requires a frame with a sorted DatetimeIndex.")
+        self.df = df
+        self.columns = list(dict.fromkeys(columns))
+        # Shift by the column means so the cross products don't lose precision
+        values = self._values(0, len(df))
+        counts = (~np.isnan(values)).sum(axis=0)
+        self.shift = np.nansum(values, axis=0) / np.maximum(counts, 1)
+
+        _, self.bucket_rows = time_buckets(df, bucket)
+        n_buckets = len(self.bucket_rows) - 1
+
+        k = len(self.columns)
+        self.prefix = np.zeros((n_buckets + 1, 4, k, k))
+        for b in range(n_buckets):
+            self.prefix[b + 1] = self.prefix[b] + self._partial_sums(self.bucket_rows[b], self.bucket_rows[b + 1])
+
+    def corr(self, columns=None, start_time=None, end_time=None):
+        """
+        Returns the correlation matrix of columns (default: all) for [start_time, end_time].
+        """
+        columns = self.columns if columns is None else list(columns)
+        start, stop = 0, len(self.df)
+        if start_time is not None or end_time is not None:
+            start, stop = time_range_positions(
+                self.df,
+                self.df.index[0] if start_time is None else start_time,
+                self.df.index[-1] if end_time is None else end_time,
+            )
+        count, sum_x, sum_xx, sum_xy = self._range_sums(start, stop)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = sum_xy - sum_x * sum_x.T / count
+            var_x = sum_xx - sum_x**2 / count
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr[count < 2] = np.nan
+        positions = [self.columns.index(c) for c in columns]
+        return pd.DataFrame(corr[np.ix_(positions, positions)], index=columns, columns=columns)
+
+    def _range_sums(self, start, stop):
+        first_full = np.searchsorted(self.bucket_rows, start, side="left")
+        last_full = np.searchsorted(self.bucket_rows, stop, side="right") - 1
+        if first_full >= last_full:
+            return self._partial_sums(start, stop)
+        return (
+            self.prefix[last_full]
+            - self.prefix[first_full]
+            + self._partial_sums(start, self.bucket_rows[first_full])
+            + self._partial_sums(self.bucket_rows[last_full], stop)
+        )
+
+    def _values(self, start, stop):
+        values = self.df[self.columns].iloc[start:stop].to_numpy(dtype="float64", copy=True)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    def _partial_sums(self, start, stop):
+        values = self._values(start, stop) - self.shift
+        valid = (~np.isnan(values)).astype("float64")
+        values = np.nan_to_num(values)
+        # [i, j] entries are taken over rows where both column i and column j are valid
+        return np.stack([
+            valid.T @ valid,
+            values.T @ valid,
+            (values**2).T @ valid,
+            values.T @ values,
+        ])
@@ -0,0 +1,343 @@
+import os
+import threading
+from collections import OrderedDict
+from .columnar_store import source_fingerprint
+import pandas as pd
+from .range_stats import RangeStatsIndex
+from .quantile_sketch import QuantileSketchIndex
+from .rollups import RollupPyramid
+from .profiles import ProfileCube, profile_path
+from .correlation import CorrelationIndex
+from .wind_rose import WindRoseIndex
+from .lazy_dataset import LazyDataset
+from .raw_data import NullCountIndex, page_rows, row_order
+from .time_index import time_range_positions
+
+OUTLIER_COLUMNS = ("GHI", "DNI", "DHI")
+
+# Sessions share the cached frames through Copy-on-Write views (always on from pandas 3)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def shared_view(df):
+    """
+    Returns a zero-copy view of a shared frame. With Copy-on-Write, a session that
+    modifies its view only copies the columns it touches; the shared frame never changes.
+    """
+    return df.copy(deep=False)
+
+
+class PreparedDataCache:
+    """
+    Bounded LRU cache of prepared frames, shared by every session in the process.
+    Keys are (dataset, source fingerprint, cleaning parameters). on_evict, if given,
+    is called with the key of every entry the bound pushes out.
+    """
+
+    def __init__(self, max_entries=16, on_evict=None):
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_or_compute(self, key, compute):
+        """
+        Returns the cached value for key, computing it at most once per key.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Concurrent sessions asking for the same key wait for a single computation
+        evicted = []
+        with key_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    return self._entries[key]
+            value = compute()
+            with self._lock:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted.append(self._entries.popitem(last=False)[0])
+                self._key_locks.pop(key, None)
+        if self.on_evict is not None:
+            for evicted_key in evicted:
+                self.on_evict(evicted_key)
+        return value
+
+    def invalidate(self, dataset=None, keep_fingerprint=None):
+        """
+        Drops cached entries for one dataset, or everything when dataset is None.
+        Entries of the source version keep_fingerprint (if given) are kept.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if (dataset is None or key[0] == dataset) and (keep_fingerprint is None or key[1] != keep_fingerprint):
+                    del self._entries[key]
+
+    def invalidate_prefix(self, prefix):
+        """
+        Drops the cached entries whose key starts with prefix.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[: len(prefix)] == prefix:
+                    del self._entries[key]
+
+
+# Indexes and rollups built from the dataset handles, about eight per site
+index_cache = PreparedDataCache(max_entries=64)
+# Sorted/filtered row orders of the Raw Data tab, so paging through them is cheap
+row_order_cache = PreparedDataCache(max_entries=32)
+
+
+def drop_derived(key):
+    """
+    Drops the indexes and row orders built from the dataset handle under key, so
+    they never keep an evicted handle's frame alive next to its replacement.
+    """
+    # (dataset, source fingerprint, outlier columns, z_threshold)
+    prefix = key[:4]
+    index_cache.invalidate_prefix(prefix)
+    row_order_cache.invalidate_prefix(prefix)
+
+
+# One LazyDataset handle per site and cleaning parameters. The dashboard always
+# cleans with the same parameters, so the bound holds every configured site and
+# only other parameter sets are evicted (with the indexes built from them)
+dataset_cache = PreparedDataCache(max_entries=8, on_evict=drop_derived)
+
+
+def lazy_dataset(dataset, csv_path, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=dataset_cache):
+    """
+    Returns the LazyDataset handle of a dataset, shared by every session in the process.
+    Keyed by (dataset, source fingerprint, outlier_columns, z_threshold); a changed
+    source replaces the dataset's handles instead of adding to them.
+    """
+    fingerprint = source_fingerprint(csv_path)
+    key = (dataset, fingerprint, tuple(outlier_columns), z_threshold, "lazy")
+
+    def compute():
+        # Everything built from an older version of the source goes with it
+        for stale in (cache, index_cache, row_order_cache):
+            stale.invalidate(dataset, keep_fingerprint=fingerprint)
+        return LazyDataset(csv_path, outlier_columns, z_threshold)
+
+    return cache.get_or_compute(key, compute)
+
+
+def prepare_dataset(
+    dataset, csv_path, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, columns=None, cache=dataset_cache
+):
+    """
+    Runs load -> clean -> outlier removal -> timestamp conversion -> time index for
+    the requested columns (default: all), memoized per (dataset, source fingerprint,
+    outlier_columns, z_threshold). Columns are loaded and cleaned on first use and
+    held once per process; every call gets a zero-copy view.
+    """
+    handle = lazy_dataset(dataset, csv_path, outlier_columns, z_threshold, cache=cache)
+    return shared_view(handle.frame(columns))
+
+
+def numeric_columns(df, columns):
+    """
+    Returns the numeric columns of df among columns (default: all of them), in df's order.
+    """
+    wanted = None if columns is None else set(columns)
+    return [c for c in df.columns if (wanted is None or c in wanted) and pd.api.types.is_numeric_dtype(df[c])]
+
+
+def range_stats_index(
+    dataset, csv_path, columns=None, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache
+):
+    """
+    Returns the RangeStatsIndex of the prepared dataset over the numeric columns among
+    columns (default: all), memoized alongside it. Only those columns are loaded.
+    """
+    columns = None if columns is None else tuple(sorted(set(columns)))
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "range_stats", columns)
+
+    def compute():
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=columns)
+        return RangeStatsIndex(df, numeric_columns(df, columns))
+
+    return cache.get_or_compute(key, compute)
+
+
+def quantile_sketch_index(
+    dataset, csv_path, columns=None, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache
+):
+    """
+    Returns the per-day QuantileSketchIndex of the prepared dataset over the numeric
+    columns among columns (default: all), grouped by 'Cleaning', memoized alongside it.
+    """
+    columns = None if columns is None else tuple(sorted(set(columns)))
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "quantile_sketch", columns)
+
+    def compute():
+        load = None if columns is None else [*columns, "Cleaning"]
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=load)
+        return QuantileSketchIndex(df, numeric_columns(df, columns))
+
+    return cache.get_or_compute(key, compute)
+
+
+def rollup_pyramid(
+    dataset, csv_path, columns=None, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache
+):
+    """
+    Returns the lazily loaded RollupPyramid of a dataset. Levels written by
+    scripts/eda.py are used when they are newer than the source CSV; missing levels
+    are built from columns (default: all) of the prepared dataset.
+    """
+    columns = None if columns is None else tuple(columns)
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "rollups", columns)
+
+    def compute():
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=columns)
+        name = os.path.basename(csv_path).replace("-cleaned.csv", "")
+        return RollupPyramid(name, source_df=df, source_mtime=os.path.getmtime(csv_path))
+
+    return cache.get_or_compute(key, compute)
+
+
+def profile_cube(
+    dataset, csv_path, columns=None, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache
+):
+    """
+    Returns the ProfileCube (month x time of day) of a dataset. The cube written by
+    scripts/eda.py is used when it is newer than the source CSV and covers columns;
+    otherwise it is built from columns (default: all) of the prepared dataset.
+    """
+    columns = None if columns is None else tuple(columns)
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "profiles", columns)
+
+    def compute():
+        path = profile_path(os.path.basename(csv_path).replace("-cleaned.csv", ""))
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(csv_path):
+            cube = ProfileCube.load(path)
+            if columns is None or set(columns) <= set(cube.columns):
+                return cube
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=columns)
+        return ProfileCube.from_frame(df, None if columns is None else [c for c in columns if c in df.columns])
+
+    return cache.get_or_compute(key, compute)
+
+
+def correlation_index(dataset, csv_path, columns, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache):
+    """
+    Returns a CorrelationIndex over columns for the prepared dataset, memoized alongside it.
+    Pass the union of every column set you need so all heatmaps share one index.
+    """
+    columns = tuple(sorted(set(columns)))
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "correlation", columns)
+
+    def compute():
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=columns)
+        return CorrelationIndex(df, [c for c in columns if c in df.columns])
+
+    return cache.get_or_compute(key, compute)
+
+
+def wind_rose_index(dataset, csv_path, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache):
+    """
+    Returns the per-day WindRoseIndex (WD x WS) of the prepared dataset, memoized alongside it.
+    """
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "wind_rose")
+
+    def compute():
+        df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=["WD", "WS"])
+        return WindRoseIndex(df, "WD", "WS")
+
+    return cache.get_or_compute(key, compute)
+
+
+def null_count_index(dataset, csv_path, outlier_columns=OUTLIER_COLUMNS, z_threshold=3, cache=index_cache):
+    """
+    Returns the per-day NullCountIndex of the prepared dataset (every column), memoized alongside it.
+    """
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, "null_counts")
+
+    def compute():
+        return NullCountIndex(prepare_dataset(dataset, csv_path, outlier_columns, z_threshold))
+
+    return cache.get_or_compute(key, compute)
+
+
+def raw_data_order(
+    dataset,
+    csv_path,
+    start_time,
+    end_time,
+    sort_by=None,
+    ascending=True,
+    filters=(),
+    outlier_columns=OUTLIER_COLUMNS,
+    z_threshold=3,
+    cache=dataset_cache,
+    order_cache=row_order_cache,
+):
+    """
+    Returns the row positions of the prepared dataset within [start_time, end_time]
+    that pass filters, in display order (see raw_data.row_order). Memoized per
+    selection, so only the first page of a new sort or filter touches every row.
+    """
+    filters = tuple(tuple(f) for f in filters)
+    needed = list(dict.fromkeys([*([sort_by] if sort_by else []), *(column for column, _, _ in filters)]))
+    df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=needed, cache=cache)
+    start, stop = time_range_positions(df, start_time, end_time)
+    key = (dataset, source_fingerprint(csv_path), tuple(outlier_columns), z_threshold, start, stop)
+    key += (sort_by, ascending, filters)
+    return order_cache.get_or_compute(key, lambda: row_order(df, start, stop, sort_by, ascending, filters))
+
+
+def raw_data_page(
+    dataset,
+    csv_path,
+    order,
+    page,
+    page_size,
+    columns,
+    outlier_columns=OUTLIER_COLUMNS,
+    z_threshold=3,
+    cache=dataset_cache,
+):
+    """
+    Returns page (0-based) of order (from raw_data_order) with only columns loaded.
+    """
+    df = prepare_dataset(dataset, csv_path, outlier_columns, z_threshold, columns=columns, cache=cache)
+    return page_rows(df, order, page, page_size, columns)
+
+
+def describe_range(dataset, csv_path, start_time, end_time, columns=None):
+    """
+    Returns a describe()-style table of columns (default: every numeric column) for
+    [start_time, end_time]: exact count/mean/std/min/max from the range statistics
+    index and approximate 25%/50%/75% from the quantile sketches.
+    """
+    summary = range_stats_index(dataset, csv_path, columns).summary(start_time, end_time)
+    sketch = quantile_sketch_index(dataset, csv_path, columns)
+    percentiles = sketch.quantiles([0.25, 0.5, 0.75], start_time, end_time)
+    percentiles.index = ["25%", "50%", "75%"]
+    table = pd.concat([summary.loc[["count", "mean", "std", "min"]], percentiles, summary.loc[["max"]]])
+    # In the caller's order (the indexes are shared by every ordering of the same columns)
+    return table if columns is None else table[[c for c in columns if c in table.columns]]
+
+
+def invalidate_dataset(dataset=None, cache=dataset_cache, order_cache=row_order_cache, indexes=index_cache):
+    """
+    Forces the next prepare_dataset call for dataset (or all datasets) to recompute,
+    along with the indexes and row orders built from it.
+    """
+    cache.invalidate(dataset)
+    indexes.invalidate(dataset)
+    order_cache.invalidate(dataset)
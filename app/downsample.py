@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+    Returns the indices of n_out points of (x, y) that preserve the visual shape,
+    including peaks. x must be sorted; NaN values in y are never selected.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    n = len(valid)
+    if n_out >= n or n_out < 3:
+        return valid
+    x = x[valid]
+    y = y[valid]
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype("int64")
+    # Averages of every bucket, used as the third triangle vertex
+    sums_x = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1 : n - 1], edges[:-1] - 1)
+    sizes = np.diff(edges)
+    avg_x = np.append(sums_x / sizes, x[-1])
+    avg_y = np.append(sums_y / sizes, y[-1])
+
+    selected = np.empty(n_out, dtype="int64")
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        # Twice the triangle area formed with the previous pick and the next bucket average
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return valid[selected]
@@ -0,0 +1,206 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+import numpy as np
+
+# Instrumentation is off unless SOLAR_PROFILE is set (or enable() is called)
+ENV_FLAG = "SOLAR_PROFILE"
+MAX_SPANS = 5000
+HISTORY = 200
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes():
+    """
+    Returns the resident set size of the process, or None where /proc is unavailable.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _rows(value):
+    return len(value) if hasattr(value, "columns") and hasattr(value, "index") else None
+
+
+class Tracer:
+    """
+    Records spans (name, wall time, CPU time, rows in/out, RSS delta) for the
+    instrumented stages, tagged with the thread's current run (one Streamlit rerun
+    or one eda.py invocation), plus a rolling window of durations per stage.
+    """
+
+    def __init__(self, enabled=False, max_spans=MAX_SPANS, history=HISTORY):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.spans = deque(maxlen=max_spans)
+        self.durations = defaultdict(lambda: deque(maxlen=history))
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._runs = 0
+
+    def begin_run(self, label="run"):
+        """
+        Starts a new run on the calling thread and returns its id.
+        """
+        with self._lock:
+            self._runs += 1
+            run = f"{label}-{self._runs}"
+        self._local.run = run
+        return run
+
+    def current_run(self):
+        return getattr(self._local, "run", None)
+
+    def span(self, name, rows_in=None):
+        return _Span(self, name, rows_in)
+
+    def record(self, span):
+        with self._lock:
+            self.spans.append(span)
+            self.durations[span["name"]].append(span["wall"])
+
+    def add(self, spans):
+        """
+        Adds spans recorded elsewhere (e.g. in worker processes).
+        """
+        for span in spans:
+            self.record(span)
+
+    def run_spans(self, run):
+        with self._lock:
+            return [span for span in self.spans if span["run"] == run]
+
+    def breakdown(self, run):
+        """
+        Returns the spans of one run as rows (name, wall/CPU ms, rows in/out, RSS delta MB).
+        """
+        return [
+            {
+                "stage": span["name"],
+                "wall_ms": round(span["wall"] * 1000, 1),
+                "cpu_ms": round(span["cpu"] * 1000, 1),
+                "rows_in": span["rows_in"],
+                "rows_out": span["rows_out"],
+                "rss_delta_mb": None if span["rss_delta"] is None else round(span["rss_delta"] / 2**20, 2),
+            }
+            for span in self.run_spans(run)
+        ]
+
+    def percentiles(self):
+        """
+        Returns {stage: (calls in the window, p50 ms, p95 ms)} over the rolling window.
+        """
+        with self._lock:
+            windows = {name: np.array(values) for name, values in self.durations.items() if values}
+        return {
+            name: (len(values), float(np.percentile(values, 50) * 1000), float(np.percentile(values, 95) * 1000))
+            for name, values in windows.items()
+        }
+
+    def to_json(self):
+        with self._lock:
+            return json.dumps(list(self.spans), indent=2, default=str)
+
+    def to_chrome_trace(self):
+        """
+        Returns the spans in the Chrome trace event format (chrome://tracing, Perfetto).
+        """
+        with self._lock:
+            spans = list(self.spans)
+        events = [
+            {
+                "name": span["name"],
+                "cat": span["run"] or "background",
+                "ph": "X",
+                "ts": span["start"] * 1e6,
+                "dur": span["wall"] * 1e6,
+                "pid": span["pid"],
+                "tid": span["thread"],
+                "args": {key: span[key] for key in ("run", "cpu", "rows_in", "rows_out", "rss_delta")},
+            }
+            for span in spans
+        ]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+    def drain(self):
+        """
+        Removes and returns every recorded span.
+        """
+        with self._lock:
+            spans = list(self.spans)
+            self.spans.clear()
+        return spans
+
+
+class _Span:
+    def __init__(self, tracer, name, rows_in=None):
+        self.tracer = tracer
+        self.name = name
+        self.rows_in = rows_in
+        self.rows_out = None
+
+    def __enter__(self):
+        if self.tracer.enabled:
+            self.rss = rss_bytes()
+            self.cpu = time.thread_time()
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if not self.tracer.enabled:
+            return False
+        wall = time.perf_counter() - self.start
+        rss = rss_bytes()
+        self.tracer.record({
+            "name": self.name,
+            "run": self.tracer.current_run(),
+            "start": self.start - self.tracer.origin,
+            "wall": wall,
+            "cpu": time.thread_time() - self.cpu,
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "rss_delta": None if rss is None or self.rss is None else rss - self.rss,
+            "pid": os.getpid(),
+            "thread": threading.current_thread().name,
+        })
+        return False
+
+
+tracer = Tracer(enabled=bool(os.environ.get(ENV_FLAG)))
+
+
+def enable(flag=True):
+    tracer.enabled = flag
+
+
+def span(name, rows_in=None):
+    """
+    Context manager timing a stage; a no-op unless instrumentation is enabled.
+    Set .rows_out on the returned span to record the output size.
+    """
+    return tracer.span(name, rows_in)
+
+
+def instrument(function):
+    """
+    Records a span per call of function: rows in (first argument) and rows out (the
+    result) are taken when they are DataFrames. Costs one flag check when disabled.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not tracer.enabled:
+            return function(*args, **kwargs)
+        with tracer.span(function.__name__, _rows(args[0]) if args else None) as current:
+            result = function(*args, **kwargs)
+            current.rows_out = _rows(result)
+        return result
+
+    return wrapper
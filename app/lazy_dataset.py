@@ -0,0 +1,76 @@
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+from .columnar_store import build_parquet_cache, load_dataset
+from .cleaning_pipeline import CleaningPipeline, DropEmptyColumns, FillMean, ReplaceInfinite
+from .utils import convert_timestamp_to_numeric, dashboard_cleaning, set_time_index
+from .instrumentation import instrument
+
+
+class LazyDataset:
+    """
+    A prepared dataset whose columns are loaded, cleaned and kept on first use.
+    The rows are fixed up front from 'Timestamp' and the outlier columns (outlier
+    removal only looks at those); every other column is read from the Parquet cache
+    when a view first asks for it, filled like clean_missing_values does over all
+    rows, and aligned to the kept rows.
+    frame(columns) gives the same result as preparing the full dataset and then
+    selecting the columns.
+    """
+
+    def __init__(self, csv_path, outlier_columns, z_threshold=3):
+        self.csv_path = csv_path
+        self.outlier_columns = list(outlier_columns)
+        path = build_parquet_cache(csv_path)
+        self.source_columns = list(pq.read_schema(path).names)
+        self._lock = threading.Lock()
+        self._columns = {}
+        self._empty = set()
+
+        df = load_dataset(csv_path, columns=self.outlier_columns)
+        df = dashboard_cleaning(self.outlier_columns, z_threshold).run(df, inplace=True)
+        # Row positions (in the Parquet file) of the kept rows, in time order
+        positions = df.index.to_numpy()
+        order = np.argsort(df["Timestamp"].to_numpy(), kind="stable")
+        self.rows = positions[order]
+        self.base = set_time_index(convert_timestamp_to_numeric(df))
+
+    @property
+    def columns(self):
+        """
+        The columns a view can ask for (entirely null source columns are dropped once seen).
+        """
+        return [c for c in self.source_columns if c not in self._empty]
+
+    def loaded_columns(self):
+        return list(self.base.columns) + list(self._columns)
+
+    def frame(self, columns=None):
+        """
+        Returns the prepared frame restricted to columns (default: every column),
+        plus 'Timestamp', 'Timestamp_numeric' and the outlier columns.
+        Unknown columns are ignored, like entirely null ones.
+        """
+        requested = self.source_columns if columns is None else [c for c in columns if c in self.source_columns]
+        self._load([c for c in requested if c not in self.base.columns])
+        extra = {c: self._columns[c] for c in self.source_columns if c in requested and c in self._columns}
+        df = self.base.assign(**extra)
+        # Same column order as the full prepared frame
+        order = [c for c in self.source_columns if c in df.columns] + ["Timestamp_numeric"]
+        return df[order]
+
+    @instrument
+    def _load(self, columns):
+        with self._lock:
+            missing = [c for c in columns if c not in self._columns and c not in self._empty]
+            if not missing:
+                return
+            df = load_dataset(self.csv_path, columns=missing).drop(columns="Timestamp")
+            df = CleaningPipeline([DropEmptyColumns(), ReplaceInfinite(), FillMean()]).run(df, inplace=True)
+            for column in missing:
+                if column not in df.columns:
+                    self._empty.add(column)
+                    continue
+                values = df[column].to_numpy()[self.rows]
+                self._columns[column] = pd.Series(values, index=self.base.index, name=column)
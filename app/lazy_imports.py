@@ -0,0 +1,26 @@
+import importlib
+
+
+class LazyModule:
+    """
+    Stands in for a module that is only imported when one of its attributes is
+    first used. Plotting and stats backends (matplotlib, seaborn, scipy)
+    take seconds to import, and most reruns never draw a figure.
+    """
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attribute):
+        # import_module is thread-safe and returns the cached module after the first call
+        return getattr(importlib.import_module(self._name), attribute)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}>"
+
+
+def lazy_import(name):
+    """
+    Returns a stand-in for the module name, imported on first attribute access.
+    """
+    return LazyModule(name)
@@ -1,12 +1,13 @@
+import calendar
+import os
+import sys
+import uuid
 import streamlit as st
 import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-from windrose import WindroseAxes
-import numpy as np
-from datetime import datetime
-from utils import (
-    convert_timestamp_to_numeric,
+
+# Make the app package importable when this file is run as a script (streamlit run app/main.py)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils import (
     filter_data_by_time_range,
     create_time_series,
     create_wind_rose,
@@ -16,9 +17,27 @@ from utils import (
     scatter_plot,
     plot_histogram,
     bubble_chart,
-    clean_missing_values,
-    remove_outliers,
+    create_diurnal_profile,
+)
+from app.columnar_store import source_fingerprint
+from app.render_cache import render_cache, render_key
+from app.prefetch import prefetcher
+from app.instrumentation import span, tracer
+from app.data_pipeline import (
+    lazy_dataset,
+    prepare_dataset,
+    describe_range,
+    quantile_sketch_index,
+    rollup_pyramid,
+    correlation_index,
+    wind_rose_index,
+    null_count_index,
+    profile_cube,
+    range_stats_index,
+    raw_data_order,
+    raw_data_page,
 )
+from app.raw_data import PAGE_SIZES
 
 # Constants
 cleaning_col = "Cleaning"
@@ -27,15 +46,15 @@ wind_dir_col = "WD"
 wind_speed_col = "WS"
 solar_temp_columns = ["GHI", "DNI", "DHI", "TModA", "TModB"]
 wind_columns = ["WS", "WSgust", "WD", "GHI", "DNI"]
-
-
-# Clear the cache for resource and memoized data
-st.cache_data.clear()
-st.cache_resource.clear()
+correlation_columns = solar_temp_columns + wind_columns
+# Sensors of the diurnal profile cube: irradiance, module temperatures and wind
+profile_columns = ["GHI", "DNI", "DHI", "TModA", "TModB", "Tamb", "WS", "WSgust"]
 
 
 # App title and description
 st.set_page_config(page_title="Solar Radiation Dashboard", layout="wide")
+# Stages of this rerun are grouped in the performance panel (when SOLAR_PROFILE is set)
+run = tracer.begin_run("rerun")
 st.title("Solar Radiation Analysis Dashboard")
 st.write("Explore insights from solar radiation datasets across multiple regions.")
 
@@ -50,12 +69,12 @@ datasets = {
 selected_dataset = st.selectbox("Select a Dataset", options=list(datasets.keys()))
 st.write(f"Currently selected dataset: {selected_dataset}")
 
-# Load the selected dataset
-df = pd.read_csv(datasets[selected_dataset])
-df = clean_missing_values(df)
-df = remove_outliers(df, columns=["GHI", "DNI", "DHI"])
+# Columns are loaded and cleaned on first use (memoized across reruns and sessions);
+# df only holds the Timestamp and the outlier columns every view shares
+with span("prepare dataset"):
+    dataset_handle = lazy_dataset(selected_dataset, datasets[selected_dataset])
+    df = prepare_dataset(selected_dataset, datasets[selected_dataset], columns=[])
 st.write("Cleaned Data Preview:", df.head())
-df = convert_timestamp_to_numeric(df)
 
 # Convert pandas.Timestamp to Python datetime
 min_time = df["Timestamp"].min().to_pydatetime()
@@ -75,121 +94,314 @@ df = filter_data_by_time_range(df, start_time, end_time)
 st.write(f"Filtered Data ({start_time} to {end_time}):")
 
 
-tab1, tab2, tab3 = st.tabs(["Overview", "Visualizations", "Raw Data"])
+def view(plot, *args, **kwargs):
+    """
+    Returns the filtered data with only the columns plot(*args, **kwargs) reads.
+    """
+    columns = plot.required_columns(*args, **kwargs)
+    data = prepare_dataset(selected_dataset, datasets[selected_dataset], columns=columns)
+    return filter_data_by_time_range(data, start_time, end_time)
 
-with tab1:
-    st.write("Overview of Solar Radiation Insights")
-    # Display dataset summary statistics
-    st.write("#### Dataset Summary")
-    st.write(
-        "The dataset contains key solar radiation parameters recorded over time. Below are some basic statistics:"
-    )
-    st.write(df.describe())
-    # Show statistical summary of numeric columns
-    st.write(f"**Total Records:** {df.shape[0]} rows")
-    st.write(f"**Number of Features:** {df.shape[1]} columns")
-
-    # Display the date range of the data
-    if "Timestamp" in df.columns:
-        start_date = df["Timestamp"].min()
-        end_date = df["Timestamp"].max()
-        st.write(f"**Data Range:** {start_date} to {end_date}")
-
-    # Key insights
-    st.write("#### Key Insights")
-    st.write(
-        "- **Global Horizontal Irradiance (GHI)**: A measure of the total solar radiation on a horizontal surface."
-    )
-    st.write(
-        "- **Direct Normal Irradiance (DNI)**: Measures direct sunlight at the surface."
+
+def plot_job(plot, *args, indexes=None, data=None, **kwargs):
+    """
+    Returns (key, render, load) for plot(view, *args, **kwargs), as taken by
+    render_cache.get_or_render: the render cache key (dataset fingerprint, time
+    range, plot, parameters), a function drawing the figure and a function loading
+    its inputs (run outside the figure lock). indexes returns extra keyword
+    arguments that don't change the figure (only built on a miss); data overrides
+    the default view.
+    """
+    key = render_key(
+        selected_dataset,
+        source_fingerprint(datasets[selected_dataset]),
+        start_time,
+        end_time,
+        plot.__name__,
+        args,
+        sorted(kwargs.items()),
     )
-    st.write("- **Diffuse Horizontal Irradiance (DHI)**: Measures scattered sunlight.")
-    st.write(
-        "- The dataset includes cleaning impact and wind rose data, aiding in solar system performance analysis."
+
+    def load():
+        frame = view(plot, *args, **kwargs) if data is None else data()
+        return frame, indexes() if indexes else {}
+
+    def render(frame, extra):
+        return plot(frame, *args, **extra, **kwargs)
+
+    return key, render, load
+
+
+def time_series_data():
+    # Wide ranges are plotted from the coarsest rollup level with enough points
+    _, rollup = time_series_pyramid().query(start_time, end_time)
+    return view(create_time_series) if rollup is None else rollup
+
+
+def time_series_pyramid():
+    return rollup_pyramid(selected_dataset, datasets[selected_dataset], columns=create_time_series.required_columns())
+
+
+def correlation_indexes():
+    return {"correlation_index": correlation_index(selected_dataset, datasets[selected_dataset], correlation_columns)}
+
+
+def diurnal_profile_job():
+    # The profile widgets live in the Visualizations tab; prefetches use their last values
+    return plot_job(
+        create_diurnal_profile,
+        column=st.session_state.get("profile_column", "GHI"),
+        month=st.session_state.get("profile_month"),
+        indexes=lambda: {
+            "profile_cube": profile_cube(selected_dataset, datasets[selected_dataset], columns=profile_columns)
+        },
     )
 
+
+# Every figure of the Visualizations tab
+figures = {
+    "time_series": lambda: plot_job(create_time_series, data=time_series_data),
+    "diurnal_profile": diurnal_profile_job,
+    "correlation_solar": lambda: plot_job(generate_correlation_matrix, solar_temp_columns, indexes=correlation_indexes),
+    "correlation_wind": lambda: plot_job(generate_correlation_matrix, wind_columns, indexes=correlation_indexes),
+    "histogram_ghi": lambda: plot_job(plot_histogram, column="GHI"),
+    "histogram_ws": lambda: plot_job(plot_histogram, column="WS"),
+    "histogram_tmoda": lambda: plot_job(plot_histogram, column="TModA"),
+    "wind_rose": lambda: plot_job(
+        create_wind_rose,
+        wind_dir_col,
+        wind_speed_col,
+        indexes=lambda: {"wind_index": wind_rose_index(selected_dataset, datasets[selected_dataset])},
+    ),
+    "cleaning_impact": lambda: plot_job(
+        create_cleaning_impact_plot,
+        cleaning_col,
+        mod_col,
+        indexes=lambda: {
+            "sketch_index": quantile_sketch_index(selected_dataset, datasets[selected_dataset], columns=[mod_col])
+        },
+    ),
+    "scatter_rh_tmoda": lambda: plot_job(scatter_plot, x="RH", y="TModA", title="RH vs Temperature (TModA)"),
+    "scatter_rh_ghi": lambda: plot_job(scatter_plot, x="RH", y="GHI", title="RH vs Solar Radiation (GHI)"),
+    "bubble": lambda: plot_job(
+        bubble_chart, x="GHI", y="Tamb", size="RH", color="WS", title="GHI vs Tamb vs WS (Size: RH)"
+    ),
+    "pair_solar": lambda: plot_job(generate_pair_plot, solar_temp_columns),
+    "pair_wind": lambda: plot_job(generate_pair_plot, wind_columns),
+}
+
+
+# Figures rendered ahead in the background, in priority order (the cheap, most opened ones)
+prefetched_figures = ["time_series", "correlation_solar", "correlation_wind"]
+
+
+def show_figure(name):
+    """
+    Shows a figure as an image: from the render cache, from a prefetch that is
+    still running, or rendered now.
+    """
+    with span(f"figure {name}"):
+        key, render, load = figures[name]()
+        image = prefetcher.wait(key)
+        if image is None:
+            image = render_cache.get_or_render(key, render, load)
+    st.image(image, width="stretch")
+
+
+# Only the selected tab's content runs (each tab switch is a rerun)
+tab1, tab2, tab3 = st.tabs(["Overview", "Visualizations", "Raw Data"], key="tab", on_change="rerun")
+
+with tab1:
+    if tab1.open:
+        st.write("Overview of Solar Radiation Insights")
+        # Display dataset summary statistics
+        st.write("#### Dataset Summary")
+        st.write(
+            "The dataset contains key solar radiation parameters recorded over time. Below are some basic statistics:"
+        )
+        summary_columns = st.multiselect(
+            "Summary columns",
+            options=[c for c in dataset_handle.columns if c != "Timestamp"],
+            default=[c for c in solar_temp_columns if c in dataset_handle.columns],
+        )
+        # Served from the precomputed range indexes instead of describe() on the slice
+        with span("overview summary"):
+            summary = describe_range(
+                selected_dataset, datasets[selected_dataset], start_time, end_time, columns=summary_columns
+            )
+        st.write(summary)
+        # Show statistical summary of numeric columns
+        st.write(f"**Total Records:** {df.shape[0]} rows")
+        st.write(f"**Number of Features:** {len(dataset_handle.columns)} columns")
+
+        # Display the date range of the data
+        if "Timestamp" in df.columns:
+            start_date = df["Timestamp"].min()
+            end_date = df["Timestamp"].max()
+            st.write(f"**Data Range:** {start_date} to {end_date}")
+
+        # Key insights
+        st.write("#### Key Insights")
+        st.write(
+            "- **Global Horizontal Irradiance (GHI)**: A measure of the total solar radiation on a horizontal surface."
+        )
+        st.write(
+            "- **Direct Normal Irradiance (DNI)**: Measures direct sunlight at the surface."
+        )
+        st.write("- **Diffuse Horizontal Irradiance (DHI)**: Measures scattered sunlight.")
+        st.write(
+            "- The dataset includes cleaning impact and wind rose data, aiding in solar system performance analysis."
+        )
+
 with tab2:
+    if tab2.open:
+        st.session_state["visualizations_opened"] = True
+        st.write("visualization goes here")
+        if st.button("Generate Time-Series Plot"):
+            st.write("Time-Series Plot:")
+            level = time_series_pyramid().resolve(start_time, end_time)
+            if level != "1min":
+                st.caption(f"Showing {level} means.")
+            show_figure("time_series")
 
-    st.write("visualization goes here")
-    if st.button("Generate Time-Series Plot"):
-        st.write("Time-Series Plot:")
-        fig = create_time_series(df)
-        st.pyplot(fig)
-
-    if st.button("Generate Cleaning_Impact Plot"):
-        st.write("Cleaning-Impact Plot:")
-        fig = create_cleaning_impact_plot(df, cleaning_col, mod_col)
-        st.pyplot(fig)
-
-    if st.button("Generate Wind-Rose Plot"):
-        st.write("Wind-Rose Plot: ")
-        fig = create_wind_rose(df, wind_dir_col, wind_speed_col)
-        st.pyplot(fig)
-
-    if st.button("Generate Correlation Matrix"):
-        st.write("Correlation Matrix (Solar Radiation and Temperature):")
-        fig = generate_correlation_matrix(df, solar_temp_columns)
-        st.pyplot(fig)
-    # Pair Plot for Solar Radiation and Temperature
-    if st.button("Generate Pair Plot (Solar & Temp)"):
-        st.write("Pair Plot (Solar Radiation and Temperature):")
-        fig = generate_pair_plot(df, solar_temp_columns)
-        st.pyplot(fig)
-
-        # Correlation Analysis for Wind Conditions
-    if st.button("Generate Wind Condition Correlation"):
-        st.write("Correlation Matrix (Wind Conditions):")
-        fig = generate_correlation_matrix(df, wind_columns)
-        st.pyplot(fig)
-
-        # Pair Plot for Wind and Solar Radiation
-    if st.button("Generate Pair Plot (Wind & Solar)"):
-        st.write("Pair Plot (Wind Conditions and Solar Radiation):")
-        fig = generate_pair_plot(df, wind_columns)
-        st.pyplot(fig)
-
-    # Scatter Plots for Temperature Analysis
-    if st.button("RH vs Temperature (TModA)"):
-        st.write("Scatter Plot: RH vs Temperature (TModA)")
-        fig = scatter_plot(df, x="RH", y="TModA", title="RH vs Temperature (TModA)")
-        st.pyplot(fig)
-    if st.button("RH vs Solar Radiation (GHI)"):
-        st.write("Scatter Plot: RH vs Solar Radiation (GHI)")
-        fig = scatter_plot(df, x="RH", y="GHI", title="RH vs Solar Radiation (GHI)")
-        st.pyplot(fig)
-
-        # Histograms
-    if st.button("Histogram of GHI"):
-        st.write("Histogram: GHI (Global Horizontal Irradiance)")
-        fig = plot_histogram(df, column="GHI")
-        st.pyplot(fig)
-
-    if st.button("Histogram of WS"):
-        st.write("Histogram: WS (Wind Speed)")
-        fig = plot_histogram(df, column="WS")
-        st.pyplot(fig)
-
-    if st.button("Histogram of TModA"):
-        st.write("Histogram: TModA (Module Temperature A)")
-        fig = plot_histogram(df, column="TModA")
-        st.pyplot(fig)
-    if st.button("Generate Bubble Chart"):
-        st.write("Bubble-Chart")
-        fig = bubble_chart(
-            df,
-            x="GHI",
-            y="Tamb",
-            size="RH",
-            color="WS",
-            title="GHI vs Tamb vs WS (Size: RH)",
+        # Average day shape per month, read from the precomputed profile cube
+        profile_column, profile_month = st.columns(2)
+        profile_column.selectbox(
+            "Profile variable",
+            options=[c for c in profile_columns if c in dataset_handle.columns],
+            key="profile_column",
         )
-        st.pyplot(fig)
+        profile_month.selectbox(
+            "Profile month",
+            options=[None, *range(1, 13)],
+            format_func=lambda month: "All months" if month is None else calendar.month_name[month],
+            key="profile_month",
+        )
+        if st.button("Generate Diurnal Profile"):
+            st.write("Diurnal Profile:")
+            show_figure("diurnal_profile")
+
+        if st.button("Generate Cleaning_Impact Plot"):
+            st.write("Cleaning-Impact Plot:")
+            show_figure("cleaning_impact")
+
+        if st.button("Generate Wind-Rose Plot"):
+            st.write("Wind-Rose Plot: ")
+            show_figure("wind_rose")
 
-    with tab3:
+        if st.button("Generate Correlation Matrix"):
+            st.write("Correlation Matrix (Solar Radiation and Temperature):")
+            show_figure("correlation_solar")
+        # Pair Plot for Solar Radiation and Temperature
+        if st.button("Generate Pair Plot (Solar & Temp)"):
+            st.write("Pair Plot (Solar Radiation and Temperature):")
+            show_figure("pair_solar")
+
+            # Correlation Analysis for Wind Conditions
+        if st.button("Generate Wind Condition Correlation"):
+            st.write("Correlation Matrix (Wind Conditions):")
+            show_figure("correlation_wind")
+
+            # Pair Plot for Wind and Solar Radiation
+        if st.button("Generate Pair Plot (Wind & Solar)"):
+            st.write("Pair Plot (Wind Conditions and Solar Radiation):")
+            show_figure("pair_wind")
+
+        # Scatter Plots for Temperature Analysis
+        if st.button("RH vs Temperature (TModA)"):
+            st.write("Scatter Plot: RH vs Temperature (TModA)")
+            show_figure("scatter_rh_tmoda")
+        if st.button("RH vs Solar Radiation (GHI)"):
+            st.write("Scatter Plot: RH vs Solar Radiation (GHI)")
+            show_figure("scatter_rh_ghi")
+
+            # Histograms
+        if st.button("Histogram of GHI"):
+            st.write("Histogram: GHI (Global Horizontal Irradiance)")
+            show_figure("histogram_ghi")
+
+        if st.button("Histogram of WS"):
+            st.write("Histogram: WS (Wind Speed)")
+            show_figure("histogram_ws")
+
+        if st.button("Histogram of TModA"):
+            st.write("Histogram: TModA (Module Temperature A)")
+            show_figure("histogram_tmoda")
+        if st.button("Generate Bubble Chart"):
+            st.write("Bubble-Chart")
+            show_figure("bubble")
+
+with tab3:
+    if tab3.open:
         st.write("Raw Data display.")
-        st.write(df)
+        raw_columns = st.multiselect(
+            "Columns", options=dataset_handle.columns, default=[c for c in df.columns if c != "Timestamp_numeric"]
+        )
+        value_columns = [c for c in raw_columns if c != "Timestamp"]
+        sort_column, order_column, size_column = st.columns(3)
+        sort_by = sort_column.selectbox("Sort by", options=["Timestamp", *value_columns])
+        descending = order_column.toggle("Descending")
+        page_size = size_column.selectbox("Rows per page", options=PAGE_SIZES)
+
+        # Value range filters, bounded by the exact min/max of the selected time range
+        filters = []
+        filter_columns = st.multiselect("Filter columns", options=value_columns)
+        if filter_columns:
+            bounds = range_stats_index(selected_dataset, datasets[selected_dataset], filter_columns).summary(
+                start_time, end_time
+            )
+            for column in filter_columns:
+                if column not in bounds.columns:
+                    continue
+                low, high = bounds.loc["min", column], bounds.loc["max", column]
+                if pd.isna(low) or low == high:
+                    continue
+                filters.append(
+                    (column, *st.slider(f"{column} range", float(low), float(high), (float(low), float(high))))
+                )
+
+        # Only the visible page is loaded and sent to the browser
+        with span("raw data"):
+            order = raw_data_order(
+                selected_dataset,
+                datasets[selected_dataset],
+                start_time,
+                end_time,
+                sort_by=sort_by,
+                ascending=not descending,
+                filters=filters,
+            )
+            n_pages = max(1, -(-len(order) // page_size))
+            page = st.number_input("Page", min_value=1, max_value=n_pages, value=1) - 1
+            rows = raw_data_page(selected_dataset, datasets[selected_dataset], order, page, page_size, raw_columns)
+        st.dataframe(rows)
+        first_row = page * page_size + 1 if len(order) else 0
+        st.caption(f"Rows {first_row}-{page * page_size + len(rows)} of {len(order)}")
 
 st.sidebar.title("Filters")
 show_missing = st.sidebar.checkbox("Show Missing Values")
 if show_missing:
-    st.write(df.isnull().sum())
+    # Summed from per-day null counts, only the partial days at both ends are scanned
+    st.write(null_count_index(selected_dataset, datasets[selected_dataset]).counts(start_time, end_time))
+
+# Once the session has opened the Visualizations tab, render the figures this selection is
+# likely to open next in the background; moving the slider or switching datasets cancels
+# the jobs still queued
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+prefetch_jobs = []
+if st.session_state.get("visualizations_opened"):
+    prefetch_jobs = [figures[name]() for name in prefetched_figures]
+prefetcher.schedule(st.session_state["session_id"], prefetch_jobs)
+
+# Performance panel: per-stage timings of this rerun, rolling p50/p95 and trace exports
+if tracer.enabled:
+    st.sidebar.title("Performance")
+    st.sidebar.write("This rerun:")
+    st.sidebar.dataframe(pd.DataFrame(tracer.breakdown(run)), hide_index=True)
+    st.sidebar.write("Rolling p50/p95 per stage (ms):")
+    st.sidebar.dataframe(
+        pd.DataFrame.from_dict(tracer.percentiles(), orient="index", columns=["calls", "p50_ms", "p95_ms"]).round(1)
+    )
+    st.sidebar.download_button("Download trace (JSON)", tracer.to_json(), file_name="trace.json")
+    st.sidebar.download_button("Download Chrome trace", tracer.to_chrome_trace(), file_name="trace-chrome.json")
@@ -0,0 +1,91 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .render_cache import render_cache
+
+# Background renders share the CPU with the sessions' own script runs
+MAX_WORKERS = 2
+
+
+class PrefetchScheduler:
+    """
+    Renders the figures a session is likely to open next on a bounded thread pool.
+    Each session has one current selection: scheduling a new one cancels that
+    session's queued jobs (jobs already running finish and still fill the cache).
+    Jobs are submitted in the given priority order and are deduplicated by key
+    across sessions. A session is only tracked while it has jobs queued or running,
+    so sessions that never come back leave nothing behind.
+    """
+
+    def __init__(self, cache, max_workers=MAX_WORKERS):
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._sessions = {}
+
+    def schedule(self, session, jobs):
+        """
+        Replaces the session's pending jobs with jobs, a list of (key, render) or
+        (key, render, load) tuples in priority order, as taken by RenderCache.get_or_render.
+        """
+        with self._lock:
+            wanted = {key for other, keys in self._sessions.items() if other != session for key in keys}
+            # A cancelled job's callback (_forget) edits the list, so iterate over a copy
+            for key in list(self._sessions.get(session, [])):
+                future = self._jobs.get(key) if key not in wanted else None
+                if future is not None and future.cancel():
+                    self._jobs.pop(key, None)
+            keys = []
+            for key, *job in jobs:
+                if key not in self._jobs:
+                    if key in self.cache:
+                        continue
+                    future = self._pool.submit(self.cache.get_or_render, key, *job)
+                    self._jobs[key] = future
+                    future.add_done_callback(lambda _, key=key: self._forget(key))
+                if key in self._jobs:
+                    keys.append(key)
+            if keys:
+                self._sessions[session] = keys
+            else:
+                self._sessions.pop(session, None)
+
+    def wait(self, key, timeout=None):
+        """
+        Waits for a prefetch of key that is already running, so the caller doesn't
+        render the same figure twice. Returns the image bytes, or None if no job
+        for key is running (or it failed).
+        """
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is None or not future.running():
+                if future is not None and future.cancel():
+                    self._jobs.pop(key, None)
+                return None
+        try:
+            return future.result(timeout)
+        except Exception:
+            return None
+
+    def pending(self):
+        with self._lock:
+            return len(self._jobs)
+
+    def tracked_sessions(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _forget(self, key):
+        with self._lock:
+            future = self._jobs.get(key)
+            if future is not None and future.done():
+                del self._jobs[key]
+            # Finished keys no longer need cancelling; drop sessions left with none
+            for session, keys in list(self._sessions.items()):
+                if key in keys:
+                    keys.remove(key)
+                    if not keys:
+                        del self._sessions[session]
+
+
+prefetcher = PrefetchScheduler(render_cache)
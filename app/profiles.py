@@ -0,0 +1,197 @@
+import os
+import numpy as np
+import pandas as pd
+from .rollups import ROLLUP_DIR, sensor_columns
+from .time_index import has_time_index
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class ProfileCube:
+    """
+    Average day shape per month: count/sum/min/max of every sensor per (calendar
+    month of the record, time of day), as (column, month, time-of-day slot) arrays.
+    Rows are added with one np.bincount per column over integer (month, slot) keys,
+    so new data can be merged in as it arrives; a profile query reads a few KB
+    instead of scanning the rows.
+    """
+
+    def __init__(self, columns, step=1):
+        if MINUTES_PER_DAY % step:
+            raise ValueError("step must divide a day into whole minutes.")
+        self.columns = list(columns)
+        self.step = step
+        self.n_slots = MINUTES_PER_DAY // step
+        # Months of the record as year * 12 + month - 1, sorted
+        self.periods = np.array([], dtype="int64")
+        shape = (len(self.columns), 0, self.n_slots)
+        self.count = np.zeros(shape, dtype="int64")
+        self.sum = np.zeros(shape)
+        self.min = np.full(shape, np.inf)
+        self.max = np.full(shape, -np.inf)
+
+    @classmethod
+    def from_frame(cls, df, columns=None, step=1):
+        """
+        Builds the cube of a frame with a 'Timestamp' column over columns (default:
+        every numeric sensor column).
+        """
+        cube = cls(sensor_columns(df) if columns is None else columns, step)
+        cube.update(df)
+        return cube
+
+    @property
+    def nbytes(self):
+        return self.count.nbytes + self.sum.nbytes + self.min.nbytes + self.max.nbytes
+
+    def update(self, df):
+        """
+        Adds the rows of df (e.g. newly appended ones); missing and infinite values are skipped.
+        """
+        timestamps = pd.DatetimeIndex(df["Timestamp"])
+        known = ~timestamps.isna()
+        timestamps = timestamps[known]
+        if not len(timestamps):
+            return self
+        period_ids = timestamps.year.to_numpy().astype("int64") * 12 + timestamps.month.to_numpy() - 1
+        slots = (timestamps.hour.to_numpy() * 60 + timestamps.minute.to_numpy()) // self.step
+        self._add_periods(np.unique(period_ids))
+        keys = np.searchsorted(self.periods, period_ids) * self.n_slots + slots
+        n_keys = len(self.periods) * self.n_slots
+
+        for i, column in enumerate(self.columns):
+            if column not in df.columns:
+                continue
+            values = df[column].to_numpy(dtype="float64")[known]
+            valid = np.isfinite(values)
+            column_keys, values = keys[valid], values[valid]
+            self.count[i] += np.bincount(column_keys, minlength=n_keys).reshape(-1, self.n_slots)
+            self.sum[i] += np.bincount(column_keys, weights=values, minlength=n_keys).reshape(-1, self.n_slots)
+            # Each column's block is contiguous, so the flat views update the cube in place
+            np.minimum.at(self.min[i].reshape(-1), column_keys, values)
+            np.maximum.at(self.max[i].reshape(-1), column_keys, values)
+        return self
+
+    def profile(self, column, month=None):
+        """
+        Returns the average day of column for one calendar month (1-12, default: all
+        months): mean/min/max/count per time-of-day slot, indexed by minute of day.
+        """
+        i = self.columns.index(column)
+        rows = self.periods % 12 == month - 1 if month is not None else slice(None)
+        count = self.count[i, rows].sum(axis=0)
+        empty = count == 0
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.sum[i, rows].sum(axis=0) / count
+        return pd.DataFrame(
+            {
+                "mean": np.where(empty, np.nan, mean),
+                "min": np.where(empty, np.nan, self.min[i, rows].min(axis=0, initial=np.inf)),
+                "max": np.where(empty, np.nan, self.max[i, rows].max(axis=0, initial=-np.inf)),
+                "count": count,
+            },
+            index=pd.Index(np.arange(self.n_slots) * self.step, name="minute_of_day"),
+        )
+
+    def monthly(self, column, stat="mean"):
+        """
+        Returns one stat ('mean', 'min', 'max' or 'count') of column as a calendar
+        month (1-12) x minute-of-day table.
+        """
+        table = pd.DataFrame({month: self.profile(column, month)[stat] for month in range(1, 13)}).T
+        table.index.name = "month"
+        return table
+
+    def for_range(self, df):
+        """
+        Returns the cube of the rows of df, a time-range slice of the indexed frame
+        this cube was built from: the months lying wholly inside the range are taken
+        from the cube, only the rows of the partial months at both ends are scanned.
+        """
+        if not has_time_index(df):
+            raise ValueError("for_range requires a frame with a sorted DatetimeIndex.")
+        cube = ProfileCube(self.columns, self.step)
+        if not len(df):
+            return cube
+        start, end = df.index[0], df.index[-1]
+        step = pd.Timedelta(minutes=self.step)
+        # Whole months: from the first month starting at or after start to the last one
+        # ending (its last slot included) at or before end
+        first = start.to_period("M") + int(start > start.to_period("M").start_time)
+        last = end.to_period("M") - int((end.to_period("M") + 1).start_time > end + step)
+        if first > last:
+            return cube.update(df)
+
+        first_id, last_id = first.year * 12 + first.month - 1, last.year * 12 + last.month - 1
+        whole = (self.periods >= first_id) & (self.periods <= last_id)
+        cube.periods = self.periods[whole]
+        cube.count, cube.sum = self.count[:, whole], self.sum[:, whole]
+        cube.min, cube.max = self.min[:, whole], self.max[:, whole]
+        head = df.index.searchsorted(first.start_time, side="left")
+        tail = df.index.searchsorted((last + 1).start_time, side="left")
+        return cube.update(df.iloc[:head]).update(df.iloc[tail:])
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            columns=np.array(self.columns),
+            step=self.step,
+            periods=self.periods,
+            count=self.count,
+            sum=self.sum,
+            min=self.min,
+            max=self.max,
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            cube = cls(data["columns"].tolist(), int(data["step"]))
+            cube.periods = data["periods"]
+            cube.count, cube.sum, cube.min, cube.max = data["count"], data["sum"], data["min"], data["max"]
+        return cube
+
+    def _add_periods(self, period_ids):
+        periods = np.union1d(self.periods, period_ids)
+        if len(periods) == len(self.periods):
+            return
+        keep = np.searchsorted(periods, self.periods)
+        shape = (len(self.columns), len(periods), self.n_slots)
+        for name, fill in (("count", 0), ("sum", 0.0), ("min", np.inf), ("max", -np.inf)):
+            grown = np.full(shape, fill, dtype=getattr(self, name).dtype)
+            grown[:, keep] = getattr(self, name)
+            setattr(self, name, grown)
+        self.periods = periods
+
+
+def profile_path(name, output_dir=ROLLUP_DIR):
+    """
+    Returns the path of a dataset's stored profile cube.
+    """
+    return os.path.join(output_dir, f"{name}-profiles.npz")
+
+
+def build_profiles(df, name, output_dir=ROLLUP_DIR):
+    """
+    Builds the profile cube of a cleaned dataset and writes it next to its rollups.
+    Rows flagged as outliers are left out.
+    """
+    if "outlier" in df.columns:
+        df = df[~df["outlier"].astype(bool)]
+    os.makedirs(output_dir, exist_ok=True)
+    path = profile_path(name, output_dir)
+    ProfileCube.from_frame(df).save(path)
+    return path
+
+
+def append_profiles(df, name, output_dir=ROLLUP_DIR):
+    """
+    Adds newly appended rows to the stored profile cube (built from them if there is none yet).
+    """
+    if "outlier" in df.columns:
+        df = df[~df["outlier"].astype(bool)]
+    os.makedirs(output_dir, exist_ok=True)
+    path = profile_path(name, output_dir)
+    cube = ProfileCube.load(path).update(df) if os.path.exists(path) else ProfileCube.from_frame(df)
+    cube.save(path)
+    return path
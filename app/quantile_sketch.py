@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from .time_index import has_time_index, time_buckets, time_range_positions
+
+BUCKET = pd.Timedelta(days=1)
+N_BINS = 256
+
+
+class QuantileSketchIndex:
+    """
+    Mergeable quantile sketches per time bucket, column and group.
+    Each sketch is a histogram over a fixed per-column grid, so sketches merge by
+    addition and a quantile is off by at most one bin width ((max - min) / n_bins).
+    Partial buckets at the ends of a query range are binned from the raw rows.
+    """
+
+    def __init__(self, df, columns=None, group_col="Cleaning", bucket=BUCKET, n_bins=N_BINS):
+        if not has_time_index(df):
+            raise ValueError("QuantileSketchIndex requires a frame with a sorted DatetimeIndex.")
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns
+        self.df = df
+        self.columns = list(columns)
+        self.group_col = group_col if group_col in df.columns else None
+        self.n_bins = n_bins
+
+        values = self._values(0, len(df))
+        low = np.where(np.isnan(values), np.inf, values).min(axis=0, initial=np.inf)
+        high = np.where(np.isnan(values), -np.inf, values).max(axis=0, initial=-np.inf)
+        low = np.where(np.isfinite(low), low, 0.0)
+        high = np.where(np.isfinite(high), high, 0.0)
+        self.low = low
+        self.width = np.where(high > low, (high - low) / n_bins, 1.0)
+
+        groups = df[self.group_col].dropna().unique() if self.group_col else []
+        self.groups = sorted(groups)
+
+        bucket_ids, self.bucket_rows = time_buckets(df, bucket)
+        n_buckets = len(self.bucket_rows) - 1
+        self.sketches = self._histogram(values, self._group_codes(0, len(df)), bucket_ids, n_buckets)
+
+    def histogram(self, start_time, end_time, group=None):
+        """
+        Returns the merged histograms (n_columns x n_bins) for [start_time, end_time],
+        optionally restricted to rows whose group column equals group.
+        """
+        start, stop = time_range_positions(self.df, start_time, end_time)
+        first_full = np.searchsorted(self.bucket_rows, start, side="left")
+        last_full = np.searchsorted(self.bucket_rows, stop, side="right") - 1
+        if first_full >= last_full:
+            return self._scan(start, stop, group)
+
+        merged = self._select_group(self.sketches[:, first_full:last_full].sum(axis=1, dtype="int64"), group)
+        merged += self._scan(start, self.bucket_rows[first_full], group)
+        merged += self._scan(self.bucket_rows[last_full], stop, group)
+        return merged
+
+    def quantiles(self, qs, start_time, end_time, group=None):
+        """
+        Returns approximate quantiles for every column as a DataFrame indexed by qs.
+        """
+        hist = self.histogram(start_time, end_time, group)
+        return pd.DataFrame(self._quantiles(hist, qs), index=list(qs), columns=self.columns)
+
+    def box_stats(self, column, start_time, end_time, group=None, label=None):
+        """
+        Returns Matplotlib bxp() statistics for one column, computed from the sketches.
+        Whiskers extend to the furthest occupied bin within 1.5 IQR; fliers are not drawn.
+        """
+        col = self.columns.index(column)
+        hist = self.histogram(start_time, end_time, group)
+        q1, med, q3 = self._quantiles(hist, [0.25, 0.5, 0.75])[:, col]
+        centers = self.low[col] + (np.arange(self.n_bins) + 0.5) * self.width[col]
+        occupied = centers[hist[col] > 0]
+        iqr = q3 - q1
+        inside = occupied[(occupied >= q1 - 1.5 * iqr) & (occupied <= q3 + 1.5 * iqr)]
+        return {
+            "label": label,
+            "med": med,
+            "q1": q1,
+            "q3": q3,
+            "whislo": min(inside.min(), q1) if len(inside) else q1,
+            "whishi": max(inside.max(), q3) if len(inside) else q3,
+            "fliers": [],
+        }
+
+    def _quantiles(self, hist, qs):
+        cumulative = np.cumsum(hist, axis=1)
+        total = cumulative[:, -1]
+        rows = np.arange(len(self.columns))
+        result = np.full((len(qs), len(self.columns)), np.nan)
+        for i, q in enumerate(qs):
+            target = q * total
+            # First bin whose cumulative count reaches the target rank, interpolated within the bin
+            bins = np.minimum((cumulative < target[:, None]).sum(axis=1), self.n_bins - 1)
+            previous = np.where(bins > 0, cumulative[rows, bins - 1], 0)
+            in_bin = hist[rows, bins]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                fraction = np.clip(np.where(in_bin > 0, (target - previous) / in_bin, 0.5), 0, 1)
+            value = self.low + (bins + fraction) * self.width
+            result[i] = np.where(total > 0, value, np.nan)
+        return result
+
+    def _values(self, start, stop):
+        values = self.df[self.columns].iloc[start:stop].to_numpy(dtype="float64", copy=True)
+        values[~np.isfinite(values)] = np.nan
+        return values
+
+    def _group_codes(self, start, stop):
+        # One code per group value; rows with a missing or unknown group get the last code
+        if not self.group_col:
+            return np.zeros(stop - start, dtype="int64")
+        groups = self.df[self.group_col].iloc[start:stop].to_numpy()
+        codes = np.full(len(groups), len(self.groups), dtype="int64")
+        for code, value in enumerate(self.groups):
+            codes[groups == value] = code
+        return codes
+
+    def _select_group(self, hist, group):
+        if group is None:
+            return hist.sum(axis=0)
+        if group not in self.groups:
+            return np.zeros(hist.shape[1:], dtype=hist.dtype)
+        return hist[self.groups.index(group)].copy()
+
+    def _histogram(self, values, group_codes, bucket_ids, n_buckets):
+        n_groups = len(self.groups) + 1
+        n_cols = len(self.columns)
+        valid = ~np.isnan(values)
+        bins = np.clip(np.floor((np.nan_to_num(values) - self.low) / self.width), 0, self.n_bins - 1).astype("int64")
+        keys = ((group_codes[:, None] * n_buckets + bucket_ids[:, None]) * n_cols + np.arange(n_cols)) * self.n_bins
+        counts = np.bincount((keys + bins)[valid], minlength=n_groups * n_buckets * n_cols * self.n_bins)
+        return counts.astype("int32").reshape(n_groups, n_buckets, n_cols, self.n_bins)
+
+    def _scan(self, start, stop, group):
+        if stop <= start:
+            return np.zeros((len(self.columns), self.n_bins), dtype="int64")
+        hist = self._histogram(
+            self._values(start, stop), self._group_codes(start, stop), np.zeros(stop - start, dtype="int64"), 1
+        )
+        return self._select_group(hist[:, 0].astype("int64"), group)
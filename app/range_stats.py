@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from .time_index import has_time_index, time_range_positions
+
+# Rows per block. Whole blocks are answered from precomputed aggregates,
+# only the partial blocks at both ends of a range are scanned.
+BLOCK_SIZE = 1024
+
+
+class RangeStatsIndex:
+    """
+    Answers count/mean/std/min/max for any time range of a time-indexed frame
+    without materializing the slice.
+    - Prefix sums of count, sum and sum of squares over blocks give count/mean/std.
+    - A segment tree over block minima/maxima gives min/max in O(log n).
+    """
+
+    def __init__(self, df, columns=None, block_size=BLOCK_SIZE):
+        if not has_time_index(df):
+            raise ValueError("RangeStatsIndex requires a frame with a sorted DatetimeIndex.")
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns
+        self.df = df
+        self.columns = list(columns)
+        self.block_size = block_size
+
+        values = df[self.columns].to_numpy(dtype="float64", copy=True)
+        values[~np.isfinite(values)] = np.nan
+        n_rows, n_cols = values.shape
+        n_blocks = -(-n_rows // block_size)
+
+        # Shift by the column means so sums of squares don't lose precision
+        counts = (~np.isnan(values)).sum(axis=0)
+        self.shift = np.nansum(values, axis=0) / np.maximum(counts, 1)
+
+        padded = np.full((n_blocks * block_size, n_cols), np.nan)
+        padded[:n_rows] = values - self.shift
+        blocks = padded.reshape(n_blocks, block_size, n_cols)
+        valid = ~np.isnan(blocks)
+        filled = np.where(valid, blocks, 0.0)
+
+        self.count_prefix = _prefix(valid.sum(axis=1))
+        self.sum_prefix = _prefix(filled.sum(axis=1))
+        self.sumsq_prefix = _prefix((filled**2).sum(axis=1))
+        self.min_tree = _SegmentTree(np.where(valid, blocks, np.inf).min(axis=1), np.minimum, np.inf)
+        self.max_tree = _SegmentTree(np.where(valid, blocks, -np.inf).max(axis=1), np.maximum, -np.inf)
+
+    def query(self, start, stop):
+        """
+        Returns the aggregates (count, sum, sumsq, min, max) of the shifted values
+        of rows [start, stop), one array entry per column.
+        """
+        first_block = -(-start // self.block_size)
+        last_block = stop // self.block_size
+        if first_block >= last_block:
+            return self._scan(start, stop)
+
+        aggregates = (
+            self.count_prefix[last_block] - self.count_prefix[first_block],
+            self.sum_prefix[last_block] - self.sum_prefix[first_block],
+            self.sumsq_prefix[last_block] - self.sumsq_prefix[first_block],
+            self.min_tree.query(first_block, last_block),
+            self.max_tree.query(first_block, last_block),
+        )
+        for edge in (
+            self._scan(start, first_block * self.block_size),
+            self._scan(last_block * self.block_size, stop),
+        ):
+            aggregates = _combine(aggregates, edge)
+        return aggregates
+
+    def summary(self, start_time, end_time):
+        """
+        Returns a describe()-style table (count, mean, std, min, max) for the rows
+        within [start_time, end_time].
+        """
+        start, stop = time_range_positions(self.df, start_time, end_time)
+        count, total, total_sq, low, high = self.query(start, stop)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+            variance = (total_sq - total * mean) / (count - 1)
+        std = np.sqrt(np.clip(variance, 0, None))
+        std[count < 2] = np.nan
+        empty = count == 0
+        table = pd.DataFrame(
+            [
+                count.astype("float64"),
+                np.where(empty, np.nan, mean + self.shift),
+                std,
+                np.where(empty, np.nan, low + self.shift),
+                np.where(empty, np.nan, high + self.shift),
+            ],
+            index=["count", "mean", "std", "min", "max"],
+            columns=self.columns,
+        )
+        return table
+
+    def _scan(self, start, stop):
+        values = self.df[self.columns].iloc[start:stop].to_numpy(dtype="float64") - self.shift
+        valid = np.isfinite(values)
+        filled = np.where(valid, values, 0.0)
+        return (
+            valid.sum(axis=0),
+            filled.sum(axis=0),
+            (filled**2).sum(axis=0),
+            np.where(valid, values, np.inf).min(axis=0, initial=np.inf),
+            np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf),
+        )
+
+
+class _SegmentTree:
+    """
+    Bottom-up segment tree over the rows of a 2-D array, for an associative op.
+    """
+
+    def __init__(self, leaves, op, identity):
+        self.op = op
+        self.identity = identity
+        self.size = 1
+        while self.size < max(len(leaves), 1):
+            self.size *= 2
+        self.tree = np.full((2 * self.size,) + leaves.shape[1:], identity)
+        self.tree[self.size : self.size + len(leaves)] = leaves
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = op(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def query(self, start, stop):
+        """
+        Combines leaves [start, stop).
+        """
+        result = np.full(self.tree.shape[1:], self.identity)
+        start += self.size
+        stop += self.size
+        while start < stop:
+            if start & 1:
+                result = self.op(result, self.tree[start])
+                start += 1
+            if stop & 1:
+                stop -= 1
+                result = self.op(result, self.tree[stop])
+            start //= 2
+            stop //= 2
+        return result
+
+
+def _prefix(block_values):
+    prefix = np.zeros((len(block_values) + 1,) + block_values.shape[1:])
+    np.cumsum(block_values, axis=0, out=prefix[1:])
+    return prefix
+
+
+def _combine(left, right):
+    return (
+        left[0] + right[0],
+        left[1] + right[1],
+        left[2] + right[2],
+        np.minimum(left[3], right[3]),
+        np.maximum(left[4], right[4]),
+    )
@@ -0,0 +1,77 @@
+import numpy as np
+from .lazy_imports import lazy_import
+
+colors = lazy_import("matplotlib.colors")
+plt = lazy_import("matplotlib.pyplot")
+
+# Above this many rows, scatter-style plots are rasterized instead of drawn per point
+RASTER_ROWS = 50_000
+
+RASTER_SHAPE = (300, 400)
+
+
+def rasterize_points(x, y, values=(), shape=RASTER_SHAPE):
+    """
+    Aggregates points into a (height, width) pixel grid with np.bincount.
+    Returns (counts, means, extent): the point count per pixel, the per-pixel mean
+    of every array in values (NaN where empty) and the (xmin, xmax, ymin, ymax) extent.
+    Points with a non-finite coordinate are skipped.
+    """
+    height, width = shape
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    valid = np.isfinite(x) & np.isfinite(y)
+    values = [np.asarray(v, dtype="float64") for v in values]
+    for v in values:
+        valid &= np.isfinite(v)
+    x, y = x[valid], y[valid]
+    values = [v[valid] for v in values]
+    if not len(x):
+        return np.zeros(shape), [np.full(shape, np.nan) for _ in values], (0.0, 1.0, 0.0, 1.0)
+
+    x_min, x_max = x.min(), x.max()
+    y_min, y_max = y.min(), y.max()
+    x_span = x_max - x_min or 1.0
+    y_span = y_max - y_min or 1.0
+    columns = np.minimum(((x - x_min) / x_span * width).astype("int64"), width - 1)
+    rows = np.minimum(((y - y_min) / y_span * height).astype("int64"), height - 1)
+    pixels = rows * width + columns
+
+    counts = np.bincount(pixels, minlength=height * width).astype("float64")
+    means = []
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for v in values:
+            means.append((np.bincount(pixels, weights=v, minlength=height * width) / counts).reshape(shape))
+    extent = (x_min, x_min + x_span, y_min, y_min + y_span)
+    return counts.reshape(shape), means, extent
+
+
+def _value_range(values):
+    """
+    Returns the (min, max) of the finite values, or (0, 1) when there are none.
+    """
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return 0.0, 1.0
+    return values.min(), values.max()
+
+
+def bubble_image(counts, size_mean, color_mean=None, cmap="viridis"):
+    """
+    Turns rasterized bubble-chart aggregates into an RGBA image: pixels are colored by
+    the mean color value (plain blue without one) and their opacity follows the mean size.
+    Returns (rgba, norm), norm being the color normalization (None without a color column).
+    """
+    filled = counts > 0
+    low, high = _value_range(size_mean[filled])
+    with np.errstate(invalid="ignore"):
+        scaled = np.clip((size_mean - low) / ((high - low) or 1.0), 0, 1)
+    if color_mean is not None:
+        norm = colors.Normalize(*_value_range(color_mean[filled]))
+        rgba = plt.get_cmap(cmap)(norm(np.nan_to_num(color_mean)))
+    else:
+        norm = None
+        rgba = np.zeros(counts.shape + (4,))
+        rgba[..., 2] = 1.0
+    rgba[..., 3] = np.where(filled, 0.2 + 0.8 * np.nan_to_num(scaled), 0.0)
+    return rgba, norm
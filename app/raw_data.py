@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from .time_index import has_time_index, time_buckets, time_range_positions
+
+# Rows per page offered by the Raw Data tab
+PAGE_SIZES = (50, 100, 500, 1000)
+BUCKET = pd.Timedelta(days=1)
+
+
+class NullCountIndex:
+    """
+    Answers per-column missing-value counts for any time range of a time-indexed
+    frame. Null counts are summed per time bucket up front (as prefix sums), so a
+    range is answered from its whole buckets plus a scan of the partial buckets at
+    both ends.
+    """
+
+    def __init__(self, df, bucket=BUCKET):
+        if not has_time_index(df):
+            raise ValueError("NullCountIndex requires a frame with a sorted DatetimeIndex.")
+        self.df = df
+        self.columns = list(df.columns)
+        _, self.bucket_rows = time_buckets(df, bucket)
+        row_prefix = np.zeros((len(df) + 1, len(self.columns)), dtype="int64")
+        np.cumsum(df.isna().to_numpy(), axis=0, out=row_prefix[1:])
+        # Null counts of rows [0, bucket start), one row per bucket boundary
+        self.prefix = row_prefix[self.bucket_rows]
+
+    def counts(self, start_time, end_time):
+        """
+        Returns the number of missing values per column within [start_time, end_time].
+        """
+        start, stop = time_range_positions(self.df, start_time, end_time)
+        first = np.searchsorted(self.bucket_rows, start, side="left")
+        last = np.searchsorted(self.bucket_rows, stop, side="right") - 1
+        if first >= last:
+            counts = self._scan(start, stop)
+        else:
+            counts = (
+                self.prefix[last]
+                - self.prefix[first]
+                + self._scan(start, self.bucket_rows[first])
+                + self._scan(self.bucket_rows[last], stop)
+            )
+        return pd.Series(counts, index=self.columns, dtype="int64")
+
+    def _scan(self, start, stop):
+        return self.df.iloc[start:stop].isna().to_numpy().sum(axis=0)
+
+
+def row_order(df, start, stop, sort_by=None, ascending=True, filters=()):
+    """
+    Returns the row positions within [start, stop) that pass filters, a sequence of
+    (column, low, high) inclusive value ranges, in display order: by sort_by (stable,
+    missing values last) or by time when sort_by is None or 'Timestamp'.
+    Without filters, time order is a range object (no per-row work).
+    """
+    by_time = sort_by is None or sort_by == "Timestamp"
+    if by_time and not filters:
+        return range(start, stop) if ascending else range(stop - 1, start - 1, -1)
+
+    positions = np.arange(start, stop)
+    for column, low, high in filters:
+        values = df[column].to_numpy()[positions]
+        positions = positions[(values >= low) & (values <= high)]
+    if by_time:
+        return positions if ascending else positions[::-1]
+    values = pd.Series(df[sort_by].to_numpy()[positions])
+    return positions[values.sort_values(ascending=ascending, kind="stable", na_position="last").index.to_numpy()]
+
+
+def page_rows(df, order, page, page_size, columns=None):
+    """
+    Returns the rows of page (0-based) of order, restricted to columns (default: all).
+    """
+    positions = np.asarray(order[page * page_size : (page + 1) * page_size], dtype="int64")
+    rows = df.iloc[positions]
+    return rows if columns is None else rows[[c for c in columns if c in rows.columns]]
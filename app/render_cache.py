@@ -0,0 +1,141 @@
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from .instrumentation import instrument
+from .lazy_imports import lazy_import
+
+plt = lazy_import("matplotlib.pyplot")
+
+# Rendered figures that survive server restarts live here
+RENDER_CACHE_DIR = "data/cache/figures"
+MAX_DISK_BYTES = 256 * 1024 * 1024
+
+# pyplot is not thread-safe: figures are built and rendered one at a time
+FIGURE_LOCK = threading.RLock()
+
+# Part of every key: bump it when a plot's output changes so old images are not served
+RENDER_VERSION = 1
+
+
+def render_key(*parts):
+    """
+    Returns a stable key for (dataset fingerprint, time range, plot function, parameters).
+    The parts must have a deterministic repr.
+    """
+    return hashlib.sha1(repr((RENDER_VERSION, *parts)).encode()).hexdigest()
+
+
+@instrument
+def figure_bytes(fig, fmt="png"):
+    """
+    Renders a matplotlib figure to PNG/SVG bytes and closes it.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, bbox_inches="tight")
+    plt.close(fig)
+    return buffer.getvalue()
+
+
+class RenderCache:
+    """
+    Two-tier cache of rendered figures: an in-memory LRU of the most recent images
+    in front of a size-capped directory on disk (least recently used files are
+    deleted first). Shared by every session in the process.
+    """
+
+    def __init__(self, max_entries=64, cache_dir=RENDER_CACHE_DIR, max_bytes=MAX_DISK_BYTES, fmt="png"):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fmt = fmt
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.{self.fmt}")
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+        return os.path.exists(self.path(key))
+
+    def get(self, key):
+        """
+        Returns the cached image bytes for key, or None.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # The file's mtime tracks its last use for the disk eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def put(self, key, data):
+        self._remember(key, data)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self._evict_disk()
+
+    def get_or_render(self, key, render, load=None):
+        """
+        Returns the cached image for key, or builds it, stores it and returns it:
+        load() (optional) returns the plot inputs as a tuple, then render(*inputs)
+        returns a matplotlib figure. Only render and the image encoding hold
+        FIGURE_LOCK, so loading data and building indexes run concurrently.
+        """
+        data = self.get(key)
+        if data is None:
+            inputs = () if load is None else load()
+            with FIGURE_LOCK:
+                data = figure_bytes(render(*inputs), self.fmt)
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(f".{self.fmt}"):
+                    os.remove(os.path.join(self.cache_dir, name))
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._entries[key] = data
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _evict_disk(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(f".{self.fmt}"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+render_cache = RenderCache()
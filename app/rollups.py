@@ -0,0 +1,172 @@
+import os
+import numpy as np
+import pandas as pd
+
+ROLLUP_DIR = "data/processed/rollups"
+
+# Pyramid levels, finest first. "1min" is the raw data and is never stored.
+LEVELS = {
+    "1min": pd.Timedelta(minutes=1),
+    "10min": pd.Timedelta(minutes=10),
+    "hourly": pd.Timedelta(hours=1),
+    "daily": pd.Timedelta(days=1),
+}
+STATS = ["mean", "min", "max", "count"]
+
+# Coarsest level is picked that still gives at least this many points for a range
+MIN_POINTS = 1000
+
+
+def sensor_columns(df):
+    """
+    Returns the numeric sensor columns that get rolled up.
+    """
+    excluded = {"Cleaning", "Timestamp_numeric", "timestamp_numeric", "outlier"}
+    return [c for c in df.select_dtypes(include=[np.number]).columns if c not in excluded]
+
+
+def build_level(df, freq, columns=None):
+    """
+    Aggregates 1-minute rows into mean/min/max/count per freq bucket.
+    Output columns are named '<column>_<stat>' and indexed by bucket start.
+    """
+    if columns is None:
+        columns = sensor_columns(df)
+    timestamps = pd.DatetimeIndex(pd.to_datetime(df["Timestamp"]))
+    grouped = df[columns].set_axis(timestamps).groupby(timestamps.floor(freq))
+    level = grouped.agg(STATS)
+    level.columns = [f"{column}_{stat}" for column, stat in level.columns]
+    level.index = level.index.rename(None)
+    level = level.sort_index()
+    level.insert(0, "Timestamp", level.index)
+    return level
+
+
+def build_rollups(df, name, output_dir=ROLLUP_DIR):
+    """
+    Builds every stored pyramid level for a cleaned dataset and writes it to Parquet.
+    Rows flagged as outliers are left out of the aggregates.
+    """
+    if "outlier" in df.columns:
+        df = df[~df["outlier"].astype(bool)]
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for level, freq in LEVELS.items():
+        if level == "1min":
+            continue
+        paths[level] = rollup_path(name, level, output_dir)
+        build_level(df, freq).to_parquet(paths[level])
+    return paths
+
+
+def append_rollups(df, name, output_dir=ROLLUP_DIR):
+    """
+    Merges the rollups of newly appended rows into the stored levels; the bucket
+    that was still filling up at the last run is combined with the new rows.
+    """
+    if "outlier" in df.columns:
+        df = df[~df["outlier"].astype(bool)]
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for level, freq in LEVELS.items():
+        if level == "1min":
+            continue
+        paths[level] = rollup_path(name, level, output_dir)
+        new = build_level(df, freq)
+        if os.path.exists(paths[level]):
+            new = merge_levels(pd.read_parquet(paths[level]), new)
+        new.to_parquet(paths[level])
+    return paths
+
+
+def merge_levels(old, new):
+    """
+    Combines two rollup levels; buckets present in both are merged through their sums.
+    """
+    combined = pd.concat([old, new])
+    columns = [c[: -len("_count")] for c in combined.columns if c.endswith("_count")]
+    parts = {}
+    for column in columns:
+        count = combined[f"{column}_count"]
+        parts[f"{column}_sum"] = (combined[f"{column}_mean"] * count).where(count > 0, 0.0)
+        parts[f"{column}_count"] = count
+        parts[f"{column}_min"] = combined[f"{column}_min"]
+        parts[f"{column}_max"] = combined[f"{column}_max"]
+    grouped = pd.DataFrame(parts).groupby(level=0)
+    sums = grouped.sum(min_count=1)
+    mins = grouped.min()
+    maxs = grouped.max()
+
+    level = pd.DataFrame(index=sums.index)
+    for column in columns:
+        count = sums[f"{column}_count"].fillna(0)
+        level[f"{column}_mean"] = (sums[f"{column}_sum"] / count).where(count > 0)
+        level[f"{column}_min"] = mins[f"{column}_min"]
+        level[f"{column}_max"] = maxs[f"{column}_max"]
+        level[f"{column}_count"] = count.astype("int64")
+    level.insert(0, "Timestamp", level.index)
+    return level.sort_index()
+
+
+def rollup_path(name, level, output_dir=ROLLUP_DIR):
+    """
+    Returns the Parquet path of one pyramid level.
+    """
+    return os.path.join(output_dir, f"{name}-{level}.parquet")
+
+
+class RollupPyramid:
+    """
+    Lazily loaded multi-resolution view of one dataset.
+    Levels are read from disk on first use; when a stored level is missing or older
+    than source_mtime it is built from source_df instead.
+    """
+
+    def __init__(self, name, output_dir=ROLLUP_DIR, source_df=None, source_mtime=None):
+        self.name = name
+        self.output_dir = output_dir
+        self.source_df = source_df
+        self.source_mtime = source_mtime
+        self._levels = {}
+
+    def level(self, level):
+        """
+        Returns one stored level, loading or building it on first use.
+        """
+        if level not in self._levels:
+            path = rollup_path(self.name, level, self.output_dir)
+            stale = self.source_mtime is not None and (
+                not os.path.exists(path) or os.path.getmtime(path) < self.source_mtime
+            )
+            if os.path.exists(path) and not (stale and self.source_df is not None):
+                self._levels[level] = pd.read_parquet(path)
+            elif self.source_df is not None:
+                self._levels[level] = build_level(self.source_df, LEVELS[level])
+            else:
+                raise FileNotFoundError(f"Rollup level {level} is missing for {self.name}: {path}")
+        return self._levels[level]
+
+    def resolve(self, start_time, end_time, min_points=MIN_POINTS):
+        """
+        Returns the coarsest level that still yields min_points buckets for the range.
+        """
+        span = pd.Timestamp(end_time) - pd.Timestamp(start_time)
+        chosen = "1min"
+        for level, freq in LEVELS.items():
+            if span / freq >= min_points:
+                chosen = level
+        return chosen
+
+    def query(self, start_time, end_time, min_points=MIN_POINTS, stat="mean"):
+        """
+        Returns (level, frame) for the range. The frame has a 'Timestamp' column and
+        one column per sensor holding the chosen stat, or is None for the raw level.
+        """
+        level = self.resolve(start_time, end_time, min_points)
+        if level == "1min":
+            return level, None
+        rows = self.level(level).loc[pd.Timestamp(start_time) : pd.Timestamp(end_time)]
+        suffix = f"_{stat}"
+        columns = {c: c[: -len(suffix)] for c in rows.columns if c.endswith(suffix)}
+        frame = rows[["Timestamp", *columns]].rename(columns=columns)
+        return level, frame
@@ -0,0 +1,133 @@
+import os
+import pandas as pd
+from .instrumentation import instrument
+
+# Station exports use one fixed timestamp format (1-minute data)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+# Used instead when a frame has timestamps off the minute, so none are truncated
+SECONDS_FORMAT = "%Y-%m-%d %H:%M:%S"
+FRACTIONAL_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+SENSOR_COLUMNS = [
+    "GHI",
+    "DNI",
+    "DHI",
+    "ModA",
+    "ModB",
+    "Tamb",
+    "RH",
+    "WS",
+    "WSgust",
+    "WSstdev",
+    "WD",
+    "WDstdev",
+    "BP",
+    "Precipitation",
+    "TModA",
+    "TModB",
+]
+
+# Dtypes used while parsing; 'Cleaning' is packed to uint8 afterwards when it has no gaps
+STATION_DTYPES = {
+    **{column: "float32" for column in SENSOR_COLUMNS},
+    "Cleaning": "float32",
+    "Comments": "string",
+    "outlier": "bool",
+}
+
+FLAG_COLUMNS = ["Cleaning"]
+
+
+def station_columns(path):
+    """
+    Returns the columns of a station CSV from its header line.
+    """
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def parse_timestamps(values):
+    """
+    Parses Timestamp strings with the fixed station format, falling back to ISO 8601
+    for files written with seconds.
+    """
+    try:
+        return pd.to_datetime(values, format=TIMESTAMP_FORMAT)
+    except ValueError:
+        return pd.to_datetime(values, format="ISO8601")
+
+
+def compact_frame(df):
+    """
+    Applies the station dtypes to a parsed frame: Timestamp as datetime64[ns] and
+    the flag columns packed to uint8 when they have no missing values.
+    """
+    if "Timestamp" in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df["Timestamp"]):
+            df["Timestamp"] = parse_timestamps(df["Timestamp"])
+        df["Timestamp"] = df["Timestamp"].astype("datetime64[ns]")
+    for column in FLAG_COLUMNS:
+        if column in df.columns and not df[column].isna().any():
+            df[column] = df[column].astype("uint8")
+    return df
+
+
+@instrument
+def read_station_csv(path, columns=None, chunksize=None):
+    """
+    Reads a raw or cleaned station CSV with compact dtypes (float32 sensors, uint8
+    'Cleaning', parsed Timestamp). columns projects the read to a subset (usecols).
+    With chunksize, returns an iterator of compact chunks.
+    """
+    kwargs = {"dtype": STATION_DTYPES}
+    if chunksize is None and isinstance(path, (str, os.PathLike)):
+        # Whole files go through the multithreaded pyarrow parser
+        if columns is not None:
+            kwargs["usecols"] = [column for column in station_columns(path) if column in columns]
+        return compact_frame(pd.read_csv(path, engine="pyarrow", **kwargs))
+    if columns is not None:
+        kwargs["usecols"] = lambda column: column in columns
+    if chunksize is None:
+        return compact_frame(pd.read_csv(path, **kwargs))
+    return (compact_frame(chunk) for chunk in pd.read_csv(path, chunksize=chunksize, **kwargs))
+
+
+def timestamp_format(timestamps):
+    """
+    Returns the coarsest format that writes timestamps without losing precision:
+    the station format for whole minutes, else with seconds (and fractions).
+    """
+    timestamps = timestamps.dropna()
+    if timestamps.dt.floor("s").ne(timestamps).any():
+        return FRACTIONAL_FORMAT
+    if timestamps.dt.floor("min").ne(timestamps).any():
+        return SECONDS_FORMAT
+    return TIMESTAMP_FORMAT
+
+
+def to_station_csv(df, path, **kwargs):
+    """
+    Writes a frame as CSV in the station format (same timestamp format as the raw
+    exports, with seconds kept when a timestamp has them).
+    """
+    date_format = TIMESTAMP_FORMAT
+    if "Timestamp" in df.columns and pd.api.types.is_datetime64_any_dtype(df["Timestamp"]):
+        date_format = timestamp_format(df["Timestamp"])
+    df.to_csv(path, index=False, date_format=date_format, **kwargs)
+
+
+def memory_report(paths):
+    """
+    Compares the in-memory size of each site read with inferred dtypes and with
+    the station schema. paths maps site names to CSV paths.
+    """
+    rows = []
+    for name, path in paths.items():
+        inferred = pd.read_csv(path).memory_usage(deep=True).sum()
+        compact = read_station_csv(path).memory_usage(deep=True).sum()
+        rows.append({
+            "site": name,
+            "inferred_bytes": int(inferred),
+            "compact_bytes": int(compact),
+            "ratio": compact / inferred,
+        })
+    return pd.DataFrame(rows).set_index("site")
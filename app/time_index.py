@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+
+def set_time_index(df):
+    """
+    Sorts the frame by 'Timestamp' and indexes it with a DatetimeIndex, so time
+    ranges can be located with a binary search.
+    """
+    if has_time_index(df):
+        return df
+    df = df.sort_values("Timestamp", kind="stable")
+    df.index = pd.DatetimeIndex(df["Timestamp"]).rename(None)
+    return df
+
+
+def has_time_index(df):
+    """
+    Returns True if the frame is indexed by a sorted DatetimeIndex.
+    """
+    return isinstance(df.index, pd.DatetimeIndex) and df.index.is_monotonic_increasing
+
+
+def time_range_positions(df, start_time, end_time):
+    """
+    Returns the (start, stop) row positions of the rows within [start_time, end_time].
+    The frame must have a sorted DatetimeIndex (see set_time_index).
+    """
+    start = df.index.searchsorted(pd.Timestamp(start_time), side="left")
+    stop = df.index.searchsorted(pd.Timestamp(end_time), side="right")
+    return start, max(start, stop)
+
+
+def time_range_slice(df, start_time, end_time):
+    """
+    Returns the rows within [start_time, end_time] as a positional slice (no row copy).
+    """
+    start, stop = time_range_positions(df, start_time, end_time)
+    return df.iloc[start:stop]
+
+
+def time_buckets(df, bucket):
+    """
+    Splits a time-indexed frame into fixed-width time buckets.
+    Returns (bucket id of every row, row position where each bucket starts plus the row count).
+    """
+    if not len(df):
+        return np.array([], dtype="int64"), np.zeros(1, dtype="int64")
+    origin = df.index[0].floor(bucket)
+    bucket_ids = np.asarray((df.index - origin) // bucket, dtype="int64")
+    bucket_rows = np.searchsorted(bucket_ids, np.arange(bucket_ids[-1] + 2), side="left")
+    return bucket_ids, bucket_rows
@@ -1,43 +1,85 @@
 import pandas as pd
-from datetime import datetime
-import seaborn as sns
-import matplotlib.pyplot as plt
 import streamlit as st
-from windrose import WindroseAxes
 import numpy as np
-from scipy.stats import zscore
+from .lazy_imports import lazy_import
+from .cleaning_pipeline import CleaningPipeline, DropEmptyColumns, FillMean, Outliers, ReplaceInfinite
+from .downsample import lttb_indices
+from .instrumentation import instrument
+from .profiles import ProfileCube
+from .density import FAST_DENSITY_ROWS, binned_kde, sample_rows
+from .raster import RASTER_ROWS, bubble_image, rasterize_points
+from .time_index import has_time_index, set_time_index, time_range_slice
+from .wind_rose import default_speed_bins, draw_wind_rose, wind_rose_table
 
+# Plotting backends are imported when the first figure is drawn
+colors = lazy_import("matplotlib.colors")
+plt = lazy_import("matplotlib.pyplot")
+sns = lazy_import("seaborn")
 
+
+def requires_columns(columns):
+    """
+    Declares the columns a plot reads, as a list or as a function of the plot's
+    arguments. Callers get them from plot.required_columns(*args, **kwargs) and
+    only load those.
+    """
+
+    def decorate(plot):
+        plot.required_columns = columns if callable(columns) else (lambda *args, **kwargs: list(columns))
+        return plot
+
+    return decorate
+
+
+@instrument
 def convert_timestamp_to_numeric(df):
     """
     Converts 'Timestamp' column to numeric (days since start date).
+    Returns a new frame; the input is left unchanged.
     """
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"])
-    df["Timestamp_numeric"] = (
-        df["Timestamp"] - df["Timestamp"].min()
-    ).dt.total_seconds() / (
-        24 * 60 * 60
-    )  # Convert to days
-    return df
+    timestamps = pd.to_datetime(df["Timestamp"])
+    return df.assign(
+        Timestamp=timestamps,
+        Timestamp_numeric=(timestamps - timestamps.min()).dt.total_seconds() / (24 * 60 * 60),  # Convert to days
+    )
 
 
 # Filter data based on timestamp range
+@instrument
 def filter_data_by_time_range(df, start_time, end_time):
     """
     Filters the dataset to include only the rows where the 'Timestamp' is within the selected range.
+    Frames with a sorted DatetimeIndex are sliced in O(log n); others fall back to a mask.
     """
+    if has_time_index(df):
+        return time_range_slice(df, start_time, end_time)
     filtered_df = df[(df["Timestamp"] >= start_time) & (df["Timestamp"] <= end_time)]
     return filtered_df
 
 
-def create_time_series(df):
+@requires_columns(["Timestamp", "GHI", "DNI", "DHI"])
+@instrument
+def create_time_series(df, max_points=None, downsample=True):
     """
     Create a Time Series Plot.
+    Each series is downsampled with LTTB to max_points (default: the figure width
+    in pixels); pass downsample=False to plot every sample.
     """
     fig, ax = plt.subplots(figsize=(12, 6))
-    ax.plot(df["Timestamp"], df["GHI"], label="Global Horizontal Irradiance (GHI)")
-    ax.plot(df["Timestamp"], df["DNI"], label="DNI")
-    ax.plot(df["Timestamp"], df["DHI"], label="DHI")
+    if max_points is None:
+        max_points = int(fig.get_figwidth() * fig.dpi)
+    timestamps = pd.DatetimeIndex(df["Timestamp"])
+    for column, label in [
+        ("GHI", "Global Horizontal Irradiance (GHI)"),
+        ("DNI", "DNI"),
+        ("DHI", "DHI"),
+    ]:
+        values = df[column].to_numpy()
+        if downsample and len(values) > max_points:
+            keep = lttb_indices(timestamps.asi8, values, max_points)
+            ax.plot(timestamps[keep], values[keep], label=label)
+        else:
+            ax.plot(timestamps, values, label=label)
     ax.set_title("Solar Radiation Over Time")
     ax.set_xlabel("Timestamp")
     ax.set_ylabel("Radiation (W/m²)")
@@ -45,21 +87,49 @@ def create_time_series(df):
     return fig
 
 
-def create_wind_rose(df, wind_dir_col, wind_speed_col):
+@requires_columns(lambda column="GHI", *args, **kwargs: ["Timestamp", column])
+@instrument
+def create_diurnal_profile(df, column="GHI", month=None, profile_cube=None):
+    """
+    Create a Diurnal Profile plot: the average day of column for one calendar month
+    (1-12, default: all months), mean by time of day within the min-max band.
+    With profile_cube (a ProfileCube of the full dataset), the whole months of df's
+    range are read from the cube and only the partial months at both ends are scanned.
+    """
+    cube = ProfileCube.from_frame(df, [column]) if profile_cube is None else profile_cube.for_range(df)
+    profile = cube.profile(column, month)
+    hours = profile.index.to_numpy() / 60
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.fill_between(hours, profile["min"], profile["max"], alpha=0.2, label="Min-Max")
+    ax.plot(hours, profile["mean"], label="Mean")
+    period = "All Months" if month is None else pd.Timestamp(2000, month, 1).month_name()
+    ax.set_title(f"Average Day of {column} ({period})")
+    ax.set_xlabel("Hour of Day")
+    ax.set_ylabel(column)
+    ax.set_xlim(0, 24)
+    ax.legend()
+    return fig
+
+
+@requires_columns(lambda wind_dir_col, wind_speed_col, *args, **kwargs: [wind_dir_col, wind_speed_col])
+@instrument
+def create_wind_rose(df, wind_dir_col, wind_speed_col, wind_index=None):
     """
     Create a Wind Rose plot.
+    The direction x speed table comes from wind_index (a WindRoseIndex) for the
+    frame's time range when given, otherwise it is binned in one pass over the frame.
     """
     if wind_dir_col in df.columns and wind_speed_col in df.columns:
+        if wind_index is not None and has_time_index(df) and len(df):
+            table = wind_index.table(df.index[0], df.index[-1])
+            speed_bins = wind_index.speed_bins
+        else:
+            speed_bins = default_speed_bins(df[wind_speed_col])
+            table = wind_rose_table(df[wind_dir_col], df[wind_speed_col], speed_bins)
         fig = plt.figure(figsize=(6, 6))
-        ax = WindroseAxes.from_ax(fig=fig)
-        ax.bar(
-            df[wind_dir_col],
-            df[wind_speed_col],
-            normed=True,
-            opening=0.8,
-            edgecolor="white",
-        )
-        ax.set_legend()
+        ax = fig.add_subplot(projection="polar")
+        draw_wind_rose(ax, table, speed_bins, normed=True, opening=0.8, edgecolor="white")
+        ax.legend(loc="lower left", bbox_to_anchor=(-0.1, -0.1), fontsize="small")
         ax.set_title("Wind Rose")
         return fig
     else:
@@ -68,18 +138,30 @@ def create_wind_rose(df, wind_dir_col, wind_speed_col):
         )
 
 
-def create_cleaning_impact_plot(df, cleaning_col, mod_col):
+@requires_columns(lambda cleaning_col, mod_col, *args, **kwargs: [cleaning_col, mod_col])
+@instrument
+def create_cleaning_impact_plot(df, cleaning_col, mod_col, sketch_index=None):
     """
     Create a boxplot to visualize the impact of cleaning. Boxplot figure.
+    With a QuantileSketchIndex, the boxes are drawn from the sketches of the frame's
+    time range instead of sorting every value (whiskers approximate, no fliers).
     """
     if cleaning_col in df.columns and mod_col in df.columns:
-        df_cleaning = df[df[cleaning_col] == 1]
-        df_no_cleaning = df[df[cleaning_col] == 0]
         fig, ax = plt.subplots()
-        ax.boxplot(
-            [df_cleaning[mod_col], df_no_cleaning[mod_col]],
-            labels=["Cleaned", "Not Cleaned"],
-        )
+        if sketch_index is not None and has_time_index(df) and len(df):
+            start_time, end_time = df.index[0], df.index[-1]
+            ax.bxp(
+                [
+                    sketch_index.box_stats(mod_col, start_time, end_time, group=1, label="Cleaned"),
+                    sketch_index.box_stats(mod_col, start_time, end_time, group=0, label="Not Cleaned"),
+                ],
+                showfliers=False,
+            )
+        else:
+            df_cleaning = df[df[cleaning_col] == 1]
+            df_no_cleaning = df[df[cleaning_col] == 0]
+            ax.boxplot([df_cleaning[mod_col], df_no_cleaning[mod_col]])
+            ax.set_xticks([1, 2], ["Cleaned", "Not Cleaned"])
         ax.set_title("Impact of Cleaning")
         ax.set_ylabel(mod_col)
         return fig
@@ -90,18 +172,26 @@ def create_cleaning_impact_plot(df, cleaning_col, mod_col):
 
 
 # Generate correlation matrix
-def generate_correlation_matrix(df, columns):
+@requires_columns(lambda columns, *args, **kwargs: list(columns))
+@instrument
+def generate_correlation_matrix(df, columns, correlation_index=None):
     """
     Generates and returns the correlation matrix for the numeric columns.
+    With a CorrelationIndex, the matrix for the frame's time range is served from
+    its precomputed partial sums instead of recomputing it from the rows.
     """
     fig, ax = plt.subplots(figsize=(10, 8))
-    numeric_data = df.select_dtypes(include=[np.number])
+    if correlation_index is not None and has_time_index(df) and len(df):
+        corr = correlation_index.corr(columns, df.index[0], df.index[-1])
+    else:
+        numeric_data = df[columns].select_dtypes(include=[np.number])
+        corr = None if numeric_data.empty else numeric_data.corr()
 
-    if numeric_data.empty:
+    if corr is None:
         st.write("No numeric data in the dataset to compute correlations.")
     else:
         sns.heatmap(
-            numeric_data[columns].corr(),
+            corr,
             annot=True,
             cmap="coolwarm",
             fmt=".2f",
@@ -113,21 +203,74 @@ def generate_correlation_matrix(df, columns):
     return fig
 
 
-def generate_pair_plot(df, columns):
+@requires_columns(lambda columns, *args, **kwargs: list(columns))
+@instrument
+def generate_pair_plot(df, columns, fast=None, fast_threshold=FAST_DENSITY_ROWS, sample_size=None):
     """
     Generates a pair plot (scatter plot matrix) for the specified columns.
+    - fast: use binned KDEs on the diagonal and 2-D histograms off the diagonal
+      instead of seaborn's per-point rendering (default: above fast_threshold rows).
+    - sample_size: optionally plot a random sample of at most this many rows.
     """
-    pair_plot = sns.pairplot(df[columns], diag_kind="kde", corner=True)
-    pair_plot.fig.suptitle("Pair Plot (Scatter Plot Matrix)", y=1.02, fontsize=16)
-    return pair_plot.fig
+    data = sample_rows(df[columns], sample_size)
+    if fast is None:
+        fast = len(data) > fast_threshold
+    if not fast:
+        pair_plot = sns.pairplot(data, diag_kind="kde", corner=True)
+        pair_plot.fig.suptitle("Pair Plot (Scatter Plot Matrix)", y=1.02, fontsize=16)
+        return pair_plot.fig
+
+    n = len(columns)
+    fig, axes = plt.subplots(n, n, figsize=(2.5 * n, 2.5 * n), squeeze=False)
+    values = {column: data[column].to_numpy(dtype="float64") for column in columns}
+    for row, y in enumerate(columns):
+        for col, x in enumerate(columns):
+            ax = axes[row, col]
+            if col > row:
+                ax.remove()
+                continue
+            if row == col:
+                grid, density = binned_kde(values[x])
+                ax.plot(grid, density)
+                ax.set_yticks([])
+            else:
+                valid = np.isfinite(values[x]) & np.isfinite(values[y])
+                counts, x_edges, y_edges = np.histogram2d(values[x][valid], values[y][valid], bins=60)
+                ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap="viridis")
+            if row == n - 1:
+                ax.set_xlabel(x)
+            if col == 0:
+                ax.set_ylabel(y)
+    fig.suptitle("Pair Plot (Scatter Plot Matrix)", y=1.02, fontsize=16)
+    fig.tight_layout()
+    return fig
 
 
-def scatter_plot(df, x, y, title="Scatter Plot"):
+@requires_columns(lambda x, y, *args, **kwargs: [x, y])
+@instrument
+def scatter_plot(df, x, y, title="Scatter Plot", raster=None, raster_threshold=RASTER_ROWS):
     """
     Creates a scatter plot for two variables.
+    Above raster_threshold rows (or with raster=True) the points are aggregated into
+    a pixel grid and drawn as a point-density image.
     """
     fig, ax = plt.subplots(figsize=(10, 8))
-    sns.scatterplot(data=df, x=x, y=y, ax=ax)
+    if raster is None:
+        raster = len(df) > raster_threshold
+    if raster:
+        counts, _, extent = rasterize_points(df[x], df[y])
+        image = ax.imshow(
+            np.ma.masked_equal(counts, 0),
+            origin="lower",
+            extent=extent,
+            aspect="auto",
+            cmap="viridis",
+            norm=colors.LogNorm(),
+            interpolation="nearest",
+        )
+        fig.colorbar(image, ax=ax).set_label("Points per pixel")
+    else:
+        sns.scatterplot(data=df, x=x, y=y, ax=ax)
     ax.set_title(title)
     ax.set_xlabel(x)
     ax.set_ylabel(y)
@@ -136,12 +279,27 @@ def scatter_plot(df, x, y, title="Scatter Plot"):
     return fig
 
 
-def plot_histogram(df, column, bins=20):
+@requires_columns(lambda column, *args, **kwargs: [column])
+@instrument
+def plot_histogram(df, column, bins=20, fast=None, fast_threshold=FAST_DENSITY_ROWS):
     """
     Creates a histogram for a single variable.
+    In fast mode (default above fast_threshold rows) the bars come from np.histogram
+    and the KDE from a binned FFT convolution instead of seaborn.
     """
     fig, ax = plt.subplots(figsize=(8, 6))  # Set the figure size here
-    sns.histplot(data=df, x=column, bins=bins, kde=True, ax=ax)
+    if fast is None:
+        fast = len(df) > fast_threshold
+    if fast:
+        values = df[column].to_numpy(dtype="float64")
+        values = values[np.isfinite(values)]
+        counts, edges = np.histogram(values, bins=bins)
+        ax.stairs(counts, edges, fill=True, alpha=0.5, edgecolor="black")
+        grid, density = binned_kde(values)
+        # Scale the density to the bar counts, like seaborn does
+        ax.plot(grid, density * len(values) * (edges[1] - edges[0]))
+    else:
+        sns.histplot(data=df, x=column, bins=bins, kde=True, ax=ax)
     # Use ax parameter for seaborn
     ax.set_title(f"Histogram of {column}")
     ax.set_xlabel(column)
@@ -151,24 +309,40 @@ def plot_histogram(df, column, bins=20):
     return fig
 
 
-def bubble_chart(df, x, y, size, color=None, title="Bubble Chart"):
+@requires_columns(lambda x, y, size, color=None, *args, **kwargs: [x, y, size] + ([color] if color else []))
+@instrument
+def bubble_chart(df, x, y, size, color=None, title="Bubble Chart", raster=None, raster_threshold=RASTER_ROWS):
     """
     Creates a bubble chart for exploring relationships between variables.
+    Above raster_threshold rows (or with raster=True) the points are aggregated into
+    a pixel grid: each pixel is colored by the mean of the color column and its
+    opacity follows the mean of the size column.
     """
     fig, ax = plt.subplots(figsize=(10, 8))
-    scatter = ax.scatter(
-        x=df[x],
-        y=df[y],
-        s=df[size] * 100,
-        c=df[color] if color else "blue",
-        alpha=0.6,
-        cmap="viridis" if color else None,
-        edgecolor="w",
-    )
+    if raster is None:
+        raster = len(df) > raster_threshold
+    if raster:
+        values = [df[size]] + ([df[color]] if color else [])
+        counts, means, extent = rasterize_points(df[x], df[y], values)
+        rgba, norm = bubble_image(counts, means[0], means[1] if color else None)
+        ax.imshow(rgba, origin="lower", extent=extent, aspect="auto", interpolation="nearest")
+        if color:
+            cbar = fig.colorbar(plt.cm.ScalarMappable(norm=norm, cmap="viridis"), ax=ax)
+            cbar.set_label(color)
+    else:
+        scatter = ax.scatter(
+            x=df[x],
+            y=df[y],
+            s=df[size] * 100,
+            c=df[color] if color else "blue",
+            alpha=0.6,
+            cmap="viridis" if color else None,
+            edgecolor="w",
+        )
 
-    if color:
-        cbar = fig.colorbar(scatter, ax=ax)
-        cbar.set_label(color)
+        if color:
+            cbar = fig.colorbar(scatter, ax=ax)
+            cbar.set_label(color)
 
     ax.set_title(title, fontsize=14)
     ax.set_xlabel(x, fontsize=12)
@@ -181,28 +355,32 @@ def bubble_chart(df, x, y, size, color=None, title="Bubble Chart"):
     return fig
 
 
-def clean_missing_values(df):
+@instrument
+def clean_missing_values(df, inplace=False):
     """
     Handles missing values in the dataset.
     - Drops entirely null columns (like 'Comments').
+    - Treats +/-inf as missing and fills numeric columns with their mean.
     """
-    # Ensure df is a copy to avoid SettingWithCopyWarning
-    df = df.copy()
-
-    # Drop columns entirely null
-    df = df.dropna(axis=1, how="all")
-
-    # Fill numeric columns with mean
-    numeric_cols = df.select_dtypes(include=["float64", "int64"]).columns
-    for col in numeric_cols:
-        df.loc[:, col] = df[col].fillna(df[col].mean())
-    return df
+    return CleaningPipeline([DropEmptyColumns(), ReplaceInfinite(), FillMean()]).run(df, inplace=inplace)
 
 
+@instrument
 def remove_outliers(df, columns, z_threshold=3):
     """
     Removes rows where the specified columns have outliers based on Z-scores.
+    Missing values are ignored rather than counted as outliers.
+    """
+    return CleaningPipeline([Outliers(columns, z_threshold, action="drop")]).run(df)
+
+
+def dashboard_cleaning(outlier_columns, z_threshold=3):
+    """
+    clean_missing_values followed by remove_outliers, fused into one pipeline.
     """
-    z_scores = zscore(df[columns])
-    mask = (abs(z_scores) < z_threshold).all(axis=1)
-    return df[mask]
+    return CleaningPipeline([
+        DropEmptyColumns(),
+        ReplaceInfinite(),
+        FillMean(),
+        Outliers(outlier_columns, z_threshold, action="drop"),
+    ])
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+from .lazy_imports import lazy_import
+from .time_index import has_time_index, time_buckets, time_range_positions
+
+plt = lazy_import("matplotlib.pyplot")
+
+NSECTOR = 16
+N_SPEED_BINS = 6
+BUCKET = pd.Timedelta(days=1)
+
+
+def default_speed_bins(speed, n_bins=N_SPEED_BINS):
+    """
+    Speed bin lower edges as windrose picks them: evenly spaced from min to max.
+    """
+    speed = np.asarray(speed, dtype="float64")
+    speed = speed[np.isfinite(speed)]
+    if not len(speed):
+        return np.linspace(0.0, 1.0, n_bins)
+    return np.linspace(speed.min(), speed.max(), n_bins)
+
+
+def wind_rose_table(direction, speed, speed_bins, nsector=NSECTOR):
+    """
+    Counts samples per (speed bin, direction sector) with a single np.bincount.
+    Sectors are centred on north like windrose's; the last speed bin is open-ended
+    and speeds below the first edge are left out.
+    """
+    direction = np.asarray(direction, dtype="float64")
+    speed = np.asarray(speed, dtype="float64")
+    n_speed = len(speed_bins)
+    sector_width = 360.0 / nsector
+    valid = np.isfinite(direction) & np.isfinite(speed) & (speed >= speed_bins[0])
+    sectors = (np.mod(direction[valid] + sector_width / 2, 360.0) // sector_width).astype("int64") % nsector
+    speeds = np.searchsorted(speed_bins, speed[valid], side="right") - 1
+    counts = np.bincount(speeds * nsector + sectors, minlength=n_speed * nsector)
+    return counts.reshape(n_speed, nsector)
+
+
+class WindRoseIndex:
+    """
+    Per-day direction x speed tables with prefix sums, so the wind rose of any time
+    range is a sum of tables plus a scan of the two partial edge days.
+    """
+
+    def __init__(self, df, dir_col="WD", speed_col="WS", bucket=BUCKET, nsector=NSECTOR, speed_bins=None):
+        if not has_time_index(df):
+            raise ValueError("WindRoseIndex requires a frame with a sorted DatetimeIndex.")
+        self.df = df
+        self.dir_col = dir_col
+        self.speed_col = speed_col
+        self.nsector = nsector
+        self.speed_bins = default_speed_bins(df[speed_col]) if speed_bins is None else np.asarray(speed_bins)
+
+        _, self.bucket_rows = time_buckets(df, bucket)
+        n_buckets = len(self.bucket_rows) - 1
+        self.prefix = np.zeros((n_buckets + 1, len(self.speed_bins), nsector), dtype="int64")
+        for b in range(n_buckets):
+            self.prefix[b + 1] = self.prefix[b] + self._scan(self.bucket_rows[b], self.bucket_rows[b + 1])
+
+    def table(self, start_time, end_time):
+        """
+        Returns the (speed bin x sector) counts for [start_time, end_time].
+        """
+        start, stop = time_range_positions(self.df, start_time, end_time)
+        first_full = np.searchsorted(self.bucket_rows, start, side="left")
+        last_full = np.searchsorted(self.bucket_rows, stop, side="right") - 1
+        if first_full >= last_full:
+            return self._scan(start, stop)
+        return (
+            self.prefix[last_full]
+            - self.prefix[first_full]
+            + self._scan(start, self.bucket_rows[first_full])
+            + self._scan(self.bucket_rows[last_full], stop)
+        )
+
+    def _scan(self, start, stop):
+        rows = self.df.iloc[start:stop]
+        return wind_rose_table(rows[self.dir_col], rows[self.speed_col], self.speed_bins, self.nsector)
+
+
+def draw_wind_rose(ax, table, speed_bins, normed=True, opening=0.8, edgecolor="white", cmap=None):
+    """
+    Draws a pre-binned (speed bin x sector) table as stacked bars on a matplotlib
+    polar axes, laid out like a windrose bar plot: north up, clockwise, one
+    labelled bar series per speed bin (for ax.legend()).
+    """
+    table = np.asarray(table, dtype="float64")
+    total = table.sum()
+    if normed and total:
+        table = table * 100 / total
+    n_speed, nsector = table.shape
+    cmap = plt.get_cmap() if cmap is None else cmap
+    colors = [cmap(i) for i in np.linspace(0.0, 1.0, n_speed)]
+    angles = np.arange(nsector) * 2 * np.pi / nsector
+    width = 2 * np.pi / nsector * opening
+    origins = np.vstack([np.zeros(nsector), np.cumsum(table, axis=0)[:-1]])
+    edges = list(speed_bins) + [np.inf]
+
+    ax.set_theta_zero_location("N")
+    ax.set_theta_direction(-1)
+    for i in range(n_speed):
+        ax.bar(
+            angles,
+            table[i],
+            width=width,
+            bottom=origins[i],
+            color=colors[i],
+            edgecolor=edgecolor,
+            label=f"[{edges[i]:.1f} : {edges[i + 1]:.1f})",
+        )
+    ax.set_xticks(np.arange(8) * np.pi / 4, ["N", "NE", "E", "SE", "S", "SW", "W", "NW"])
+    ax.set_rmax(max(table.sum(axis=0).max(), 1e-9))
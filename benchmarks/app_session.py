@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+import time
+
+# Run in a fresh process by benchmarks/startup.py: it must not import anything the
+# dashboard imports itself, or the first run would look faster than it is
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "main.py")
+
+
+def rss_mb():
+    # The dashboard's own instrumentation module, imported by its first run
+    return (sys.modules["app.instrumentation"].rss_bytes() or 0) / 2**20
+
+
+def app_times(root):
+    """
+    Runs the dashboard in this process on the datasets under root and returns
+    {step: (seconds, resident MB after it)} for the first run of a fresh process
+    (imports included), a rerun, and switching to the Visualizations tab.
+    """
+    os.chdir(root)
+    times = {}
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(MAIN_PATH, default_timeout=300)
+    app.run()
+    times["first_run"] = (time.perf_counter() - start, rss_mb())
+
+    # Let background prefetches finish so they don't overlap the timed reruns
+    prefetcher = sys.modules["app.prefetch"].prefetcher
+    while prefetcher.pending():
+        time.sleep(0.05)
+
+    start = time.perf_counter()
+    app.run()
+    times["rerun"] = (time.perf_counter() - start, rss_mb())
+
+    start = time.perf_counter()
+    app.session_state["tab"] = "Visualizations"
+    app.run()
+    times["visualizations_tab"] = (time.perf_counter() - start, rss_mb())
+    if app.exception:
+        raise RuntimeError([e.value for e in app.exception])
+    return times
+
+
+if __name__ == "__main__":
+    print(json.dumps(app_times(sys.argv[1])))
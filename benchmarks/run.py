@@ -0,0 +1,196 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+
+# Make the app and scripts packages importable when this file is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from app import utils
+from app.schema import read_station_csv
+from scripts import visualization
+from benchmarks.synthetic import write_sites
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# A benchmark regresses when it is this much slower (or uses this much more memory)
+# than the baseline, and by more than the absolute slack (timer noise on tiny cases)
+TIME_THRESHOLD = 1.25
+MEMORY_THRESHOLD = 1.25
+TIME_SLACK = 0.05
+MEMORY_SLACK_MB = 5.0
+
+solar_temp_columns = ["GHI", "DNI", "DHI", "TModA", "TModB"]
+wind_columns = ["WS", "WSgust", "WD", "GHI", "DNI"]
+
+
+def measure(function, repeat=3):
+    """
+    Returns the best wall time in seconds over repeat runs and the peak memory (MB)
+    traced by tracemalloc (Python and numpy allocations) over one extra run, kept
+    out of the timings because tracing slows allocations down.
+    """
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    plt.close("all")
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        plt.close("all")
+    return min(times), peak
+
+
+def benchmarks(raw_path, cleaned_path):
+    """
+    Returns {name: function} for every benchmarked step on one site.
+    """
+    raw = read_station_csv(raw_path)
+    cleaned = utils.clean_missing_values(raw)
+    prepared = utils.set_time_index(utils.convert_timestamp_to_numeric(cleaned))
+    start_time = prepared.index[0] + (prepared.index[-1] - prepared.index[0]) / 4
+    end_time = prepared.index[0] + (prepared.index[-1] - prepared.index[0]) / 2
+    plain = prepared.reset_index(drop=True)
+
+    return {
+        "load/read_csv_inferred": lambda: pd.read_csv(raw_path),
+        "load/read_station_csv": lambda: read_station_csv(raw_path),
+        "load/cleaned_csv": lambda: read_station_csv(cleaned_path),
+        "clean/clean_missing_values": lambda: utils.clean_missing_values(raw),
+        "clean/remove_outliers": lambda: utils.remove_outliers(cleaned, ["GHI", "DNI", "DHI"]),
+        "filter/time_index": lambda: utils.filter_data_by_time_range(prepared, start_time, end_time),
+        "filter/mask": lambda: utils.filter_data_by_time_range(plain, start_time, end_time),
+        "app/create_time_series": lambda: utils.create_time_series(prepared),
+        "app/create_diurnal_profile": lambda: utils.create_diurnal_profile(prepared, column="GHI", month=9),
+        "app/create_wind_rose": lambda: utils.create_wind_rose(prepared, "WD", "WS"),
+        "app/create_cleaning_impact_plot": lambda: utils.create_cleaning_impact_plot(prepared, "Cleaning", "ModA"),
+        "app/generate_correlation_matrix": lambda: utils.generate_correlation_matrix(prepared, solar_temp_columns),
+        "app/generate_pair_plot": lambda: utils.generate_pair_plot(prepared, wind_columns),
+        "app/scatter_plot": lambda: utils.scatter_plot(prepared, "RH", "GHI"),
+        "app/plot_histogram": lambda: utils.plot_histogram(prepared, "GHI"),
+        "app/bubble_chart": lambda: utils.bubble_chart(prepared, "GHI", "Tamb", "RH", "WS"),
+        "scripts/plot_time_series": lambda: visualization.plot_time_series(plain),
+        "scripts/plot_correlation_matrix": lambda: visualization.plot_correlation_matrix(plain, solar_temp_columns),
+        "scripts/plot_cleaning_impact": lambda: visualization.plot_cleaning_impact(plain),
+        "scripts/plot_wind_rose": lambda: visualization.plot_wind_rose(plain),
+        "scripts/generate_pair_plot": lambda: visualization.generate_pair_plot(plain, wind_columns),
+        "scripts/scatter_plot": lambda: visualization.scatter_plot(plain, "RH", "GHI"),
+        "scripts/plot_histogram": lambda: visualization.plot_histogram(plain, "GHI"),
+        "scripts/bubble_chart": lambda: visualization.bubble_chart(plain, "GHI", "Tamb", "RH", "WS"),
+    }
+
+
+def run(n_sites=1, years=1, seed=0, repeat=3, only=None):
+    """
+    Generates the synthetic sites and benchmarks every step on each of them.
+    Returns the results document (metadata + {site/benchmark: seconds, peak_mb}).
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as root:
+        paths = write_sites(root, n_sites, years, seed)
+        for site, (raw_path, cleaned_path) in paths.items():
+            for name, function in benchmarks(raw_path, cleaned_path).items():
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                seconds, peak_mb = measure(function, repeat)
+                results[f"{site}/{name}"] = {"seconds": round(seconds, 4), "peak_mb": round(peak_mb, 2)}
+                print(f"{site}/{name:40s} {seconds:8.3f} s {peak_mb:9.1f} MB")
+    return {
+        "meta": {
+            "sites": n_sites,
+            "years": years,
+            "seed": seed,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD):
+    """
+    Returns a list of regressions: (benchmark, metric, baseline value, new value).
+    Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, new in results["results"].items():
+        old = baseline["results"].get(name)
+        if old is None:
+            continue
+        if new["seconds"] > old["seconds"] * time_threshold and new["seconds"] - old["seconds"] > TIME_SLACK:
+            regressions.append((name, "seconds", old["seconds"], new["seconds"]))
+        if new["peak_mb"] > old["peak_mb"] * memory_threshold and new["peak_mb"] - old["peak_mb"] > MEMORY_SLACK_MB:
+            regressions.append((name, "peak_mb", old["peak_mb"], new["peak_mb"]))
+    return regressions
+
+
+def report(
+    results, output, baseline_path, save_baseline=False, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD
+):
+    """
+    Writes the results to output, then either saves them as the baseline or compares
+    them against it (exiting with status 1 on regressions).
+    """
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+    if save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {baseline_path}")
+        return
+    if not os.path.exists(baseline_path):
+        print("No baseline to compare against (run with --save-baseline).")
+        return
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if any(baseline["meta"].get(key) != results["meta"][key] for key in ("sites", "years", "seed")):
+        print("Warning: the baseline was recorded with a different data size.")
+    regressions = compare(results, baseline, time_threshold, memory_threshold)
+    for name, metric, old, new in regressions:
+        print(f"REGRESSION {name}: {metric} {old} -> {new}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading, cleaning and plotting on synthetic station data.")
+    parser.add_argument("--sites", type=int, default=1, help="Number of synthetic sites.")
+    parser.add_argument("--years", type=float, default=1, help="Years of 1-minute data per site.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per benchmark (the best time is kept).")
+    parser.add_argument("--only", nargs="*", help="Only run benchmarks whose name contains one of these.")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the results.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    args = parser.parse_args()
+
+    # plt.show() on the Agg backend warns that it can't open a window
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+    results = run(args.sites, args.years, args.seed, args.repeat, args.only)
+    report(results, args.output, args.baseline, args.save_baseline, args.time_threshold, args.memory_threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+# Make the app and scripts packages importable when this file is run as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from benchmarks.run import MEMORY_THRESHOLD, TIME_THRESHOLD, report
+from benchmarks.synthetic import write_sites
+
+APP_SESSION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app_session.py")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup-baseline.json")
+
+# Modules a new server process imports before it can draw the first page
+IMPORTED_MODULES = ["utils", "data_pipeline", "render_cache"]
+
+IMPORT_SNIPPET = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import app.{module}
+from app.instrumentation import rss_bytes
+print(time.perf_counter() - start, rss_bytes() or 0)
+"""
+
+
+def import_time(module, repeat=3):
+    """
+    Returns the best time in seconds to import module in a fresh interpreter (the
+    app's own imports included) and the resident memory (MB) after the import.
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SNIPPET.format(root=ROOT, module=module)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        runs.append((float(output[0]), int(output[1]) / 2**20))
+    return min(runs)
+
+
+def measure_app(root, repeat=3):
+    """
+    Runs benchmarks/app_session.py in repeat fresh processes and returns the best
+    (seconds, resident MB) of each step.
+    """
+    best = {}
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, APP_SESSION, root],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip().splitlines()[-1]
+        for step, (seconds, peak_mb) in json.loads(output).items():
+            best[step] = min(best.get(step, (seconds, peak_mb)), (seconds, peak_mb))
+    return best
+
+
+def run(n_sites=3, years=1, seed=0, repeat=3):
+    """
+    Measures cold imports and the dashboard's first run, rerun and tab switch on
+    synthetic sites. Returns the results document (same layout as benchmarks/run.py).
+    """
+    results = {}
+
+    def add(name, seconds, peak_mb):
+        results[name] = {"seconds": round(seconds, 4), "peak_mb": round(peak_mb, 2)}
+        print(f"{name:40s} {seconds:8.3f} s {peak_mb:9.1f} MB")
+
+    for module in IMPORTED_MODULES:
+        add(f"startup/import_{module}", *import_time(module, repeat))
+    with tempfile.TemporaryDirectory() as root:
+        write_sites(root, n_sites, years, seed)
+        # One untimed run builds the Parquet caches, indexes and rendered figures on disk,
+        # which a new process of a running deployment finds already there
+        measure_app(root, repeat=1)
+        for step, (seconds, peak_mb) in measure_app(root, repeat).items():
+            add(f"app/{step}", seconds, peak_mb)
+    return {
+        "meta": {
+            "sites": n_sites,
+            "years": years,
+            "seed": seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the dashboard's cold start and rerun times.")
+    parser.add_argument("--sites", type=int, default=3, help="Number of synthetic sites.")
+    parser.add_argument("--years", type=float, default=1, help="Years of 1-minute data per site.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Fresh processes per measurement (the best is kept).")
+    parser.add_argument("--output", default="startup-results.json", help="Where to write the results.")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against.")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results as the new baseline.")
+    parser.add_argument("--time-threshold", type=float, default=TIME_THRESHOLD)
+    parser.add_argument("--memory-threshold", type=float, default=MEMORY_THRESHOLD)
+    args = parser.parse_args()
+
+    results = run(args.sites, args.years, args.seed, args.repeat)
+    report(results, args.output, args.baseline, args.save_baseline, args.time_threshold, args.memory_threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import numpy as np
+import pandas as pd
+from app.schema import to_station_csv
+from scripts.cleaning import clean_dataset
+
+SITES = ["sierraleone", "benin", "togo"]
+START = "2021-08-09 00:01"
+MINUTES_PER_YEAR = 365 * 24 * 60
+
+
+def generate_site(index, years=1, seed=0, start=START):
+    """
+    Returns one site's 1-minute station export, deterministic in (index, years, seed).
+    Irradiance follows the sun's diurnal/seasonal course under an autocorrelated
+    cloud cover; module temperatures and ModA/ModB track it; wind has a prevailing
+    direction; 'Cleaning' marks roughly one cleaning event a week. A few missing
+    values and spikes are injected like in the real exports.
+    """
+    rng = np.random.default_rng([seed, index])
+    n = int(years * MINUTES_PER_YEAR)
+    timestamps = pd.date_range(start, periods=n, freq="min")
+    hours = timestamps.hour.to_numpy() + timestamps.minute.to_numpy() / 60
+    day_of_year = timestamps.dayofyear.to_numpy()
+
+    season = 1 + 0.1 * np.cos(2 * np.pi * (day_of_year - 80) / 365)
+    sun = np.clip(np.sin((hours - 6) / 12 * np.pi), 0, None) * season
+    # Cloud cover: an AR(1) process per hour, interpolated to minutes
+    n_hours = n // 60 + 2
+    noise = rng.normal(0, 0.25, n_hours)
+    cloud_hours = np.empty(n_hours)
+    cloud_hours[0] = 0.0
+    for i in range(1, n_hours):
+        cloud_hours[i] = 0.9 * cloud_hours[i - 1] + noise[i]
+    clouds = np.clip(0.5 + np.interp(np.arange(n) / 60, np.arange(n_hours), cloud_hours), 0, 1)
+
+    dni = 900 * sun * (1 - clouds) + rng.normal(0, 5, n)
+    dhi = 120 * sun * (0.5 + clouds) + rng.normal(0, 3, n)
+    ghi = dni * sun + dhi + rng.normal(0, 5, n)
+    tamb = 22 + 8 * sun + 3 * np.cos(2 * np.pi * day_of_year / 365) + rng.normal(0, 0.5, n)
+    ws = rng.gamma(2.0, 1.2, n)
+    wd = np.mod(rng.normal(220, 60, n), 360)
+
+    df = pd.DataFrame({
+        "Timestamp": timestamps.strftime("%Y-%m-%d %H:%M"),
+        "GHI": ghi,
+        "DNI": dni,
+        "DHI": dhi,
+        "ModA": 0.95 * ghi + rng.normal(0, 4, n),
+        "ModB": 0.93 * ghi + rng.normal(0, 4, n),
+        "Tamb": tamb,
+        "RH": np.clip(80 - 1.5 * (tamb - 22) + rng.normal(0, 8, n), 5, 100),
+        "WS": ws,
+        "WSgust": ws * rng.uniform(1.1, 1.8, n),
+        "WSstdev": rng.uniform(0.1, 1.0, n),
+        "WD": wd,
+        "WDstdev": rng.uniform(2, 25, n),
+        "BP": 990 + rng.normal(0, 2, n),
+        "Cleaning": (rng.uniform(size=n) < 1 / (7 * 24 * 60)).astype("int64"),
+        "Precipitation": np.where(rng.uniform(size=n) < 0.002, rng.exponential(0.5, n), 0.0),
+        "TModA": tamb + 25 * sun + rng.normal(0, 1, n),
+        "TModB": tamb + 24 * sun + rng.normal(0, 1, n),
+        "Comments": np.nan,
+    })
+    # Gaps and sensor spikes
+    df.loc[rng.choice(n, n // 2000, replace=False), "GHI"] = np.nan
+    spikes = rng.choice(n, n // 20000 + 1, replace=False)
+    df.loc[spikes, "DNI"] = df.loc[spikes, "DNI"] + 3000
+    return df
+
+
+def write_sites(root, n_sites=3, years=1, seed=0):
+    """
+    Writes raw exports for n_sites sites under root/data/raw and the matching cleaned
+    CSVs under root/data/processed. Returns {site name: (raw path, cleaned path)}.
+    """
+    raw_dir = os.path.join(root, "data", "raw")
+    processed_dir = os.path.join(root, "data", "processed")
+    os.makedirs(raw_dir, exist_ok=True)
+    os.makedirs(processed_dir, exist_ok=True)
+    paths = {}
+    for index in range(n_sites):
+        name = SITES[index] if index < len(SITES) else f"site{index}"
+        raw_path = os.path.join(raw_dir, f"{name}.csv")
+        cleaned_path = os.path.join(processed_dir, f"{name}-cleaned.csv")
+        df = generate_site(index, years, seed)
+        to_station_csv(df, raw_path)
+        to_station_csv(clean_dataset(df), cleaned_path)
+        paths[name] = (raw_path, cleaned_path)
+    return paths
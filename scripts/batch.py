@@ -0,0 +1,180 @@
+import os
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import matplotlib
+
+# Workers only write figures to disk
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from . import visualization
+from .cleaning import clean_dataset
+from .streaming import open_prefix, stream_clean
+from .incremental import build_state, complete_size, ingest_site, save_state, state_of
+from app.profiles import append_profiles, build_profiles, profile_path
+from app.rollups import LEVELS, append_rollups, build_rollups, rollup_path
+from app.schema import read_station_csv, to_station_csv
+from app.instrumentation import enable, span, tracer
+
+OUTPUT_DIR = "output"
+
+# df is the cleaned frame ("full"), only the appended rows ("incremental") or None ("streamed")
+SiteResult = namedtuple("SiteResult", ["df", "mode"])
+
+solar_temp_columns = ["GHI", "DNI", "DHI", "TModA", "TModB"]
+wind_columns = ["WS", "WSgust", "WD", "GHI", "DNI"]
+
+# (figure name, visualization function, args, kwargs, columns the figure needs)
+PLOTS = [
+    ("time-series", "plot_time_series", (), {}, ["Timestamp", "GHI", "DNI", "DHI"]),
+    ("correlation-solar", "plot_correlation_matrix", (solar_temp_columns,), {}, solar_temp_columns),
+    ("correlation-wind", "plot_correlation_matrix", (wind_columns,), {}, wind_columns),
+    ("cleaning-impact", "plot_cleaning_impact", (), {}, ["Cleaning", "ModA"]),
+    ("wind-rose", "plot_wind_rose", (), {}, ["WD", "WS"]),
+    ("pair-solar", "generate_pair_plot", (solar_temp_columns,), {}, solar_temp_columns),
+    ("pair-wind", "generate_pair_plot", (wind_columns,), {}, wind_columns),
+    ("scatter-rh-ghi", "scatter_plot", (), {"x": "RH", "y": "GHI", "title": "RH vs Solar Radiation (GHI)"}, ["RH", "GHI"]),
+    ("histogram-ghi", "plot_histogram", (), {"column": "GHI"}, ["GHI"]),
+    ("histogram-ws", "plot_histogram", (), {"column": "WS"}, ["WS"]),
+    ("histogram-tmoda", "plot_histogram", (), {"column": "TModA"}, ["TModA"]),
+    (
+        "bubble",
+        "bubble_chart",
+        (),
+        {"x": "GHI", "y": "Tamb", "size": "RH", "color": "WS", "title": "GHI vs Tamb vs WS (Size: RH)"},
+        ["GHI", "Tamb", "RH", "WS"],
+    ),
+]
+
+
+def remove_summaries(name):
+    """
+    Deletes the stored rollup levels and profile cube of a site.
+    """
+    paths = [rollup_path(name, level) for level in LEVELS if level != "1min"] + [profile_path(name)]
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def clean_site(dataset, chunksize=None, incremental=False):
+    """
+    Cleans one site, saves the cleaned CSV, its rollups and its diurnal profile cube,
+    and returns a SiteResult.
+    With incremental=True only the rows appended since the last run are cleaned,
+    unless the site has no ingestion state yet (then it is rebuilt fully).
+    """
+    output_path = f"data/processed/{dataset['name']}-cleaned.csv"
+    if incremental:
+        new_rows = ingest_site(dataset, output_path)
+        if new_rows is not None:
+            if len(new_rows):
+                append_rollups(new_rows, dataset["name"])
+                append_profiles(new_rows, dataset["name"])
+            return SiteResult(new_rows, "incremental")
+
+    # Only the complete rows present now are cleaned; the state records exactly
+    # those, so a row still being written or appended later goes to the next run
+    offset = complete_size(dataset["path"])
+    if chunksize:
+        # The rollups and profile cube are rebuilt chunk by chunk alongside the CSV
+        remove_summaries(dataset["name"])
+
+        def summarize(cleaned):
+            append_rollups(cleaned, dataset["name"])
+            append_profiles(cleaned, dataset["name"])
+
+        stream_clean(dataset["path"], output_path, chunksize=chunksize, size=offset, on_chunk=summarize)
+        state = build_state(dataset["path"], offset, chunksize)
+        df, mode = None, "streamed"
+    else:
+        with open_prefix(dataset["path"], offset) as f:
+            raw = read_station_csv(f)
+        state = state_of([raw], offset)
+        df = clean_dataset(raw)
+        to_station_csv(df, output_path)
+
+        # Precompute the 10min/hourly/daily rollup pyramid and the month x time-of-day
+        # profile cube for the dashboard
+        build_rollups(df, dataset["name"])
+        build_profiles(df, dataset["name"])
+        mode = "full"
+
+    # Record the watermark and running statistics for later incremental runs
+    save_state(dataset["name"], state)
+    return SiteResult(df, mode)
+
+
+def render_plot(site, name, function, args, kwargs, df, output_dir=OUTPUT_DIR):
+    """
+    Runs one visualization function and saves the figures it opened as PNG.
+    """
+    getattr(visualization, function)(df, *args, **kwargs)
+    os.makedirs(output_dir, exist_ok=True)
+    for i, number in enumerate(plt.get_fignums()):
+        suffix = f"-{i}" if i else ""
+        plt.figure(number).savefig(os.path.join(output_dir, f"{site}-{name}{suffix}.png"), bbox_inches="tight")
+    plt.close("all")
+    return name
+
+
+def profiled(profile, name, function, *args):
+    """
+    Runs one worker job. Returns (result, spans): with profile=True the job runs
+    as its own traced run and spans holds what it recorded, to be merged into the
+    parent's tracer (worker processes don't share it).
+    """
+    if not profile:
+        return function(*args), []
+    enable()
+    # A forked worker starts with a copy of the parent's spans
+    tracer.drain()
+    tracer.begin_run(name)
+    with span(name):
+        result = function(*args)
+    return result, tracer.drain()
+
+
+def run_batch(datasets, workers=None, chunksize=None, plots=True, incremental=False, profile=False):
+    """
+    Cleans every site and renders its figures on a process pool.
+    A failing site or figure is reported and skipped without stopping the others.
+    With profile=True the workers' spans are collected into the instrumentation tracer.
+    Returns {site name: SiteResult} for the sites that succeeded.
+    """
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        site_jobs = {}
+        for dataset in datasets:
+            site = dataset["name"]
+            job = pool.submit(profiled, profile, f"clean {site}", clean_site, dataset, chunksize, incremental)
+            site_jobs[job] = site
+        plot_jobs = {}
+        for job in as_completed(site_jobs):
+            site = site_jobs[job]
+            try:
+                results[site], spans = job.result()
+                tracer.add(spans)
+            except Exception:
+                print(f"Error processing dataset {site}:\n{traceback.format_exc()}")
+                continue
+            df, mode = results[site]
+            print(f"Finished cleaning {site} ({mode})")
+            # Figures are only rendered from fully rebuilt in-memory frames
+            if mode != "full" or not plots:
+                continue
+            # Each figure job only receives the columns it plots
+            for name, function, args, kwargs, columns in PLOTS:
+                columns = [c for c in dict.fromkeys(columns) if c in df.columns]
+                job = pool.submit(
+                    profiled, profile, f"plot {site}/{name}", render_plot, site, name, function, args, kwargs, df[columns]
+                )
+                plot_jobs[job] = (site, name)
+
+        for job in as_completed(plot_jobs):
+            site, name = plot_jobs[job]
+            try:
+                tracer.add(job.result()[1])
+            except Exception as e:
+                print(f"Error plotting {name} for {site}: {e}")
+    return results
@@ -1,14 +1,20 @@
-from scipy.stats import zscore
+from app.cleaning_pipeline import CleaningPipeline, DropMissing, FillMean, Outliers
+
+# GHI is filled with its mean over every row, before rows without Timestamp are dropped
+MISSING_VALUES = CleaningPipeline([FillMean(["GHI"]), DropMissing(["Timestamp"])])
+# Like scipy's zscore, a column with a missing value flags nothing
+OUTLIERS = CleaningPipeline([Outliers(["GHI", "DNI", "DHI"], z_threshold=3, nan_policy="propagate")])
+# Both of the above in a single fused pass
+BATCH_CLEANING = CleaningPipeline(MISSING_VALUES.steps + OUTLIERS.steps)
+
 
 def handle_missing_values(df):
-    df['GHI'] = df['GHI'].fillna(df['GHI'].mean())
-    df.dropna(subset=['Timestamp'], inplace=True)
-    return df
+    return MISSING_VALUES.run(df, inplace=True)
 
-def detect_outliers(df):
-    z_scores = zscore(df[['GHI', 'DNI', 'DHI']])
-    df['outlier'] = (abs(z_scores) > 3).any(axis=1)
-    return df
 
+def detect_outliers(df):
+    return OUTLIERS.run(df, inplace=True)
 
 
+def clean_dataset(df):
+    return BATCH_CLEANING.run(df, inplace=True)
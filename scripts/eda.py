@@ -1,20 +1,15 @@
+import argparse
+import os
+import sys
 import pandas as pd
-import matplotlib.pyplot as plt
-from cleaning import handle_missing_values, detect_outliers
-from visualization import (
-    plot_time_series,
-    plot_correlation_matrix,
-    plot_cleaning_impact,
-    plot_wind_rose,
-    generate_pair_plot,
-    scatter_plot,
-    plot_histogram,
-    bubble_chart,
-    display_summary,
-)
-
-# Load the dataset
 
+# Make the app and scripts packages importable when this file is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.visualization import display_summary
+from scripts.streaming import CHUNK_SIZE, concat_csv_files
+from scripts.batch import run_batch
+from app.schema import memory_report, to_station_csv
+from app.instrumentation import enable, span, tracer
 
 # List of datasets and their names
 datasets = [
@@ -22,56 +17,98 @@ datasets = [
     {"name": "benin", "path": "data/raw/benin-malanville.csv"},
     {"name": "togo", "path": "data/raw/togo-dapaong_qc.csv"},
 ]
-solar_temp_columns = ["GHI", "DNI", "DHI", "TModA", "TModB"]
-wind_columns = ["WS", "WSgust", "WD", "GHI", "DNI"]
-
-for dataset in datasets:
-    print(f"Processing dataset: {dataset['name']}")
 
-    # Load the dataset
-    try:
-        df = pd.read_csv(dataset["path"])
-        # Data Cleaning
 
-        df = handle_missing_values(df)
-        df = detect_outliers(df)
+def main():
+    parser = argparse.ArgumentParser(description="Clean the raw station datasets and plot them.")
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Clean out of core, reading this many rows at a time (skips the plots and rollups).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: one per CPU).",
+    )
+    parser.add_argument("--no-plots", action="store_true", help="Only clean the datasets.")
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Reprocess every raw file from scratch instead of only the rows added since the last run.",
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Print the in-memory size of each raw dataset with inferred vs compact dtypes and exit.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Record per-stage timings and write them to PATH as a Chrome trace (as plain JSON if PATH ends in .spans.json).",
+    )
+    args = parser.parse_args()
 
-        # Save cleaned dataset
-        output_path = f"data/processed/{dataset['name']}-cleaned.csv"
+    if args.profile:
+        enable()
+        tracer.begin_run("eda")
+        try:
+            with span("eda"):
+                run(args)
+        finally:
+            with open(args.profile, "w") as f:
+                f.write(tracer.to_json() if args.profile.endswith(".spans.json") else tracer.to_chrome_trace())
+            print(f"Trace written to {args.profile}")
+            for name, (calls, p50, p95) in sorted(tracer.percentiles().items()):
+                print(f"{name:50s} {calls:4d} calls  p50 {p50:9.1f} ms  p95 {p95:9.1f} ms")
+        return
+    run(args)
 
-        df.to_csv(output_path, index=False)
 
-        # Visualizations
-        plot_time_series(df)
-        plot_correlation_matrix(df, solar_temp_columns)
-        plot_correlation_matrix(df, wind_columns)
-        plot_cleaning_impact(df)
-        plot_wind_rose(df)
-        generate_pair_plot(df, solar_temp_columns)
-        generate_pair_plot(df, wind_columns)
-        scatter_plot(df, x="RH", y="GHI", title="RH vs Solar Radiation (GHI)")
-        plot_histogram(df, column="GHI")
-        plot_histogram(df, column="WS")
-        plot_histogram(df, column="TModA")
-        bubble_chart(
-            df,
-            x="GHI",
-            y="Tamb",
-            size="RH",
-            color="WS",
-            title="GHI vs Tamb vs WS (Size: RH)",
-        )
+def run(args):
+    """
+    Cleans and plots every dataset as configured by the command line arguments.
+    """
+    if args.memory_report:
+        print(memory_report({d["name"]: d["path"] for d in datasets}))
+        return
 
-        print(f"Finished processing {dataset['name']}")
+    # Sites and their figures are processed in parallel on a process pool
+    results = run_batch(
+        datasets,
+        workers=args.workers,
+        chunksize=args.chunksize,
+        plots=not args.no_plots,
+        incremental=not args.full_rebuild,
+        profile=bool(args.profile),
+    )
+    # Keep the dataset order for the combined file
+    succeeded = [d["name"] for d in datasets if d["name"] in results]
+    if not succeeded:
+        print("No dataset was processed.")
+        return
 
-    except Exception as e:
-        print(f"Error processing dataset {dataset['name']}: {e}")
-        continue
-display_summary(df)
-print("All datasets processed successfully!")
+    modes = {results[name].mode for name in succeeded}
+    combined_path = "data/processed/combined-cleaned.csv"
+    if modes == {"incremental"} and os.path.exists(combined_path):
+        # Only the new rows are appended to the combined dataset
+        new_rows = [results[name].df for name in succeeded if len(results[name].df)]
+        if new_rows:
+            to_station_csv(pd.concat(new_rows), combined_path, mode="a", header=False)
+    elif modes == {"full"} and len(succeeded) == len(datasets):
+        display_summary(results[succeeded[-1]].df)
+        # Assembled from the in-memory results, no second CSV round trip
+        with span("combine"):
+            combined_df = pd.concat([results[name].df for name in succeeded])
+            to_station_csv(combined_df, combined_path)
+    else:
+        cleaned_paths = [f"data/processed/{name}-cleaned.csv" for name in succeeded]
+        with span("combine"):
+            concat_csv_files(cleaned_paths, combined_path, chunksize=args.chunksize or CHUNK_SIZE)
+    print(f"Processed {len(succeeded)} of {len(datasets)} datasets successfully!")
 
 
-combined_df = pd.concat(
-    [pd.read_csv(f"data/processed/{d['name']}-cleaned.csv") for d in datasets]
-)
-combined_df.to_csv("data/processed/combined-cleaned.csv", index=False)
+if __name__ == "__main__":
+    main()
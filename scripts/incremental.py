@@ -0,0 +1,136 @@
+import io
+import json
+import os
+import pandas as pd
+from .streaming import CHUNK_SIZE, CleaningStats, clean_chunk, open_prefix
+from app.schema import read_station_csv, to_station_csv
+
+STATE_DIR = "data/processed/state"
+
+
+def state_path(name, state_dir=STATE_DIR):
+    return os.path.join(state_dir, f"{name}.json")
+
+
+def load_state(name, state_dir=STATE_DIR):
+    """
+    Returns the persisted ingestion state of a site, or None.
+    """
+    path = state_path(name, state_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(name, state, state_dir=STATE_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    path = state_path(name, state_dir)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def complete_size(path):
+    """
+    Returns the size of the file up to and including its last newline, so a row
+    that is still being written is picked up by the next run.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        step = 4096
+        position = size
+        while position > 0:
+            start = max(0, position - step)
+            f.seek(start)
+            block = f.read(position - start)
+            newline = block.rfind(b"\n")
+            if newline != -1:
+                return start + newline + 1
+            position = start
+    return 0
+
+
+def state_of(chunks, offset):
+    """
+    Returns the state a full rebuild of chunks (the rows of the first offset bytes
+    of the raw file) leaves behind: running cleaning statistics, the byte offset
+    read so far and the watermark (last Timestamp processed).
+    """
+    stats = CleaningStats()
+    watermark = None
+    for chunk in chunks:
+        stats.update(chunk)
+        latest = chunk["Timestamp"].max()
+        if pd.notna(latest) and (watermark is None or latest > watermark):
+            watermark = latest
+    return {
+        "offset": offset,
+        "watermark": None if watermark is None else watermark.isoformat(),
+        "stats": stats.to_dict(),
+    }
+
+
+def build_state(raw_path, offset=None, chunksize=CHUNK_SIZE):
+    """
+    Scans the first offset bytes of a raw file (default: its complete rows) and
+    returns the state a full rebuild of them leaves behind (see state_of).
+    """
+    if offset is None:
+        offset = complete_size(raw_path)
+    with open_prefix(raw_path, offset) as f:
+        return state_of(read_station_csv(f, chunksize=chunksize), offset)
+
+
+def read_new_rows(raw_path, state):
+    """
+    Reads only the complete rows appended after the persisted byte offset.
+    Returns (new rows, new offset), or None when the file was rewritten rather than appended to.
+    """
+    offset = complete_size(raw_path)
+    if offset < state["offset"]:
+        return None
+    with open(raw_path, "rb") as f:
+        header = f.readline()
+        f.seek(state["offset"])
+        tail = f.read(offset - state["offset"])
+    if not tail.strip():
+        return read_station_csv(io.BytesIO(header)), offset
+    return read_station_csv(io.BytesIO(header + tail)), offset
+
+
+def ingest_site(dataset, output_path, chunksize=CHUNK_SIZE):
+    """
+    Cleans the rows appended to a site's raw file since the last run with the
+    persisted statistics (updated with the new rows first) and appends them to
+    the cleaned CSV. Returns the newly cleaned rows, or None if a full rebuild is
+    needed (no state yet, or the raw file was rewritten).
+    """
+    state = load_state(dataset["name"])
+    if state is None or not os.path.exists(output_path):
+        return None
+    result = read_new_rows(dataset["path"], state)
+    if result is None:
+        return None
+    new_rows, offset = result
+
+    # Rows at or before the watermark were already processed
+    timestamps = new_rows["Timestamp"]
+    if state["watermark"] is not None:
+        new_rows = new_rows[~(timestamps <= pd.Timestamp(state["watermark"]))]
+        timestamps = timestamps[new_rows.index]
+
+    stats = CleaningStats.from_dict(state["stats"])
+    stats.update(new_rows)
+    cleaned = clean_chunk(new_rows, *stats.finalize())
+    if len(cleaned):
+        to_station_csv(cleaned, output_path, mode="a", header=False)
+
+    latest = timestamps.max()
+    if pd.notna(latest) and (state["watermark"] is None or latest > pd.Timestamp(state["watermark"])):
+        state["watermark"] = latest.isoformat()
+    state["offset"] = offset
+    state["stats"] = stats.to_dict()
+    save_state(dataset["name"], state)
+    return cleaned
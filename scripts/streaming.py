@@ -0,0 +1,187 @@
+import io
+import numpy as np
+import pandas as pd
+from app.schema import read_station_csv, to_station_csv
+
+CHUNK_SIZE = 100_000
+OUTLIER_COLUMNS = ["GHI", "DNI", "DHI"]
+
+
+class RunningStats:
+    """
+    Welford-style running count/mean/M2 per column, updated one chunk at a time
+    (chunks are merged with Chan's parallel formula). NaN values are skipped.
+    """
+
+    def __init__(self, n_columns):
+        self.count = np.zeros(n_columns)
+        self.mean = np.zeros(n_columns)
+        self.m2 = np.zeros(n_columns)
+        self.has_nan = np.zeros(n_columns, dtype=bool)
+
+    def update(self, values):
+        values = np.asarray(values, dtype="float64")
+        nan = np.isnan(values)
+        self.has_nan |= nan.any(axis=0)
+        count = (~nan).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self.merge(count, mean, m2)
+
+    def merge(self, count, mean, m2):
+        total = self.count + count
+        safe_total = np.where(total > 0, total, 1)
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / safe_total
+        self.m2 = self.m2 + m2 + delta**2 * self.count * count / safe_total
+        self.count = total
+
+    def std(self):
+        """
+        Population standard deviation (ddof=0, as scipy's zscore uses).
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(self.m2 / self.count)
+
+
+class CleaningStats:
+    """
+    The statistics handle_missing_values + detect_outliers need, accumulated chunk by chunk:
+    GHI over every row (its mean is the fill value) and GHI/DNI/DHI over rows with a Timestamp.
+    """
+
+    def __init__(self):
+        self.fill_stats = RunningStats(1)
+        self.kept_stats = RunningStats(len(OUTLIER_COLUMNS))
+        self.missing_ghi = 0
+
+    def update(self, chunk):
+        # GHI is filled with its mean over every row, before rows without Timestamp are dropped
+        self.fill_stats.update(chunk[["GHI"]])
+        kept = chunk[chunk["Timestamp"].notna()]
+        self.missing_ghi += int(kept["GHI"].isna().sum())
+        self.kept_stats.update(kept[OUTLIER_COLUMNS])
+
+    def finalize(self):
+        """
+        Returns the GHI fill value and the mean/std of GHI/DNI/DHI after filling.
+        """
+        fill_value = self.fill_stats.mean[0] if self.fill_stats.count[0] else np.nan
+        stats = RunningStats(len(OUTLIER_COLUMNS))
+        for name in ("count", "mean", "m2", "has_nan"):
+            setattr(stats, name, getattr(self.kept_stats, name).copy())
+        # The filled GHI values all equal the fill value: merge them in as one group with M2 = 0
+        group_count = np.array([self.missing_ghi, 0, 0])
+        group_mean = np.array([fill_value if self.missing_ghi else 0.0, 0.0, 0.0])
+        stats.merge(group_count, group_mean, np.zeros(len(OUTLIER_COLUMNS)))
+
+        std = stats.std()
+        # Like scipy's zscore (nan_policy="propagate"), DNI/DHI columns with a NaN get no z-scores
+        std[1:][stats.has_nan[1:]] = np.nan
+        return fill_value, stats.mean, std
+
+    def to_dict(self):
+        return {
+            "missing_ghi": self.missing_ghi,
+            "fill": {k: getattr(self.fill_stats, k).tolist() for k in ("count", "mean", "m2", "has_nan")},
+            "kept": {k: getattr(self.kept_stats, k).tolist() for k in ("count", "mean", "m2", "has_nan")},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.missing_ghi = data["missing_ghi"]
+        for target, key in ((stats.fill_stats, "fill"), (stats.kept_stats, "kept")):
+            for name, values in data[key].items():
+                setattr(target, name, np.array(values, dtype=bool if name == "has_nan" else "float64"))
+        return stats
+
+
+class _FilePrefix(io.RawIOBase):
+    """
+    Raw reader over the first size bytes of a file.
+    """
+
+    def __init__(self, path, size):
+        self._file = open(path, "rb")
+        self._left = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = self._file.readinto(memoryview(buffer)[: self._left]) if self._left else 0
+        self._left -= n
+        return n
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_prefix(path, size=None):
+    """
+    Opens a file for reading up to byte size (default: the whole file), e.g. the
+    complete rows of a raw export that is still being appended to.
+    """
+    if size is None:
+        return open(path, "rb")
+    return io.BufferedReader(_FilePrefix(path, size))
+
+
+def accumulate_cleaning_stats(path, chunksize=CHUNK_SIZE, size=None):
+    """
+    First pass over the raw CSV (its first size bytes, default: all of it).
+    Returns the GHI fill value and the mean/std of GHI/DNI/DHI that
+    handle_missing_values + detect_outliers would see in memory.
+    """
+    stats = CleaningStats()
+    with open_prefix(path, size) as f:
+        for chunk in read_station_csv(f, chunksize=chunksize):
+            stats.update(chunk)
+    return stats.finalize()
+
+
+def clean_chunk(chunk, fill_value, mean, std, z_threshold=3):
+    """
+    Applies handle_missing_values + detect_outliers to one chunk using precomputed statistics.
+    """
+    chunk = chunk.copy()
+    chunk["GHI"] = chunk["GHI"].fillna(fill_value)
+    chunk = chunk.dropna(subset=["Timestamp"])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z_scores = (chunk[OUTLIER_COLUMNS].to_numpy(dtype="float64") - mean) / std
+    chunk["outlier"] = (np.abs(z_scores) > z_threshold).any(axis=1)
+    return chunk
+
+
+def stream_clean(path, output_path, chunksize=CHUNK_SIZE, size=None, on_chunk=None):
+    """
+    Two-pass out-of-core cleaning of a raw station CSV (its first size bytes,
+    default: all of it); memory is bounded by chunksize.
+    Pass 1 accumulates the statistics, pass 2 fills, flags and writes each chunk
+    (and passes it to on_chunk, if given).
+    Returns the number of rows written.
+    """
+    fill_value, mean, std = accumulate_cleaning_stats(path, chunksize, size)
+    rows = 0
+    with open_prefix(path, size) as f:
+        for i, chunk in enumerate(read_station_csv(f, chunksize=chunksize)):
+            cleaned = clean_chunk(chunk, fill_value, mean, std)
+            to_station_csv(cleaned, output_path, mode="w" if i == 0 else "a", header=i == 0)
+            if on_chunk is not None:
+                on_chunk(cleaned)
+            rows += len(cleaned)
+    return rows
+
+
+def concat_csv_files(paths, output_path, chunksize=CHUNK_SIZE):
+    """
+    Concatenates CSV files chunk by chunk into output_path.
+    """
+    first = True
+    for path in paths:
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            chunk.to_csv(output_path, mode="w" if first else "a", header=first, index=False)
+            first = False
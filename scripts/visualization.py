@@ -3,14 +3,17 @@ import seaborn as sns
 import pandas as pd
 import numpy as np
 from windrose import WindroseAxes
+from matplotlib.colors import LogNorm
+from app.raster import RASTER_ROWS, bubble_image, rasterize_points
+from app.wind_rose import default_speed_bins, draw_wind_rose, wind_rose_table
 
 
 def plot_time_series(df):
-    df["Timestamp"] = pd.to_datetime(df["Timestamp"])  # Ensure Timestamp is datetime
+    timestamps = pd.to_datetime(df["Timestamp"])  # Ensure Timestamp is datetime
     plt.figure(figsize=(12, 6))
-    plt.plot(df["Timestamp"], df["GHI"], label="GHI")
-    plt.plot(df["Timestamp"], df["DNI"], label="DNI")
-    plt.plot(df["Timestamp"], df["DHI"], label="DHI")
+    plt.plot(timestamps, df["GHI"], label="GHI")
+    plt.plot(timestamps, df["DNI"], label="DNI")
+    plt.plot(timestamps, df["DHI"], label="DHI")
     plt.title("Solar Radiation Over Time")
     plt.xlabel("Timestamp")
     plt.ylabel("Radiation (W/m²)")
@@ -19,14 +22,18 @@ def plot_time_series(df):
     plt.show()
 
 
-def plot_correlation_matrix(df, columns):
-    """Plots a correlation heatmap for the dataset."""
-    if "Timestamp" in df.columns:
-        df["timestamp_numeric"] = (
-            pd.to_datetime(df["Timestamp"], errors="coerce").astype("int64") // 10**9
+def plot_correlation_matrix(df, columns=None):
+    """Plots a correlation heatmap for the dataset (all numeric columns by default)."""
+    if columns is None:
+        columns = list(df.select_dtypes(include=[np.number]).columns)
+    data = df[[c for c in columns if c in df.columns]]
+    if "timestamp_numeric" in columns and "Timestamp" in df.columns:
+        # Derived on the projected frame, the caller's frame is not modified
+        data = data.assign(
+            timestamp_numeric=pd.to_datetime(df["Timestamp"], errors="coerce").astype("int64") // 10**9
         )
     # Select only numeric columns
-    numeric_data = df.select_dtypes(include=[np.number])
+    numeric_data = data.select_dtypes(include=[np.number])
 
     if numeric_data.empty:
         print(f"No numeric data in dataset to compute correlations.")
@@ -42,17 +49,19 @@ def plot_correlation_matrix(df, columns):
 def plot_cleaning_impact(df):
     df_cleaning = df[df["Cleaning"] == 1]
     df_no_cleaning = df[df["Cleaning"] == 0]
-    plt.boxplot(
-        [df_cleaning["ModA"], df_no_cleaning["ModA"]], labels=["Cleaned", "Not Cleaned"]
-    )
+    plt.boxplot([df_cleaning["ModA"], df_no_cleaning["ModA"]])
+    plt.xticks([1, 2], ["Cleaned", "Not Cleaned"])
     plt.title("Impact of Cleaning on ModA")
     plt.ylabel("ModA (W/m²)")
     plt.show()
 
 
 def plot_wind_rose(df):
+    # Bin direction x speed once and draw the pre-binned table
+    speed_bins = default_speed_bins(df["WS"])
+    table = wind_rose_table(df["WD"], df["WS"], speed_bins)
     ax = WindroseAxes.from_ax()
-    ax.bar(df["WD"], df["WS"], normed=True, opening=0.8, edgecolor="white")
+    draw_wind_rose(ax, table, speed_bins, normed=True, opening=0.8, edgecolor="white")
     ax.set_legend()
     plt.title("Wind Rose")
     plt.show()
@@ -64,9 +73,24 @@ def generate_pair_plot(df, columns):
     plt.show()
 
 
-def scatter_plot(df, x, y, title="Scatter Plot"):
+def scatter_plot(df, x, y, title="Scatter Plot", raster=None):
     plt.figure(figsize=(8, 6))
-    sns.scatterplot(data=df, x=x, y=y)
+    if raster is None:
+        raster = len(df) > RASTER_ROWS
+    if raster:
+        # Point-density image instead of one marker per row
+        counts, _, extent = rasterize_points(df[x], df[y])
+        image = plt.imshow(
+            np.ma.masked_equal(counts, 0),
+            origin="lower",
+            extent=extent,
+            aspect="auto",
+            norm=LogNorm(),
+            interpolation="nearest",
+        )
+        plt.colorbar(image, label="Points per pixel")
+    else:
+        sns.scatterplot(data=df, x=x, y=y)
     plt.title(title)
     plt.xlabel(x)
     plt.ylabel(y)
@@ -86,17 +110,28 @@ def plot_histogram(df, column, bins=20):
     plt.show()
 
 
-def bubble_chart(df, x, y, size, color=None, title="Bubble Chart"):
+def bubble_chart(df, x, y, size, color=None, title="Bubble Chart", raster=None):
     plt.figure(figsize=(10, 8))
-    scatter = plt.scatter(
-        x=df[x],
-        y=df[y],
-        s=df[size] * 100,  # Scale bubble size
-        c=df[color] if color else None,
-        alpha=0.6,
-        cmap="viridis",
-    )
-    plt.colorbar(scatter, label=color) if color else None
+    if raster is None:
+        raster = len(df) > RASTER_ROWS
+    if raster:
+        # Pixels colored by the mean color value, opacity from the mean size
+        values = [df[size]] + ([df[color]] if color else [])
+        counts, means, extent = rasterize_points(df[x], df[y], values)
+        rgba, norm = bubble_image(counts, means[0], means[1] if color else None)
+        plt.imshow(rgba, origin="lower", extent=extent, aspect="auto", interpolation="nearest")
+        if color:
+            plt.colorbar(plt.cm.ScalarMappable(norm=norm, cmap="viridis"), ax=plt.gca(), label=color)
+    else:
+        scatter = plt.scatter(
+            x=df[x],
+            y=df[y],
+            s=df[size] * 100,  # Scale bubble size
+            c=df[color] if color else None,
+            alpha=0.6,
+            cmap="viridis",
+        )
+        plt.colorbar(scatter, label=color) if color else None
     plt.title(title)
     plt.xlabel(x)
     plt.ylabel(y)
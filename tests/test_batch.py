@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.batch import render_plot, run_batch
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/raw")
+        os.makedirs("data/processed")
+        rng = np.random.default_rng(7)
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=300, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, 300),
+            "DNI": rng.normal(300, 80, 300),
+            "DHI": rng.normal(100, 20, 300),
+        })
+        self.df.to_csv("data/raw/site.csv", index=False)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_run_batch_isolates_failures(self):
+        datasets = [
+            {"name": "site", "path": "data/raw/site.csv"},
+            {"name": "missing", "path": "data/raw/missing.csv"},
+        ]
+        results = run_batch(datasets, workers=2, plots=False)
+        self.assertEqual(list(results), ["site"])
+        self.assertEqual(len(results["site"].df), 300)
+        self.assertEqual(results["site"].mode, "full")
+        self.assertTrue(os.path.exists("data/processed/site-cleaned.csv"))
+        self.assertTrue(os.path.exists("data/processed/rollups/site-hourly.parquet"))
+
+    def test_render_plot_saves_figure(self):
+        render_plot("site", "histogram-ghi", "plot_histogram", (), {"column": "GHI"}, self.df, output_dir="output")
+        self.assertTrue(os.path.exists("output/site-histogram-ghi.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()
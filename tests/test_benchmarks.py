@@ -0,0 +1,31 @@
+import unittest
+import numpy as np
+import pandas as pd
+from benchmarks.run import compare
+from benchmarks.synthetic import generate_site
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_generator_is_deterministic(self):
+        first = generate_site(0, years=0.01, seed=1)
+        pd.testing.assert_frame_equal(first, generate_site(0, years=0.01, seed=1))
+        self.assertFalse(first["GHI"].equals(generate_site(1, years=0.01, seed=1)["GHI"]))
+        self.assertEqual(len(first), int(0.01 * 365 * 24 * 60))
+        self.assertTrue(first["GHI"].isna().any())
+        self.assertTrue(set(np.unique(first["Cleaning"])) <= {0, 1})
+
+    def test_compare_flags_regressions_past_thresholds(self):
+        baseline = {"results": {"a": {"seconds": 1.0, "peak_mb": 100.0}, "b": {"seconds": 0.01, "peak_mb": 1.0}}}
+        results = {
+            "results": {
+                "a": {"seconds": 1.5, "peak_mb": 110.0},
+                # Relatively slower but within the absolute slack
+                "b": {"seconds": 0.03, "peak_mb": 2.0},
+                "new": {"seconds": 9.0, "peak_mb": 9.0},
+            }
+        }
+        self.assertEqual(compare(results, baseline), [("a", "seconds", 1.0, 1.5)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+from app.cleaning_pipeline import CleaningPipeline, DropEmptyColumns, DropMissing, FillMean, Outliers, ReplaceInfinite
+
+
+class TestCleaningPipeline(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        n = 200
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, n),
+            "DNI": rng.normal(300, 80, n).astype("float32"),
+            "Cleaning": rng.integers(0, 2, n),
+            "Comments": np.nan,
+        })
+        self.df.loc[[3, 9], "GHI"] = np.nan
+        self.df.loc[4, "GHI"] = np.inf
+        self.df.loc[11, "DNI"] = 9000.0
+        self.df.loc[12, "Timestamp"] = np.nan
+
+    def test_fill_and_drop_outliers_without_mutating(self):
+        original = self.df.copy()
+        pipeline = CleaningPipeline([
+            DropEmptyColumns(),
+            ReplaceInfinite(),
+            FillMean(),
+            Outliers(["GHI", "DNI"], action="drop"),
+        ])
+        cleaned = pipeline.run(self.df)
+        pd.testing.assert_frame_equal(self.df, original)
+        self.assertNotIn("Comments", cleaned.columns)
+        self.assertNotIn(11, cleaned.index)
+        self.assertFalse(cleaned[["GHI", "DNI"]].isna().any().any())
+        self.assertTrue(np.isfinite(cleaned["GHI"]).all())
+        self.assertEqual(cleaned["DNI"].dtype, np.float32)
+        self.assertEqual(cleaned["Cleaning"].dtype, self.df["Cleaning"].dtype)
+        finite = self.df["GHI"][np.isfinite(self.df["GHI"])]
+        self.assertAlmostEqual(cleaned.loc[3, "GHI"], finite.mean())
+
+    def test_inplace_flag_matches_zscore_propagation(self):
+        self.df.loc[20, "DNI"] = np.nan
+        df = self.df.drop(columns="Comments")
+        result = CleaningPipeline([
+            FillMean(["GHI"]),
+            DropMissing(["Timestamp"]),
+            Outliers(["GHI", "DNI"], nan_policy="propagate"),
+        ]).run(df, inplace=True)
+        self.assertIs(result, df)
+        self.assertNotIn(12, df.index)
+        # DNI has a missing value: like scipy's zscore it flags nothing
+        self.assertFalse(df.loc[11, "outlier"])
+        # inf propagates into the GHI mean and std
+        self.assertFalse(df["outlier"].any())
+
+    def test_inplace_drop_with_duplicate_labels(self):
+        df = pd.DataFrame({"Timestamp": ["2023-01-01", None, "2023-01-02", "2023-01-03"], "GHI": [1.0, 2.0, 3.0, 4.0]})
+        df.index = pd.Index([0, 0, 1, 2], name="row")
+        CleaningPipeline([DropMissing(["Timestamp"])]).run(df, inplace=True)
+        self.assertEqual(df["GHI"].tolist(), [1.0, 3.0, 4.0])
+        self.assertEqual(df.index.tolist(), [0, 1, 2])
+        self.assertEqual(df.index.name, "row")
+
+    def test_clip(self):
+        df = self.df[["DNI"]]
+        clipped = CleaningPipeline([Outliers(["DNI"], z_threshold=2, action="clip")]).run(df)
+        values = df["DNI"].to_numpy(dtype="float64")
+        high = values.mean() + 2 * values.std()
+        self.assertAlmostEqual(clipped["DNI"].max(), high, places=2)
+        self.assertEqual(len(clipped), len(df))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import os
+import tempfile
+import unittest
+import pandas as pd
+from app.columnar_store import (
+    build_parquet_cache,
+    cached_fingerprint,
+    load_dataset,
+    source_fingerprint,
+)
+
+
+class TestColumnarStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "site-cleaned.csv")
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=10, freq="D"),
+            "GHI": range(10),
+            "DNI": range(10, 20),
+        })
+        self.df.to_csv(self.csv_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_dataset_projects_columns(self):
+        df = load_dataset(self.csv_path, columns=["DNI"], cache_dir=self.cache_dir)
+        self.assertEqual(list(df.columns), ["Timestamp", "DNI"])
+
+    def test_cache_invalidated_when_source_changes(self):
+        path = build_parquet_cache(self.csv_path, cache_dir=self.cache_dir)
+        self.df.assign(GHI=self.df["GHI"] * 2).iloc[:5].to_csv(self.csv_path, index=False)
+        self.assertNotEqual(cached_fingerprint(path), source_fingerprint(self.csv_path))
+        df = load_dataset(self.csv_path, cache_dir=self.cache_dir)
+        self.assertEqual(list(df["GHI"]), [0, 2, 4, 6, 8])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app.correlation import CorrelationIndex
+from app.utils import generate_correlation_matrix, set_time_index, time_range_slice
+from scripts.visualization import plot_correlation_matrix
+
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        n = 4 * 24 * 60
+        ghi = rng.normal(500, 100, n)
+        dni = 0.8 * ghi + rng.normal(0, 30, n)
+        ws = rng.gamma(2.0, 1.0, n)
+        ghi[::97] = np.nan
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01 03:00", periods=n, freq="min"),
+            "GHI": ghi,
+            "DNI": dni,
+            "WS": ws,
+        }))
+        self.index = CorrelationIndex(self.df, ["GHI", "DNI", "WS"])
+
+    def test_range_corr_matches_pandas(self):
+        start_time, end_time = pd.Timestamp("2023-01-01 20:00"), pd.Timestamp("2023-01-03 05:30")
+        expected = time_range_slice(self.df, start_time, end_time)[["WS", "GHI"]].corr()
+        result = self.index.corr(["WS", "GHI"], start_time, end_time)
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    def test_full_range_corr(self):
+        expected = self.df[["GHI", "DNI", "WS"]].corr()
+        np.testing.assert_allclose(self.index.corr().to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    def test_generate_correlation_matrix_with_index(self):
+        fig = generate_correlation_matrix(self.df, ["GHI", "DNI"], correlation_index=self.index)
+        self.assertEqual(fig.axes[0].get_title(), "Correlation Matrix")
+        plt.close(fig)
+
+    def test_plot_correlation_matrix_does_not_mutate(self):
+        columns = list(self.df.columns)
+        plot_correlation_matrix(self.df, ["GHI", "DNI"])
+        plt.close("all")
+        self.assertEqual(list(self.df.columns), columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from app.data_pipeline import (
+    PreparedDataCache,
+    describe_range,
+    index_cache,
+    prepare_dataset,
+    invalidate_dataset,
+    lazy_dataset,
+    range_stats_index,
+    raw_data_order,
+    raw_data_page,
+)
+
+
+class TestDataPipeline(unittest.TestCase):
+    def setUp(self):
+        # The Parquet cache is written under the working directory
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        self.csv_path = os.path.join(self.tmp.name, "site-cleaned.csv")
+        pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=6, freq="h"),
+            "GHI": [100, 200, None, 400, 500, 600],
+            "DNI": [50, 100, 150, 200, 250, 300],
+            "DHI": [10, 20, 30, 40, 50, 60],
+        }).to_csv(self.csv_path, index=False)
+        self.cache = PreparedDataCache(max_entries=2)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_prepare_dataset_is_memoized(self):
+        first = prepare_dataset("site", self.csv_path, cache=self.cache)
+        second = prepare_dataset("site", self.csv_path, cache=self.cache)
+        self.assertEqual(len(self.cache), 1)
+        # Both calls are views of the same shared frame
+        self.assertTrue(np.shares_memory(first["GHI"].to_numpy(), second["GHI"].to_numpy()))
+        self.assertFalse(first["GHI"].isnull().any())
+        self.assertIn("Timestamp_numeric", first.columns)
+
+    def test_parameters_are_part_of_the_key(self):
+        prepare_dataset("site", self.csv_path, z_threshold=3, cache=self.cache)
+        prepare_dataset("site", self.csv_path, z_threshold=2, cache=self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_lru_eviction(self):
+        for z in (1, 2, 3):
+            prepare_dataset("site", self.csv_path, z_threshold=z, cache=self.cache)
+        self.assertEqual(len(self.cache), 2)
+
+    def test_changed_source_replaces_the_handle(self):
+        cache = PreparedDataCache(max_entries=4)
+        prepare_dataset("site", self.csv_path, cache=cache)
+        prepare_dataset("site", self.csv_path, z_threshold=2, cache=cache)
+        with open(self.csv_path, "a") as f:
+            f.write("2023-01-01 06:00:00,700,350,70\n")
+        df = prepare_dataset("site", self.csv_path, cache=cache)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(len(df), 7)
+
+    def test_changed_source_drops_stale_indexes(self):
+        try:
+            range_stats_index("site", self.csv_path, ["GHI"])
+            with open(self.csv_path, "a") as f:
+                f.write("2023-01-01 06:00:00,700,350,70\n")
+            index = range_stats_index("site", self.csv_path, ["GHI"])
+            self.assertEqual(index.summary("2023-01-01", "2023-01-02").loc["max", "GHI"], 700)
+            self.assertEqual(sum(key[0] == "site" for key in index_cache._entries), 1)
+        finally:
+            invalidate_dataset("site")
+
+    def test_evicted_keys_are_reported(self):
+        evicted = []
+        cache = PreparedDataCache(max_entries=1, on_evict=evicted.append)
+        for z in (1, 2):
+            prepare_dataset("site", self.csv_path, z_threshold=z, cache=cache)
+        self.assertEqual([key[3] for key in evicted], [1])
+
+    def test_invalidate_dataset(self):
+        first = prepare_dataset("site", self.csv_path, cache=self.cache)
+        invalidate_dataset("site", cache=self.cache)
+        self.assertEqual(len(self.cache), 0)
+        second = prepare_dataset("site", self.csv_path, cache=self.cache)
+        self.assertFalse(np.shares_memory(first["GHI"].to_numpy(), second["GHI"].to_numpy()))
+
+    def test_session_changes_do_not_leak_into_shared_frame(self):
+        session = prepare_dataset("site", self.csv_path, cache=self.cache)
+        session.loc[session.index[0], "GHI"] = -1.0
+        session["extra"] = 1
+        shared = prepare_dataset("site", self.csv_path, cache=self.cache)
+        self.assertEqual(shared["GHI"].iloc[0], 100)
+        self.assertNotIn("extra", shared.columns)
+
+    def test_raw_data_pages_are_memoized(self):
+        order_cache = PreparedDataCache()
+        args = ("site", self.csv_path, "2023-01-01 01:00", "2023-01-01 05:00")
+        order = raw_data_order(*args, sort_by="DNI", ascending=False, cache=self.cache, order_cache=order_cache)
+        again = raw_data_order(*args, sort_by="DNI", ascending=False, cache=self.cache, order_cache=order_cache)
+        self.assertIs(order, again)
+        page = raw_data_page("site", self.csv_path, order, 0, 2, ["DNI", "DHI"], cache=self.cache)
+        self.assertEqual(page["DNI"].tolist(), [300, 250])
+        self.assertEqual(list(page.columns), ["DNI", "DHI"])
+        invalidate_dataset("site", cache=self.cache, order_cache=order_cache)
+        self.assertEqual(len(order_cache), 0)
+
+    def test_describe_range_loads_only_the_requested_columns(self):
+        pd.read_csv(self.csv_path).assign(Tamb=range(6), RH=range(6)).to_csv(self.csv_path, index=False)
+        args = ("site", self.csv_path, "2023-01-01 00:00", "2023-01-01 05:00")
+        try:
+            first = describe_range(*args, columns=["Tamb", "GHI"])
+            second = describe_range(*args, columns=["GHI", "Tamb"])
+            self.assertEqual(list(first.columns), ["Tamb", "GHI"])
+            self.assertEqual(first.loc["max", "Tamb"], 5)
+            pd.testing.assert_frame_equal(first[["GHI", "Tamb"]], second)
+            # Both orderings share one index of each kind, and RH was never loaded
+            self.assertEqual(sum(key[0] == "site" for key in index_cache._entries), 2)
+            self.assertNotIn("RH", lazy_dataset("site", self.csv_path).loaded_columns())
+        finally:
+            invalidate_dataset("site")
+
+
+if __name__ == "__main__":
+    unittest.main()
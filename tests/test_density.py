@@ -0,0 +1,42 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from scipy.stats import gaussian_kde
+from app.density import binned_kde, sample_rows
+from app.utils import generate_pair_plot, plot_histogram
+
+
+class TestDensity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.df = pd.DataFrame({
+            "GHI": np.concatenate([rng.normal(0, 1, 3000), rng.normal(6, 2, 2000)]),
+            "WS": rng.gamma(2.0, 1.0, 5000),
+        })
+
+    def test_binned_kde_matches_gaussian_kde(self):
+        grid, density = binned_kde(self.df["GHI"])
+        expected = gaussian_kde(self.df["GHI"])(grid)
+        np.testing.assert_allclose(density, expected, atol=0.01 * expected.max())
+
+    def test_binned_kde_ignores_nan(self):
+        grid, density = binned_kde([1.0, np.nan, 2.0, 3.0])
+        self.assertTrue(np.isfinite(density).all())
+        self.assertEqual(binned_kde([1.0])[0].size, 0)
+
+    def test_sample_rows(self):
+        self.assertEqual(len(sample_rows(self.df, 100)), 100)
+        self.assertIs(sample_rows(self.df, None), self.df)
+
+    def test_fast_plots(self):
+        fig = generate_pair_plot(self.df, ["GHI", "WS"], fast=True)
+        self.assertEqual(len(fig.axes), 3)
+        plt.close(fig)
+        fig = plot_histogram(self.df, "WS", fast=True)
+        self.assertEqual(len(fig.axes[0].lines), 1)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()
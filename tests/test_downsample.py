@@ -0,0 +1,40 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app.downsample import lttb_indices
+from app.utils import create_time_series
+
+
+class TestDownsample(unittest.TestCase):
+    def test_lttb_keeps_endpoints_and_peaks(self):
+        x = np.arange(10000)
+        y = np.sin(x / 500.0)
+        y[4321] = 50.0
+        keep = lttb_indices(x, y, 200)
+        self.assertEqual(len(keep), 200)
+        self.assertEqual((keep[0], keep[-1]), (0, 9999))
+        self.assertIn(4321, keep)
+        self.assertTrue((np.diff(keep) > 0).all())
+
+    def test_lttb_skips_nan_and_short_input(self):
+        y = np.array([1.0, np.nan, 3.0, 4.0])
+        self.assertEqual(list(lttb_indices(np.arange(4), y, 10)), [0, 2, 3])
+
+    def test_create_time_series_max_points(self):
+        df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=5000, freq="min"),
+            "GHI": np.random.default_rng(0).random(5000),
+            "DNI": 1.0,
+            "DHI": 2.0,
+        })
+        fig = create_time_series(df, max_points=300)
+        self.assertEqual([len(line.get_xdata()) for line in fig.axes[0].lines], [300] * 3)
+        plt.close(fig)
+        fig = create_time_series(df, downsample=False)
+        self.assertEqual(len(fig.axes[0].lines[0].get_xdata()), 5000)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.batch import clean_site
+from scripts.incremental import load_state
+from app.profiles import ProfileCube, profile_path
+from app.rollups import build_level, merge_levels, rollup_path
+from app.schema import read_station_csv
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs("data/raw")
+        os.makedirs("data/processed")
+        rng = np.random.default_rng(3)
+        n = 600
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, n),
+            "DNI": rng.normal(300, 80, n),
+            "DHI": rng.normal(100, 20, n),
+        })
+        self.df.loc[[5, 50], "GHI"] = np.nan
+        self.dataset = {"name": "site", "path": "data/raw/site.csv"}
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def test_only_new_rows_are_processed(self):
+        self.df.iloc[:400].to_csv(self.dataset["path"], index=False)
+        first = clean_site(self.dataset, incremental=True)
+        self.assertEqual(first.mode, "full")
+        state = load_state("site")
+        self.assertEqual(pd.Timestamp(state["watermark"]), pd.Timestamp(self.df["Timestamp"][399]))
+
+        self.df.iloc[400:].to_csv(self.dataset["path"], mode="a", header=False, index=False)
+        second = clean_site(self.dataset, incremental=True)
+        self.assertEqual(second.mode, "incremental")
+        self.assertEqual(len(second.df), 200)
+        self.assertGreater(load_state("site")["offset"], state["offset"])
+
+        # Nothing new: nothing appended
+        third = clean_site(self.dataset, incremental=True)
+        self.assertEqual(len(third.df), 0)
+        cleaned = pd.read_csv("data/processed/site-cleaned.csv")
+        self.assertEqual(len(cleaned), 600)
+        self.assertEqual(list(cleaned["Timestamp"]), list(self.df["Timestamp"]))
+
+        # The stored profile cube was extended with the appended rows
+        if "outlier" in cleaned.columns:
+            cleaned = cleaned[~cleaned["outlier"].astype(bool)]
+        expected = ProfileCube.from_frame(cleaned)
+        stored = ProfileCube.load(profile_path("site"))
+        np.testing.assert_array_equal(stored.count, expected.count)
+        np.testing.assert_allclose(stored.sum, expected.sum, rtol=1e-6)
+
+    def test_partial_last_line_waits_for_next_run(self):
+        self.df.iloc[:400].to_csv(self.dataset["path"], index=False)
+        clean_site(self.dataset, incremental=True)
+        with open(self.dataset["path"], "a") as f:
+            f.write("2023-01-01 06:40,1")
+        result = clean_site(self.dataset, incremental=True)
+        self.assertEqual(len(result.df), 0)
+
+    def test_full_rebuild_skips_partial_last_line(self):
+        for chunksize in (None, 150):
+            self.df.iloc[:400].to_csv(self.dataset["path"], index=False)
+            with open(self.dataset["path"], "a") as f:
+                f.write("2023-01-01 06:40,1")
+            clean_site(self.dataset, chunksize=chunksize)
+            self.assertEqual(len(pd.read_csv("data/processed/site-cleaned.csv")), 400)
+            self.assertEqual(pd.Timestamp(load_state("site")["watermark"]), pd.Timestamp(self.df["Timestamp"][399]))
+
+            # Once completed, the row is picked up by the next incremental run
+            with open(self.dataset["path"], "a") as f:
+                f.write("00,300,100\n")
+            result = clean_site(self.dataset, incremental=True)
+            self.assertEqual(result.mode, "incremental")
+            self.assertEqual(len(result.df), 1)
+
+    def test_streamed_rebuild_replaces_rollups_and_profiles(self):
+        self.df.to_csv(self.dataset["path"], index=False)
+        clean_site(self.dataset)
+        # Rewritten with fewer rows: nothing of the earlier outputs may survive
+        self.df.iloc[:450].to_csv(self.dataset["path"], index=False)
+        clean_site(self.dataset, chunksize=100)
+        cleaned = read_station_csv("data/processed/site-cleaned.csv")
+        cleaned = cleaned[~cleaned["outlier"]]
+        stored = pd.read_parquet(rollup_path("site", "hourly"))
+        expected = build_level(cleaned, "h")
+        pd.testing.assert_frame_equal(
+            stored, expected, check_dtype=False, check_freq=False, check_names=False, rtol=1e-5
+        )
+        cube = ProfileCube.load(profile_path("site"))
+        np.testing.assert_array_equal(cube.count, ProfileCube.from_frame(cleaned).count)
+
+    def test_rewritten_file_triggers_full_rebuild(self):
+        self.df.to_csv(self.dataset["path"], index=False)
+        clean_site(self.dataset, incremental=True)
+        self.df.iloc[:100].to_csv(self.dataset["path"], index=False)
+        result = clean_site(self.dataset, incremental=True)
+        self.assertEqual(result.mode, "full")
+        self.assertEqual(len(pd.read_csv("data/processed/site-cleaned.csv")), 100)
+
+    def test_merge_levels_matches_single_build(self):
+        df = self.df.copy()
+        df["Timestamp"] = pd.to_datetime(df["Timestamp"])
+        full = build_level(df, "h")
+        merged = merge_levels(build_level(df.iloc[:250], "h"), build_level(df.iloc[250:], "h"))
+        pd.testing.assert_frame_equal(merged, full, check_freq=False, check_names=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
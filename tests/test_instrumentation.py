@@ -0,0 +1,79 @@
+import json
+import unittest
+import pandas as pd
+from app import instrumentation
+from app.instrumentation import Tracer, instrument
+
+
+@instrument
+def keep_positive(df):
+    return df[df["GHI"] > 0]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.enabled = instrumentation.tracer.enabled
+        instrumentation.tracer.drain()
+
+    def tearDown(self):
+        instrumentation.enable(self.enabled)
+        instrumentation.tracer.drain()
+
+    def test_disabled_records_nothing(self):
+        tracer = Tracer(enabled=False)
+        with tracer.span("stage"):
+            pass
+        self.assertEqual(tracer.drain(), [])
+
+        instrumentation.enable(False)
+        keep_positive(pd.DataFrame({"GHI": [1.0, -1.0]}))
+        self.assertEqual(instrumentation.tracer.drain(), [])
+
+    def test_instrument_records_rows(self):
+        instrumentation.enable()
+        run = instrumentation.tracer.begin_run("test")
+        result = keep_positive(pd.DataFrame({"GHI": [1.0, -1.0, 2.0]}))
+        self.assertEqual(len(result), 2)
+
+        (row,) = instrumentation.tracer.breakdown(run)
+        self.assertEqual(row["stage"], "keep_positive")
+        self.assertEqual((row["rows_in"], row["rows_out"]), (3, 2))
+        self.assertGreaterEqual(row["wall_ms"], 0)
+
+    def test_runs_and_percentiles(self):
+        tracer = Tracer(enabled=True)
+        first = tracer.begin_run()
+        for _ in range(3):
+            with tracer.span("load"):
+                pass
+        second = tracer.begin_run()
+        with tracer.span("plot") as span:
+            span.rows_out = 10
+        self.assertEqual(len(tracer.breakdown(first)), 3)
+        self.assertEqual([row["rows_out"] for row in tracer.breakdown(second)], [10])
+
+        percentiles = tracer.percentiles()
+        self.assertEqual(percentiles["load"][0], 3)
+        self.assertLessEqual(percentiles["load"][1], percentiles["load"][2])
+
+    def test_exports(self):
+        tracer = Tracer(enabled=True)
+        run = tracer.begin_run("eda")
+        with tracer.span("clean", rows_in=5):
+            pass
+        spans = json.loads(tracer.to_json())
+        self.assertEqual([(s["name"], s["run"], s["rows_in"]) for s in spans], [("clean", run, 5)])
+
+        (event,) = json.loads(tracer.to_chrome_trace())["traceEvents"]
+        self.assertEqual((event["name"], event["ph"], event["cat"]), ("clean", "X", run))
+        self.assertGreaterEqual(event["dur"], 0)
+
+        # Spans recorded elsewhere (worker processes) are merged in
+        other = Tracer()
+        other.add(tracer.drain())
+        self.assertEqual(len(other.run_spans(run)), 1)
+        self.assertEqual(other.percentiles()["clean"][0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
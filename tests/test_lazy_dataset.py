@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from app.columnar_store import load_dataset
+from app.lazy_dataset import LazyDataset
+from app.utils import convert_timestamp_to_numeric, dashboard_cleaning, set_time_index
+
+
+class TestLazyDataset(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        rng = np.random.default_rng(8)
+        n = 500
+        df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, n),
+            "DNI": rng.normal(300, 80, n),
+            "DHI": rng.normal(100, 20, n),
+            "WS": rng.normal(3, 1, n),
+            "Cleaning": rng.integers(0, 2, n),
+            "Comments": np.nan,
+        })
+        df.loc[[4, 40], "WS"] = np.nan
+        df.loc[[7, 70], "GHI"] = np.nan
+        df.loc[[9, 300], "DNI"] = [5000.0, -4000.0]
+        # Out of order rows
+        df = df.iloc[::-1]
+        df.to_csv("site-cleaned.csv", index=False)
+        self.lazy = LazyDataset("site-cleaned.csv", ["GHI", "DNI", "DHI"])
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def eager(self):
+        df = load_dataset("site-cleaned.csv")
+        df = dashboard_cleaning(["GHI", "DNI", "DHI"]).run(df)
+        return set_time_index(convert_timestamp_to_numeric(df))
+
+    def test_projection_matches_full_preparation(self):
+        expected = self.eager()
+        frame = self.lazy.frame(["WS"])
+        pd.testing.assert_frame_equal(frame, expected[list(frame.columns)])
+        self.assertNotIn(pd.Timestamp("2023-01-01 00:09"), frame.index)
+
+    def test_columns_load_on_first_use(self):
+        self.assertNotIn("WS", self.lazy.loaded_columns())
+        self.lazy.frame(["WS"])
+        self.assertIn("WS", self.lazy.loaded_columns())
+        self.assertNotIn("Cleaning", self.lazy.loaded_columns())
+
+    def test_full_frame_drops_empty_columns(self):
+        pd.testing.assert_frame_equal(self.lazy.frame(), self.eager())
+        self.assertNotIn("Comments", self.lazy.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
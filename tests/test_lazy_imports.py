@@ -0,0 +1,27 @@
+import os
+import subprocess
+import sys
+import unittest
+from app.lazy_imports import lazy_import
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_attribute_access_imports_the_module(self):
+        json = lazy_import("json")
+        self.assertEqual(json.dumps([1]), "[1]")
+        self.assertIn("json", repr(json))
+
+    def test_app_modules_defer_plotting_backends(self):
+        code = (
+            f"import sys; sys.path.insert(0, {ROOT!r}); "
+            "import app.utils, app.data_pipeline, app.render_cache, app.prefetch; "
+            "print([m for m in ('seaborn', 'scipy', 'windrose', 'matplotlib.pyplot') if m in sys.modules])"
+        )
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
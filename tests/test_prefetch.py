@@ -0,0 +1,71 @@
+import tempfile
+import threading
+import unittest
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from app.prefetch import PrefetchScheduler
+from app.render_cache import RenderCache
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache(cache_dir=self.tmp.name)
+        self.scheduler = PrefetchScheduler(self.cache, max_workers=1)
+        self.rendered = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def job(self, name, gate=None, started=None):
+        def render():
+            if started is not None:
+                started.set()
+            if gate is not None:
+                gate.wait(5)
+            self.rendered.append(name)
+            fig, ax = plt.subplots()
+            ax.plot([0, 1], [0, 1])
+            return fig
+
+        return name, render
+
+    def test_results_are_picked_up(self):
+        gate = threading.Event()
+        self.scheduler.schedule("session", [self.job("a", gate)])
+        gate.set()
+        image = self.scheduler.wait("a", timeout=5)
+        if image is None:
+            # The job may have finished before wait() was called
+            image = self.cache.get("a")
+        self.assertTrue(image.startswith(b"\x89PNG"))
+        self.assertEqual(self.rendered, ["a"])
+
+    def test_new_selection_cancels_queued_jobs(self):
+        gate, started = threading.Event(), threading.Event()
+        self.scheduler.schedule("session", [self.job("running", gate, started), self.job("stale")])
+        started.wait(5)
+        self.scheduler.schedule("session", [self.job("fresh")])
+        gate.set()
+        self.scheduler._pool.shutdown(wait=True)
+        self.assertEqual(self.rendered, ["running", "fresh"])
+        self.assertIsNone(self.cache.get("stale"))
+
+    def test_sessions_are_forgotten_once_their_jobs_finish(self):
+        for session in ("a", "b"):
+            self.scheduler.schedule(session, [self.job(f"figure-{session}")])
+        self.scheduler.schedule("c", [])
+        self.scheduler._pool.shutdown(wait=True)
+        self.assertEqual(self.scheduler.pending(), 0)
+        self.assertEqual(self.scheduler.tracked_sessions(), 0)
+
+    def test_cached_figures_are_not_scheduled(self):
+        self.cache.put("cached", b"png")
+        self.scheduler.schedule("session", [self.job("cached")])
+        self.assertEqual(self.scheduler.pending(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
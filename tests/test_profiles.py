@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app.profiles import ProfileCube, append_profiles, build_profiles, profile_path
+from app.utils import create_diurnal_profile, set_time_index, time_range_slice
+
+
+class TestProfiles(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 3 * 24 * 60 * 40
+        timestamps = pd.date_range("2023-01-20", periods=n // 3, freq="3min")
+        ghi = rng.normal(500, 100, len(timestamps))
+        ghi[[7, 900]] = np.nan
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": timestamps,
+            "GHI": ghi,
+            "WS": rng.gamma(2.0, 1.2, len(timestamps)),
+        }))
+        self.cube = ProfileCube.from_frame(self.df)
+
+    def expected(self, df, column, month=None):
+        if month is not None:
+            df = df[df["Timestamp"].dt.month == month]
+        minute = df["Timestamp"].dt.hour * 60 + df["Timestamp"].dt.minute
+        return df.groupby(minute.to_numpy())[column].agg(["mean", "min", "max", "count"])
+
+    def test_profile_matches_groupby(self):
+        self.assertEqual(self.cube.columns, ["GHI", "WS"])
+        for month in (None, 1, 2):
+            profile = self.cube.profile("GHI", month)
+            expected = self.expected(self.df, "GHI", month)
+            observed = profile.loc[expected.index]
+            np.testing.assert_allclose(observed["mean"], expected["mean"], rtol=1e-9)
+            np.testing.assert_array_equal(observed["min"], expected["min"])
+            np.testing.assert_array_equal(observed["max"], expected["max"])
+            np.testing.assert_array_equal(observed["count"], expected["count"])
+            # Time-of-day slots without samples are empty
+            self.assertTrue(profile.drop(expected.index)["mean"].isna().all())
+
+    def test_update_is_incremental(self):
+        cube = ProfileCube.from_frame(self.df.iloc[:5000])
+        cube.update(self.df.iloc[5000:])
+        for name in ("count", "sum", "min", "max"):
+            np.testing.assert_allclose(getattr(cube, name), getattr(self.cube, name))
+
+    def test_for_range_matches_scanning_the_slice(self):
+        for start, end in [
+            ("2023-01-25 10:00", "2023-02-27"),
+            ("2023-02-01", "2023-02-28 23:57"),
+            ("2023-02-03", "2023-02-05"),
+            ("2024-01-01", "2024-02-01"),
+        ]:
+            rows = time_range_slice(self.df, start, end)
+            result = self.cube.for_range(rows)
+            expected = ProfileCube.from_frame(rows, ["GHI", "WS"])
+            np.testing.assert_array_equal(result.periods, expected.periods)
+            np.testing.assert_array_equal(result.count, expected.count)
+            np.testing.assert_allclose(result.sum, expected.sum, rtol=1e-9)
+
+    def test_monthly_table(self):
+        table = self.cube.monthly("WS", "count")
+        self.assertEqual(table.shape, (12, 24 * 60))
+        self.assertEqual(table.loc[1].sum(), (self.df["Timestamp"].dt.month == 1).sum())
+        self.assertEqual(table.loc[6].sum(), 0)
+
+    def test_build_and_append_round_trip(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            df = self.df.reset_index(drop=True).assign(outlier=False)
+            df.loc[10, "outlier"] = True
+            build_profiles(df.iloc[:4000], "site", output_dir)
+            append_profiles(df.iloc[4000:], "site", output_dir)
+            self.assertTrue(os.path.exists(profile_path("site", output_dir)))
+            stored = ProfileCube.load(profile_path("site", output_dir))
+            expected = ProfileCube.from_frame(df[~df["outlier"]], ["GHI", "WS"])
+            self.assertEqual(stored.columns, ["GHI", "WS"])
+            np.testing.assert_array_equal(stored.count, expected.count)
+            np.testing.assert_allclose(stored.max, expected.max)
+
+    def test_create_diurnal_profile(self):
+        rows = time_range_slice(self.df, "2023-01-25", "2023-02-10")
+        self.assertEqual(create_diurnal_profile.required_columns(column="WS"), ["Timestamp", "WS"])
+        lines = []
+        for profile_cube in (None, self.cube):
+            fig = create_diurnal_profile(rows, column="WS", month=2, profile_cube=profile_cube)
+            lines.append(fig.axes[0].lines[0].get_ydata())
+            self.assertIn("February", fig.axes[0].get_title())
+            plt.close(fig)
+        np.testing.assert_allclose(lines[0], lines[1], rtol=1e-9)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app.quantile_sketch import QuantileSketchIndex
+from app.utils import create_cleaning_impact_plot, set_time_index, time_range_slice
+
+
+class TestQuantileSketch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n = 5 * 24 * 60
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01 06:00", periods=n, freq="min"),
+            "ModA": rng.gamma(2.0, 100.0, n),
+            "Cleaning": (rng.uniform(size=n) < 0.2).astype(int),
+        }))
+        self.index = QuantileSketchIndex(self.df, columns=["ModA"])
+
+    def test_quantiles_within_one_bin(self):
+        start_time, end_time = pd.Timestamp("2023-01-01 18:30"), pd.Timestamp("2023-01-04 03:10")
+        rows = time_range_slice(self.df, start_time, end_time)
+        for group in (None, 0, 1):
+            expected = rows if group is None else rows[rows["Cleaning"] == group]
+            result = self.index.quantiles([0.25, 0.5, 0.75], start_time, end_time, group=group)
+            np.testing.assert_allclose(
+                result["ModA"], expected["ModA"].quantile([0.25, 0.5, 0.75]), atol=self.index.width[0]
+            )
+
+    def test_histogram_counts_every_row(self):
+        hist = self.index.histogram(self.df.index[10], self.df.index[-10])
+        self.assertEqual(hist.sum(), len(self.df) - 19)
+
+    def test_sketch_backed_cleaning_impact_plot(self):
+        fig = create_cleaning_impact_plot(self.df, "Cleaning", "ModA", sketch_index=self.index)
+        self.assertTrue(fig.axes[0].lines)
+        plt.close(fig)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+import pandas as pd
+from app.range_stats import RangeStatsIndex
+from app.utils import set_time_index, time_range_slice
+
+
+class TestRangeStats(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        ghi = rng.normal(500, 100, 1000)
+        ghi[[3, 500]] = np.nan
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=1000, freq="min"),
+            "GHI": ghi,
+            "Cleaning": rng.integers(0, 2, 1000),
+        }))
+        self.index = RangeStatsIndex(self.df, block_size=64)
+
+    def test_summary_matches_describe(self):
+        for start, end in [(0, 999), (10, 20), (63, 64), (100, 900), (5, 5)]:
+            start_time, end_time = self.df.index[start], self.df.index[end]
+            expected = time_range_slice(self.df, start_time, end_time)[["GHI", "Cleaning"]].describe()
+            result = self.index.summary(start_time, end_time)
+            for stat in ["count", "mean", "std", "min", "max"]:
+                np.testing.assert_allclose(result.loc[stat], expected.loc[stat], rtol=1e-9)
+
+    def test_empty_range(self):
+        result = self.index.summary("2024-01-01", "2024-02-01")
+        self.assertEqual(result.loc["count", "GHI"], 0)
+        self.assertTrue(np.isnan(result.loc["mean", "GHI"]))
+
+    def test_requires_time_index(self):
+        with self.assertRaises(ValueError):
+            RangeStatsIndex(self.df.reset_index(drop=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from app.raster import bubble_image, rasterize_points
+from app.utils import bubble_chart, scatter_plot
+from scripts import visualization
+
+
+class TestRaster(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame({
+            "GHI": rng.uniform(0, 1000, 2000),
+            "Tamb": rng.uniform(10, 40, 2000),
+            "RH": rng.uniform(0, 100, 2000),
+            "WS": rng.uniform(0, 10, 2000),
+        })
+
+    def test_rasterize_points_counts_and_means(self):
+        counts, (means,), extent = rasterize_points([0, 0, 1, np.nan], [0, 0, 1, 1], [[2.0, 4.0, 6.0, 8.0]], shape=(2, 2))
+        self.assertEqual(counts.tolist(), [[2, 0], [0, 1]])
+        self.assertEqual(means[0, 0], 3.0)
+        self.assertEqual(means[1, 1], 6.0)
+        self.assertEqual(extent, (0.0, 1.0, 0.0, 1.0))
+
+    def test_bubble_image_alpha(self):
+        counts = np.array([[1.0, 0.0], [2.0, 1.0]])
+        size_mean = np.array([[1.0, np.nan], [3.0, 2.0]])
+        rgba, norm = bubble_image(counts, size_mean)
+        self.assertIsNone(norm)
+        self.assertEqual(rgba[0, 1, 3], 0.0)
+        self.assertAlmostEqual(rgba[1, 0, 3], 1.0)
+
+    def test_bubble_image_ranges_follow_the_data(self):
+        counts = np.array([[1.0, 1.0], [1.0, 0.0]])
+        size_mean = np.array([[50.0, 75.0], [100.0, np.nan]])
+        color_mean = np.array([[20.0, 30.0], [40.0, np.nan]])
+        rgba, norm = bubble_image(counts, size_mean, color_mean)
+        self.assertEqual((norm.vmin, norm.vmax), (20.0, 40.0))
+        self.assertAlmostEqual(rgba[0, 0, 3], 0.2)
+        self.assertAlmostEqual(rgba[0, 1, 3], 0.6)
+        self.assertAlmostEqual(rgba[1, 0, 3], 1.0)
+        # Nothing drawn: the default ranges apply
+        _, norm = bubble_image(np.zeros((2, 2)), np.full((2, 2), np.nan), np.full((2, 2), np.nan))
+        self.assertEqual((norm.vmin, norm.vmax), (0.0, 1.0))
+
+    def test_raster_plots(self):
+        fig = scatter_plot(self.df, "RH", "GHI", raster=True)
+        self.assertEqual(len(fig.axes[0].images), 1)
+        plt.close(fig)
+        fig = bubble_chart(self.df, "GHI", "Tamb", size="RH", color="WS", raster=True)
+        self.assertEqual(len(fig.axes[0].images), 1)
+        plt.close(fig)
+        visualization.bubble_chart(self.df, "GHI", "Tamb", size="RH", color="WS", raster=True)
+        visualization.scatter_plot(self.df, "RH", "GHI", raster=True)
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+import pandas as pd
+from app.raw_data import NullCountIndex, page_rows, row_order
+from app.utils import set_time_index, time_range_slice
+
+
+class TestRawData(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        n = 5000
+        ghi = rng.normal(500, 100, n)
+        ghi[rng.choice(n, 200, replace=False)] = np.nan
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min"),
+            "GHI": ghi,
+            "RH": rng.integers(0, 5, n).astype("float64"),
+        }))
+
+    def test_null_counts_match_isnull(self):
+        index = NullCountIndex(self.df, bucket=pd.Timedelta(hours=6))
+        for start, end in [(0, 4999), (10, 20), (359, 360), (100, 4000), (5, 5)]:
+            start_time, end_time = self.df.index[start], self.df.index[end]
+            expected = time_range_slice(self.df, start_time, end_time).isnull().sum()
+            pd.testing.assert_series_equal(index.counts(start_time, end_time), expected)
+        self.assertEqual(index.counts("2024-01-01", "2024-02-01").sum(), 0)
+
+    def test_time_order_is_a_range(self):
+        self.assertEqual(row_order(self.df, 10, 20), range(10, 20))
+        self.assertEqual(list(row_order(self.df, 10, 13, ascending=False)), [12, 11, 10])
+
+    def test_sort_and_filters(self):
+        order = row_order(self.df, 100, 1100, sort_by="RH", ascending=False, filters=[("GHI", 400, 600)])
+        rows = self.df.iloc[order]
+        self.assertTrue(rows["GHI"].between(400, 600).all())
+        expected = self.df.iloc[100:1100]
+        expected = expected[expected["GHI"].between(400, 600)].sort_values("RH", ascending=False, kind="stable")
+        pd.testing.assert_frame_equal(rows, expected)
+
+    def test_sort_puts_missing_values_last(self):
+        order = row_order(self.df, 0, len(self.df), sort_by="GHI")
+        values = self.df["GHI"].to_numpy()[order]
+        n_missing = int(np.isnan(values).sum())
+        self.assertTrue(np.isnan(values[-n_missing:]).all())
+        self.assertTrue((np.diff(values[:-n_missing]) >= 0).all())
+
+    def test_page_rows(self):
+        order = row_order(self.df, 0, 120)
+        page = page_rows(self.df, order, 2, 50, ["GHI"])
+        self.assertEqual(list(page.columns), ["GHI"])
+        pd.testing.assert_frame_equal(page, self.df.iloc[100:120][["GHI"]])
+        self.assertTrue(page_rows(self.df, order, 5, 50).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
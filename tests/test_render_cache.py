@@ -0,0 +1,77 @@
+import os
+import tempfile
+import threading
+import unittest
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from app.render_cache import FIGURE_LOCK, RenderCache, render_key
+
+
+def make_figure():
+    fig, ax = plt.subplots()
+    ax.plot([0, 1, 2], [1, 0, 1])
+    return fig
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.calls = 0
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def render(self):
+        self.calls += 1
+        return make_figure()
+
+    def test_renders_once_and_persists_across_instances(self):
+        key = render_key("site", "fingerprint", "2023-01-01", "2023-02-01", "plot", (), [])
+        cache = RenderCache(cache_dir=self.tmp.name)
+        first = cache.get_or_render(key, self.render)
+        self.assertTrue(first.startswith(b"\x89PNG"))
+        self.assertEqual(cache.get_or_render(key, self.render), first)
+        # A new process (empty memory tier) is served from disk
+        restarted = RenderCache(cache_dir=self.tmp.name)
+        self.assertEqual(restarted.get_or_render(key, self.render), first)
+        self.assertEqual(self.calls, 1)
+
+    def test_inputs_load_outside_the_figure_lock(self):
+        cache = RenderCache(cache_dir=self.tmp.name)
+        loaded = threading.Event()
+
+        def load():
+            loaded.set()
+            return ([0, 1, 2],)
+
+        def render(values):
+            fig, ax = plt.subplots()
+            ax.plot(values)
+            return fig
+
+        # While another thread holds the lock to draw, the inputs still get loaded
+        with FIGURE_LOCK:
+            worker = threading.Thread(target=cache.get_or_render, args=("key", render, load))
+            worker.start()
+            self.assertTrue(loaded.wait(5))
+        worker.join(5)
+        self.assertIn("key", cache)
+
+    def test_keys_depend_on_parameters(self):
+        self.assertNotEqual(
+            render_key("site", "fp", "a", "b", "plot_histogram", (), [("column", "GHI")]),
+            render_key("site", "fp", "a", "b", "plot_histogram", (), [("column", "WS")]),
+        )
+
+    def test_memory_and_disk_limits(self):
+        cache = RenderCache(max_entries=2, cache_dir=self.tmp.name, max_bytes=1)
+        for key in ("a", "b", "c"):
+            cache.put(key, b"x" * 10)
+        self.assertEqual(len(cache._entries), 2)
+        self.assertLessEqual(len(os.listdir(self.tmp.name)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
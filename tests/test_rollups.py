@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from app.rollups import RollupPyramid, build_level, build_rollups
+
+
+class TestRollups(unittest.TestCase):
+    def setUp(self):
+        n = 3 * 24 * 60
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min"),
+            "GHI": np.arange(n, dtype="float64"),
+            "Cleaning": 0,
+            "outlier": False,
+        })
+
+    def test_build_level_aggregates(self):
+        hourly = build_level(self.df, pd.Timedelta(hours=1))
+        self.assertEqual(len(hourly), 72)
+        first = hourly.iloc[0]
+        self.assertEqual((first["GHI_min"], first["GHI_max"], first["GHI_count"]), (0, 59, 60))
+        self.assertEqual(first["GHI_mean"], 29.5)
+        self.assertNotIn("Cleaning_mean", hourly.columns)
+
+    def test_resolve_picks_coarsest_level_with_enough_points(self):
+        pyramid = RollupPyramid("site", source_df=self.df)
+        self.assertEqual(pyramid.resolve("2023-01-01", "2023-01-01 12:00", min_points=100), "1min")
+        self.assertEqual(pyramid.resolve("2023-01-01", "2023-01-03", min_points=100), "10min")
+        self.assertEqual(pyramid.resolve("2023-01-01", "2023-01-03", min_points=20), "hourly")
+
+    def test_query_reads_stored_levels(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.df.loc[0, "outlier"] = True
+            paths = build_rollups(self.df, "site", output_dir=tmp)
+            self.assertTrue(all(os.path.exists(path) for path in paths.values()))
+            level, frame = RollupPyramid("site", output_dir=tmp).query(
+                "2023-01-01", "2023-01-03 23:59", min_points=2
+            )
+            self.assertEqual(level, "daily")
+            self.assertEqual(list(frame.columns), ["Timestamp", "GHI"])
+            self.assertEqual(frame["GHI"].iloc[0], np.arange(1, 1440).mean())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import io
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from app.schema import memory_report, read_station_csv, to_station_csv
+
+
+class TestSchema(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        n = 100
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, n),
+            "WS": rng.normal(3, 1, n),
+            "Cleaning": rng.integers(0, 2, n),
+            "Comments": np.nan,
+        })
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "site.csv")
+        self.df.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_compact_dtypes(self):
+        df = read_station_csv(self.path)
+        self.assertEqual(df["GHI"].dtype, np.float32)
+        self.assertEqual(df["Cleaning"].dtype, np.uint8)
+        self.assertEqual(df["Timestamp"].dtype, "datetime64[ns]")
+        self.assertEqual(df["Timestamp"].iloc[1], pd.Timestamp("2023-01-01 00:01"))
+        np.testing.assert_allclose(df["GHI"], self.df["GHI"], rtol=1e-6)
+
+    def test_usecols_projection_and_chunks(self):
+        df = read_station_csv(self.path, columns=["Timestamp", "WS"])
+        self.assertEqual(list(df.columns), ["Timestamp", "WS"])
+        with open(self.path, "rb") as f:
+            chunks = list(read_station_csv(io.BytesIO(f.read()), columns=["Timestamp", "GHI"], chunksize=30))
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(chunks[0]["GHI"].dtype, np.float32)
+
+    def test_round_trip_keeps_timestamp_format(self):
+        output_path = os.path.join(self.tmp.name, "cleaned.csv")
+        to_station_csv(read_station_csv(self.path), output_path)
+        self.assertEqual(list(pd.read_csv(output_path)["Timestamp"]), list(self.df["Timestamp"]))
+
+    def test_round_trip_keeps_seconds(self):
+        self.df["Timestamp"] = pd.date_range("2023-01-01", periods=len(self.df), freq="30s").strftime(
+            "%Y-%m-%d %H:%M:%S"
+        )
+        self.df.to_csv(self.path, index=False)
+        output_path = os.path.join(self.tmp.name, "cleaned.csv")
+        to_station_csv(read_station_csv(self.path), output_path)
+        self.assertEqual(list(pd.read_csv(output_path)["Timestamp"]), list(self.df["Timestamp"]))
+
+    def test_missing_flags_stay_float(self):
+        self.df.loc[3, "Cleaning"] = np.nan
+        self.df.to_csv(self.path, index=False)
+        self.assertEqual(read_station_csv(self.path)["Cleaning"].dtype, np.float32)
+
+    def test_memory_report(self):
+        report = memory_report({"site": self.path})
+        self.assertLess(report.loc["site", "compact_bytes"], report.loc["site", "inferred_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from scripts.cleaning import handle_missing_values, detect_outliers
+from scripts.streaming import RunningStats, concat_csv_files, stream_clean
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(6)
+        n = 1000
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=n, freq="min").strftime("%Y-%m-%d %H:%M"),
+            "GHI": rng.normal(400, 100, n),
+            "DNI": rng.normal(300, 80, n),
+            "DHI": rng.normal(100, 20, n),
+        })
+        self.df.loc[[5, 50, 500], "GHI"] = np.nan
+        self.df.loc[[7, 700], "Timestamp"] = np.nan
+        self.df.loc[[10, 900], "DNI"] = [5000.0, -4000.0]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.raw_path = os.path.join(self.tmp.name, "raw.csv")
+        self.df.to_csv(self.raw_path, index=False)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_running_stats_matches_numpy(self):
+        values = np.random.default_rng(0).normal(size=(1000, 2))
+        stats = RunningStats(2)
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+        np.testing.assert_allclose(stats.mean, values.mean(axis=0))
+        np.testing.assert_allclose(stats.std(), values.std(axis=0))
+
+    def test_stream_clean_matches_in_memory(self):
+        expected = detect_outliers(handle_missing_values(pd.read_csv(self.raw_path)))
+        output_path = os.path.join(self.tmp.name, "cleaned.csv")
+        rows = stream_clean(self.raw_path, output_path, chunksize=97)
+        result = pd.read_csv(output_path)
+        self.assertEqual(rows, len(expected))
+        self.assertTrue(expected["outlier"].any())
+        pd.testing.assert_frame_equal(result, expected.reset_index(drop=True), check_exact=False)
+
+    def test_nan_column_never_flags_like_zscore(self):
+        self.df.loc[3, "DNI"] = np.nan
+        self.df.to_csv(self.raw_path, index=False)
+        expected = detect_outliers(handle_missing_values(pd.read_csv(self.raw_path)))
+        output_path = os.path.join(self.tmp.name, "cleaned.csv")
+        stream_clean(self.raw_path, output_path, chunksize=200)
+        self.assertEqual(list(pd.read_csv(output_path)["outlier"]), list(expected["outlier"]))
+
+    def test_concat_csv_files(self):
+        output_path = os.path.join(self.tmp.name, "combined.csv")
+        concat_csv_files([self.raw_path, self.raw_path], output_path, chunksize=300)
+        self.assertEqual(len(pd.read_csv(output_path)), 2 * len(self.df))
+
+
+if __name__ == "__main__":
+    unittest.main()
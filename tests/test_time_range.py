@@ -0,0 +1,33 @@
+import unittest
+import pandas as pd
+from app.time_index import time_range_positions
+from app.utils import filter_data_by_time_range, set_time_index, time_range_slice
+
+
+class TestTimeRange(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01", periods=5, freq="D")[::-1],
+            "GHI": [500, 400, 300, 200, 100],
+        })
+
+    def test_set_time_index_sorts(self):
+        indexed = set_time_index(self.df)
+        self.assertTrue(indexed.index.is_monotonic_increasing)
+        self.assertEqual(list(indexed["GHI"]), [100, 200, 300, 400, 500])
+
+    def test_time_range_positions(self):
+        indexed = set_time_index(self.df)
+        self.assertEqual(time_range_positions(indexed, "2023-01-02", "2023-01-04"), (1, 4))
+        self.assertEqual(time_range_positions(indexed, "2023-02-01", "2023-01-01"), (5, 5))
+
+    def test_filter_matches_mask_filter(self):
+        start, end = pd.Timestamp("2023-01-02"), pd.Timestamp("2023-01-04 12:00")
+        expected = filter_data_by_time_range(self.df, start, end).sort_values("Timestamp")
+        result = filter_data_by_time_range(set_time_index(self.df), start, end)
+        self.assertEqual(list(result["GHI"]), list(expected["GHI"]))
+        self.assertEqual(list(time_range_slice(set_time_index(self.df), start, end)["GHI"]), [200, 300, 400])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from windrose.windrose import histogram
+from app.wind_rose import WindRoseIndex, default_speed_bins, wind_rose_table
+from app.utils import create_wind_rose, set_time_index, time_range_slice
+
+
+class TestWindRose(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 3 * 24 * 60
+        self.df = set_time_index(pd.DataFrame({
+            "Timestamp": pd.date_range("2023-01-01 12:00", periods=n, freq="min"),
+            "WD": rng.uniform(0, 360, n),
+            "WS": rng.gamma(2.0, 1.5, n),
+        }))
+
+    def test_table_matches_windrose_histogram(self):
+        bins = default_speed_bins(self.df["WS"])
+        _, _, expected = histogram(self.df["WD"].to_numpy(), self.df["WS"].to_numpy(), bins, 16, len(self.df))
+        np.testing.assert_array_equal(wind_rose_table(self.df["WD"], self.df["WS"], bins), expected)
+
+    def test_index_range_matches_direct_table(self):
+        index = WindRoseIndex(self.df)
+        start_time, end_time = pd.Timestamp("2023-01-01 18:00"), pd.Timestamp("2023-01-03 09:00")
+        rows = time_range_slice(self.df, start_time, end_time)
+        expected = wind_rose_table(rows["WD"], rows["WS"], index.speed_bins)
+        np.testing.assert_array_equal(index.table(start_time, end_time), expected)
+
+    def test_create_wind_rose(self):
+        for wind_index in (None, WindRoseIndex(self.df)):
+            fig = create_wind_rose(self.df, "WD", "WS", wind_index=wind_index)
+            ax = fig.axes[0]
+            self.assertEqual(len(ax.containers), 6)
+            self.assertEqual(len(ax.get_legend().get_texts()), 6)
+            # The bars stack to the sector totals, in percent of all samples
+            heights = sum(np.array([bar.get_height() for bar in bars]) for bars in ax.containers)
+            self.assertAlmostEqual(heights.sum(), 100.0)
+            plt.close(fig)
+        with self.assertRaises(ValueError):
+            create_wind_rose(self.df, "WDX", "WS")
+
+
+if __name__ == "__main__":
+    unittest.main()